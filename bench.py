@@ -0,0 +1,374 @@
+#
+# Copyright (c) 2022 by Kristoffer Paulsson <kristoffer.paulsson@talenten.se>.
+#
+# Permission to use, copy, modify, and/or distribute this software for any purpose with
+# or without fee is hereby granted, provided that the above copyright notice and this
+# permission notice appear in all copies.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES WITH REGARD TO
+# THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS. IN NO
+# EVENT SHALL THE AUTHOR BE LIABLE FOR ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL
+# DAMAGES OR ANY DAMAGES WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER
+# IN AN ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF OR IN
+# CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+#
+#     https://opensource.org/licenses/ISC
+#
+# SPDX-License-Identifier: ISC
+#
+# Contributors:
+#     Kristoffer Paulsson - initial implementation
+#
+"""Benchmark rig for measuring the throughput of the processing stages on the whole corpus.
+
+Run with: python -m unittest bench"""
+import dataclasses
+import json
+import pickle
+import re
+import time
+import tracemalloc
+from unittest import TestCase
+
+from bibleanalyzer import Logger
+from bibleanalyzer.app.config import Config
+from bibleanalyzer.concordance import Concordance
+from bibleanalyzer.data import BOOKS, CORPUS
+from bibleanalyzer.grammar import Grammar
+from bibleanalyzer.index.bitmap import MorphologyBitmaps
+from bibleanalyzer.index.postings import PostingsIndex
+from bibleanalyzer.index.suffix import SuffixIndex
+from bibleanalyzer.liner import TOKEN_REGEX, PUNCTUATION, Liner, LinerIterator
+from bibleanalyzer.loader import WHOLE_REGEX, CorpusReader, FreshLoaderIterator
+from bibleanalyzer.rule.pattern import Encoded, Pattern
+from bibleanalyzer.util import model
+from bibleanalyzer.util.columnar import LinearColumns
+from bibleanalyzer.util.morphology import MorphologyBWG, Speech, Mood, Tense, Voice, CaseGeneric, Gender, Number
+from bibleanalyzer.util.packed import PackedMorphology
+from bibleanalyzer.util.transliterator import LETTERS, KoineTransliterator
+from bibleanalyzer.util.vocabulary import Vocabulary
+
+
+def legacy(token: model.Token):
+    """Copy of a token as the dataclass it was before the model was slotted."""
+    cls = LEGACY[token.__class__]
+    return cls(*(getattr(token, name) for name in token.__slots__))
+
+
+def tokenize(item: model.DataEntry) -> int:
+    """The tokenizer as it was before the normalization was cached, counting the tokens."""
+    count = 0
+    word_count = 0
+    for match in re.findall(TOKEN_REGEX, item.text.replace("[", "").replace("]", "")):
+        token = match.strip()
+        if token:
+            if token in PUNCTUATION:
+                count += 1
+            elif bool(LETTERS.intersection(set(token)) == set(token)):
+                word = item.words[word_count]
+                if KoineTransliterator.normalize(word.word).lower() != KoineTransliterator.normalize(token).lower():
+                    raise ValueError("Not the right word. {} {}".format(token, word.word))
+                word_count += 1
+                count += 1
+    return count
+
+
+LEGACY = dict((cls, dataclasses.make_dataclass(cls.__name__, cls.__slots__)) for cls in (
+    model.WordToken, model.PunctuationToken, model.ChapterToken, model.VerseToken, model.SectionToken))
+
+
+class BenchRig(TestCase):
+    def setUp(self) -> None:
+        self.config = Config(list())
+        self.logger = Logger.create(self.config, "bench")
+
+    def files(self, corpus: str) -> list:
+        return [self.config.get("corpus").joinpath(corpus, "{}.txt".format(book)) for book in json.loads(BOOKS)[corpus]]
+
+    def report(self, name: str, count: int, unit: str, before: float, after: float):
+        msg = "{}: {:.0f} {unit}/s before, {:.0f} {unit}/s after ({:.1f}x)".format(
+            name, count / before, count / after, before / after, unit=unit)
+        self.logger.info(msg)
+        print(msg)
+
+    def best(self, run, repeat: int = 5) -> float:
+        timings = list()
+        for _ in range(repeat):
+            start = time.perf_counter()
+            run()
+            timings.append(time.perf_counter() - start)
+        return min(timings)
+
+    def test_line_classifier(self):
+        for corpus in ("nt", "ot"):
+            lines = 0
+            start = time.perf_counter()
+            for filename in self.files(corpus):
+                with filename.open("r") as doc:
+                    for line in doc:
+                        lines += 1
+                        match = re.match(WHOLE_REGEX, line)
+                        if match:
+                            match.groupdict()
+            before = time.perf_counter() - start
+
+            start = time.perf_counter()
+            for filename in self.files(corpus):
+                for _ in CorpusReader(filename, CORPUS[corpus]):
+                    pass
+            after = time.perf_counter() - start
+
+            self.report("Line classifier {}".format(corpus.upper()), lines, "lines", before, after)
+
+    def test_mapped_reader(self):
+        for book in ("psalm", "isaiah"):
+            filename = self.config.get("corpus").joinpath("ot", "{}.txt".format(book))
+            timings = list()
+            peaks = list()
+            for mapped in (False, True):
+                tracemalloc.start()
+                start = time.perf_counter()
+                entries = sum(1 for _ in FreshLoaderIterator(filename, CORPUS["ot"], mapped))
+                timings.append(time.perf_counter() - start)
+                peaks.append(tracemalloc.get_traced_memory()[1])
+                tracemalloc.stop()
+
+            self.report("Mapped reader {}".format(book.title()), entries, "verses", *timings)
+            msg = "Mapped reader {}: peak {:.1f} MiB before, {:.1f} MiB after".format(
+                book.title(), peaks[0] / 2 ** 20, peaks[1] / 2 ** 20)
+            self.logger.info(msg)
+            print(msg)
+
+    def test_line_memory(self):
+        caches = [self.config.get("cache").joinpath("parsing-{}.pickle".format(book))
+                  for books in json.loads(BOOKS).values() for book in books]
+        caches = [cache for cache in caches if cache.is_file()]
+        if not caches:
+            self.skipTest("Run load all first")
+
+        peaks = list()
+        tokens = 0
+        for convert in (legacy, None):
+            tracemalloc.start()
+            held = list()
+            for cache in caches:
+                with cache.open("rb") as file:
+                    data = pickle.load(file)
+                liner = Liner(self.logger)
+                liner.process(data, cache.stem.split("-", 1)[1])
+                held.append([convert(token) for token in liner.linear] if convert else liner.linear)
+                del data, liner
+            peaks.append(tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+            tokens = sum(len(linear) for linear in held)
+            del held
+
+        msg = "Line all: {} tokens, peak {:.1f} MiB before, {:.1f} MiB after".format(
+            tokens, peaks[0] / 2 ** 20, peaks[1] / 2 ** 20)
+        self.logger.info(msg)
+        print(msg)
+
+    def test_tokenizer(self):
+        for book in json.loads(BOOKS)["nt"]:
+            cache = self.config.get("cache").joinpath("parsing-{}.pickle".format(book))
+            if not cache.is_file():
+                continue
+            with cache.open("rb") as file:
+                entries = [entry for entry in pickle.load(file) if entry.text]
+
+            tokens = sum(tokenize(entry) for entry in entries)
+            before = self.best(lambda: [tokenize(entry) for entry in entries])
+
+            liner = LinerIterator(None, book)
+            after = self.best(lambda: [list(liner._tokenizer_iter(entry)) for entry in entries])
+
+            self.report("Tokenizer {}".format(book.title()), tokens, "tokens", before, after)
+
+    def test_classify(self):
+        tokens = list()
+        for book in json.loads(BOOKS)["nt"]:
+            cache = self.config.get("cache").joinpath("linear-{}.pickle".format(book))
+            if cache.is_file():
+                with cache.open("rb") as file:
+                    tokens += [token for token in pickle.load(file) if isinstance(token, model.WordToken)]
+        if not tokens:
+            self.skipTest("Run line nt first")
+
+        before = self.best(lambda: [MorphologyBWG.describe(
+            token.grammar, token.lexeme.count("+") + 1 if "&" in token.grammar else 1) for token in tokens], 3)
+        after = self.best(lambda: [MorphologyBWG.parse(token) for token in tokens], 3)
+        self.report("Classify NT", len(tokens), "tokens", before, after)
+
+    def test_packed_filter(self):
+        linear = list()
+        for book in json.loads(BOOKS)["nt"]:
+            cache = self.config.get("cache").joinpath("linear-{}.pickle".format(book))
+            if cache.is_file():
+                with cache.open("rb") as file:
+                    linear += pickle.load(file)
+        if not linear:
+            self.skipTest("Run line nt first")
+
+        def objects():
+            return [index for index, token in enumerate(linear) if isinstance(token, model.WordToken) and (
+                lambda word: word.speech == Speech.VERB and word.mood == Mood.PARTICIPLE and word.tense == Tense.AORIST
+                and word.voice == Voice.PASSIVE and word.case == CaseGeneric.GENITIVE)(Grammar.classify(token))]
+
+        codes = PackedMorphology.array(linear)
+        try:
+            codes = PackedMorphology.numpy(linear)
+        except ImportError:
+            pass
+
+        def packed():
+            return list(PackedMorphology.select(
+                codes, speech=Speech.VERB, mood=Mood.PARTICIPLE, tense=Tense.AORIST,
+                voice=Voice.PASSIVE, case=CaseGeneric.GENITIVE))
+
+        self.assertEqual(objects(), packed())
+        self.report("Aorist passive genitive participles NT", len(linear), "tokens", self.best(objects), self.best(packed))
+
+    def test_postings(self):
+        path = self.config.get("cache").joinpath(PostingsIndex.FILENAME)
+        linear = dict()
+        for book in PostingsIndex.BOOKS:
+            cache = self.config.get("cache").joinpath("linear-{}.pickle".format(book))
+            if cache.is_file():
+                with cache.open("rb") as file:
+                    linear[book] = pickle.load(file)
+        if not linear or not path.is_file():
+            self.skipTest("Run index first")
+
+        def scan():
+            return [(book, offset) for book, tokens in linear.items() for offset, token in enumerate(tokens)
+                    if isinstance(token, model.WordToken) and token.lexeme == "λόγος"
+                    and Grammar.classify(token).speech == Speech.NOUN]
+
+        with PostingsIndex(path) as index:
+            def lookup():
+                return [(span.book, span.start) for span in index.spans(index.positions(index.lexeme("λόγος")))]
+
+            self.assertEqual(sorted(scan()), sorted(lookup()))
+            self.report("Occurrences of λόγος", sum(len(tokens) for tokens in linear.values()), "tokens",
+                        self.best(scan, 3), self.best(lookup, 3))
+
+    def test_bitmaps(self):
+        path = self.config.get("cache").joinpath(MorphologyBitmaps.FILENAME)
+        linear = dict()
+        for book in PostingsIndex.BOOKS:
+            cache = self.config.get("cache").joinpath("linear-{}.pickle".format(book))
+            if cache.is_file():
+                with cache.open("rb") as file:
+                    linear[book] = pickle.load(file)
+        if not linear or not path.is_file():
+            self.skipTest("Run index first")
+
+        def scan():
+            return [PostingsIndex.BOOKS.index(book) << PostingsIndex.SHIFT | offset
+                    for book, tokens in linear.items() for offset, token in enumerate(tokens)
+                    if isinstance(token, model.WordToken) and (lambda word: word.speech == Speech.VERB
+                    and word.mood == Mood.PARTICIPLE and word.case == CaseGeneric.GENITIVE
+                    and word.gender == Gender.FEMININE and word.number == Number.PLURAL)(Grammar.classify(token))]
+
+        with MorphologyBitmaps(path) as bitmaps:
+            def select():
+                return list(bitmaps.select(
+                    speech=Speech.VERB, mood=Mood.PARTICIPLE, case=CaseGeneric.GENITIVE,
+                    gender=Gender.FEMININE, number=Number.PLURAL))
+
+            self.assertEqual(sorted(scan()), select())
+            self.report("Feminine plural genitive participles", sum(len(tokens) for tokens in linear.values()),
+                        "tokens", self.best(scan, 3), self.best(select, 3))
+
+    def test_phrases(self):
+        path = self.config.get("cache").joinpath(SuffixIndex.filename(Vocabulary.LEXEME))
+        linear = dict()
+        for book in PostingsIndex.BOOKS:
+            cache = self.config.get("cache").joinpath("linear-{}.pickle".format(book))
+            if cache.is_file():
+                with cache.open("rb") as file:
+                    linear[book] = [(offset, token.lexeme) for offset, token in enumerate(pickle.load(file))
+                                    if isinstance(token, model.WordToken)]
+        if not linear or not path.is_file():
+            self.skipTest("Run index first")
+
+        phrase = ["ὁ", "θεός"]
+
+        def scan():
+            return [(book, words[index][0]) for book, words in linear.items() for index in range(len(words))
+                    if [lexeme for offset, lexeme in words[index:index + len(phrase)]] == phrase]
+
+        with SuffixIndex(path) as index:
+            def find():
+                return [(span.book, span.start) for span in index.find(phrase)]
+
+            self.assertEqual(sorted(scan()), sorted(find()))
+            self.report("Phrase ὁ θεός", len(index), "words", self.best(scan, 3), self.best(find, 3))
+
+    def test_concordance(self):
+        caches = [self.config.get("cache").joinpath("linear-{}.pickle".format(book)) for book in PostingsIndex.BOOKS]
+        caches = [cache for cache in caches if cache.is_file()]
+        if not caches or not self.config.get("cache").joinpath(PostingsIndex.FILENAME).is_file():
+            self.skipTest("Run index first")
+
+        def text(tokens: list) -> str:
+            return "".join(" " + token.word if isinstance(token, model.WordToken) else token.diacritic
+                           for token in tokens).lstrip()
+
+        def scan():
+            lines = list()
+            for cache in caches:
+                with cache.open("rb") as file:
+                    words = [token for token in pickle.load(file)
+                             if isinstance(token, (model.WordToken, model.PunctuationToken))]
+                for index, token in enumerate(words):
+                    if isinstance(token, model.WordToken) and token.lexeme == "καί":
+                        lines.append((text(words[max(index - 5, 0):index]), token.word, text(words[index + 1:index + 6])))
+            return lines
+
+        with Concordance(self.config.get("cache")) as concordance:
+            def listing():
+                return [(line.left, line.keyword, line.right) for line in concordance.lines("καί")]
+
+            count = len(listing())
+            self.assertEqual(len(scan()), count)
+            self.report("Concordance of καί", count, "lines", self.best(scan, 3), self.best(listing, 3))
+
+    def test_pattern(self):
+        linear = dict()
+        for book in PostingsIndex.BOOKS:
+            cache = self.config.get("cache").joinpath("linear-{}.pickle".format(book))
+            if cache.is_file():
+                with cache.open("rb") as file:
+                    linear[book] = [(offset, token) for offset, token in enumerate(pickle.load(file))
+                                    if isinstance(token, model.WordToken)]
+        if not linear:
+            self.skipTest("Run line all first")
+
+        def scan():
+            spans = list()
+            for book, words in linear.items():
+                index = 0
+                while index < len(words) - 1:
+                    first = Grammar.classify(words[index][1])
+                    second = Grammar.classify(words[index + 1][1])
+                    if first.speech == Speech.DEFINITE_ARTICLE and first.case == CaseGeneric.GENITIVE and \
+                            second.speech == Speech.NOUN and second.case == CaseGeneric.GENITIVE:
+                        spans.append((book, words[index][0], words[index + 1][0] + 1))
+                        index += 2
+                    else:
+                        index += 1
+            return spans
+
+        encoded = list()
+        for book in linear.keys():
+            with LinearColumns(self.config.get("cache").joinpath("linear-{}.columns".format(book))) as columns:
+                encoded.append(Encoded.encode(book, columns))
+        pattern = Pattern("[d case=g] [n case=g]")
+
+        def find():
+            return [(span.book, span.start, span.stop) for span in pattern.find(encoded)]
+
+        self.assertEqual(scan(), find())
+        self.report("Pattern [d case=g] [n case=g]", sum(len(words) for words in linear.values()), "words",
+                    self.best(scan, 3), self.best(find, 3))
@@ -58,7 +58,7 @@ class TestRig(TestCase):
                 if isinstance(item, WordToken):
                     word = Grammar.classify(item)
                     if word.speech == Speech.PREPOSITION:
-                        prepositions.add(Grammar.format(word))
+                        prepositions.add(Grammar.format(word, item))
                         #
                 elif isinstance(item, ChapterToken):
                     chapter = item.number
@@ -82,7 +82,7 @@ class TestRig(TestCase):
             verse = 1
             for item in liner.linear:
                 if isinstance(item, WordToken):
-                    self.logger.info("{0} {1}:{2} {3}".format(book, chapter, verse, Grammar.format(Grammar.classify(item))))
+                    self.logger.info("{0} {1}:{2} {3}".format(book, chapter, verse, Grammar.format(Grammar.classify(item), item)))
                 elif isinstance(item, ChapterToken):
                     chapter = item.number
                 elif isinstance(item, VerseToken):
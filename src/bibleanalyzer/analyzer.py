@@ -20,8 +20,10 @@
 #     Kristoffer Paulsson - initial implementation
 #
 """Context analyzer and meaning builder."""
-from bibleanalyzer.grammar import Grammar, Word, Speech
+from bibleanalyzer.grammar import Grammar
+from bibleanalyzer.util.morphology import Speech, Word
 from bibleanalyzer.util.model import WordToken
+from bibleanalyzer.util.packed import PackedMorphology
 from bibleanalyzer.structor import Clause
 
 
@@ -31,16 +33,19 @@ class GrammarRule:
 
 
 class Analyzer:
+    NOMINALS = (Speech.NOUN, Speech.PRONOUN, Speech.DEFINITE_ARTICLE, Speech.ADJECTIVE)
+
     def __init__(self):
         pass
 
     @classmethod
     def analyze(cls, clause: Clause) -> list:
         grammar = dict()
-        for index, token in enumerate(clause.line):
+        line = clause.line
+        for index, token in enumerate(line):
             if isinstance(token, WordToken):
                 word = Grammar.classify(token)
-                if word.speech in (Speech.NOUN, Speech.PRONOUN, Speech.DEFINITE_ARTICLE, Speech.ADJECTIVE):
+                if word.speech in cls.NOMINALS:
                     cls._add_rule(grammar, cls.link_noun(word), index)
                 # if word.speech in (Speech.VERB,) and word.mood == Mood.PARTICIPLE:
                 #    cls._add_rule(grammar, cls.link_verb(word), index)
@@ -49,11 +54,53 @@ class Analyzer:
         for value in grammar.values():
             subs = ""
             for index in value:
-                subs += " " + clause.line[index].lexeme
+                subs += " " + line[index].lexeme
 
             terms.add(subs.strip())
         return terms
 
+    @classmethod
+    def agreements(cls, starts, stops, codes, lexemes) -> set:
+        """Batch variant of analyze over a whole book. Given the start and stop of every clause, and the packed
+        morphology and lexeme id of every token, gives the lexeme ids of the nominals agreeing in case, gender and
+        number within each clause. The grouping is a sort over clause and agreement with NumPy if installed."""
+        speech_shift, speech_mask = PackedMorphology.LAYOUT["speech"]
+        nominals = [PackedMorphology.ordinal(speech) for speech in cls.NOMINALS]
+        agreement = 0
+        for name in ("case", "gender", "number"):
+            shift, mask = PackedMorphology.LAYOUT[name]
+            agreement |= mask << shift
+
+        if not len(starts):
+            return set()
+
+        try:
+            import numpy
+        except ImportError:
+            groups = dict()
+            for clause in range(len(starts)):
+                for position in range(starts[clause], stops[clause]):
+                    code = codes[position]
+                    if (code >> speech_shift) & speech_mask in nominals:
+                        groups.setdefault((clause, code & agreement), list()).append(lexemes[position])
+            return set(tuple(group) for group in groups.values())
+
+        starts = numpy.asarray(starts, dtype=numpy.int64)
+        stops = numpy.asarray(stops, dtype=numpy.int64)
+        codes = numpy.asarray(codes, dtype=numpy.uint32)
+        lexemes = numpy.asarray(lexemes, dtype=numpy.uint32)
+
+        positions = numpy.flatnonzero(numpy.isin((codes >> speech_shift) & speech_mask, nominals))
+        clauses = numpy.searchsorted(starts, positions, side="right") - 1
+        inside = (clauses >= 0) & (positions < stops[numpy.maximum(clauses, 0)])
+        positions = positions[inside]
+        keys = clauses[inside].astype(numpy.uint64) << numpy.uint64(32) | (codes[positions] & agreement)
+
+        order = numpy.argsort(keys, kind="stable")
+        keys = keys[order]
+        groups = numpy.split(lexemes[positions[order]], numpy.flatnonzero(keys[1:] != keys[:-1]) + 1)
+        return set(tuple(group.tolist()) for group in groups if len(group))
+
     @classmethod
     def link_noun(cls, word: Word):
         return GrammarRule.LINK_NOUN, word.case, word.gender, word.number
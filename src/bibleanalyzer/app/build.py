@@ -0,0 +1,201 @@
+#
+# Copyright (c) 2022 by Kristoffer Paulsson <kristoffer.paulsson@talenten.se>.
+#
+# Permission to use, copy, modify, and/or distribute this software for any purpose with
+# or without fee is hereby granted, provided that the above copyright notice and this
+# permission notice appear in all copies.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES WITH REGARD TO
+# THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS. IN NO
+# EVENT SHALL THE AUTHOR BE LIABLE FOR ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL
+# DAMAGES OR ANY DAMAGES WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER
+# IN AN ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF OR IN
+# CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+#
+#     https://opensource.org/licenses/ISC
+#
+# SPDX-License-Identifier: ISC
+#
+# Contributors:
+#     Kristoffer Paulsson - initial implementation
+#
+"""Build graph of the processing stages, so that a command only runs the upstream work it needs."""
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from dataclasses import dataclass
+from typing import Callable, Iterator
+
+from bibleanalyzer.app.config import Config
+from bibleanalyzer.app.logging import Logger
+from bibleanalyzer.app.manifest import Manifest
+
+
+@dataclass
+class Report:
+    """Outcome of processing one book, returned from a worker to the command."""
+    book: str = None
+    errors: int = 0
+    warnings: int = 0
+    elapsed: float = 0.0
+    result: object = None
+
+
+def pooled(worker: Callable, config: Config, command: str, *task) -> Report:
+    """Runs a worker in a pool process with a logger of its own and reports its counts back."""
+    logger = Logger.create(config, command)
+    start = time.perf_counter()
+    report = worker(logger, config, *task)
+    report.errors = logger.errors
+    report.warnings = logger.warnings
+    report.elapsed = time.perf_counter() - start
+    return report
+
+
+class Stage:
+    """A stage builds the outputs of one book at a time from its inputs, after the stages it requires.
+    The worker is a module level function, called as worker(logger, config, *task) and returning a Report."""
+
+    NAME = None
+    REQUIRES = ()
+
+    def __init__(self, config: Config):
+        self._config = config
+
+    def key(self, book: str) -> str:
+        return "{}-{}".format(self.NAME, book)
+
+    def inputs(self, corpus: str, book: str) -> list:
+        raise NotImplementedError()
+
+    def outputs(self, corpus: str, book: str) -> list:
+        raise NotImplementedError()
+
+    def current(self, corpus: str, book: str) -> bool:
+        """Whether the outputs still fit what they depend on besides their stamped inputs."""
+        return True
+
+    def task(self, corpus: str, book: str) -> tuple:
+        raise NotImplementedError()
+
+    def worker(self) -> Callable:
+        raise NotImplementedError()
+
+
+class Node:
+    """One stage of one book in the graph, with the nodes it has to wait for."""
+
+    def __init__(self, stage: Stage, corpus: str, book: str, requires: list):
+        self.stage = stage
+        self.corpus = corpus
+        self.book = book
+        self.requires = requires
+
+    @property
+    def key(self) -> str:
+        return self.stage.key(self.book)
+
+    def __repr__(self) -> str:
+        return "Node({})".format(self.key)
+
+
+class BuildGraph:
+    """Finds the stale stages of each book from the manifest and runs them in dependency order.
+    A stage is stale if its inputs or outputs don't match their stamps, if it was built by another version,
+    if it isn't current otherwise or if a stage it requires is stale. Books whose source is missing can't be built at all."""
+
+    FRESH = 0
+    STALE = 1
+    MISSING = 2
+
+    def __init__(self, stages: list, manifest: Manifest, version: str):
+        self._stages = dict((stage.NAME, stage) for stage in stages)
+        self._manifest = manifest
+        self._version = version
+        self._missing = list()
+
+    @property
+    def missing(self) -> list:
+        """The (stage, book, path) of sources that are missing, found while planning."""
+        return self._missing
+
+    def plan(self, target: str, books: list) -> list:
+        """The stale nodes needed to build the target stage for the (corpus, book) pairs, upstream first."""
+        nodes = list()
+        states = dict()
+
+        def visit(name: str, corpus: str, book: str) -> tuple:
+            if (name, book) in states:
+                return states[(name, book)]
+
+            stage = self._stages[name]
+            requires = [visit(required, corpus, book) for required in stage.REQUIRES]
+            inputs = stage.inputs(corpus, book)
+
+            if any(state == self.MISSING for state, _ in requires):
+                result = (self.MISSING, None)
+            elif not stage.REQUIRES and not all(path.is_file() for path in inputs):
+                self._missing += [(name, book, path) for path in inputs if not path.is_file()]
+                result = (self.MISSING, None)
+            else:
+                upstream = [node for state, node in requires if state == self.STALE]
+                if upstream or not self._manifest.fresh(
+                        stage.key(book), self._version, inputs, stage.outputs(corpus, book)) or \
+                        not stage.current(corpus, book):
+                    node = Node(stage, corpus, book, upstream)
+                    nodes.append(node)
+                    result = (self.STALE, node)
+                else:
+                    result = (self.FRESH, None)
+
+            states[(name, book)] = result
+            return result
+
+        for corpus, book in books:
+            visit(target, corpus, book)
+        return nodes
+
+    def run(self, nodes: list, logger: Logger, config: Config, command: str, jobs: int = 1) -> Iterator[tuple]:
+        """Builds the nodes, in a process pool if more than one job is asked for, where a node starts as soon
+        as the nodes it requires are done. Yields each node with its report as it is done and records it,
+        unless it logged errors so that it is built again next time."""
+        if jobs > 1 and len(nodes) > 1:
+            yield from self._parallel(nodes, logger, config, command, jobs)
+        else:
+            for node in nodes:
+                start = time.perf_counter()
+                errors, warnings = logger.errors, logger.warnings
+                report = node.stage.worker()(logger, config, *node.stage.task(node.corpus, node.book))
+                report.errors = logger.errors - errors
+                report.warnings = logger.warnings - warnings
+                report.elapsed = time.perf_counter() - start
+                self._record(node, report)
+                yield node, report
+
+    def _parallel(self, nodes: list, logger: Logger, config: Config, command: str, jobs: int) -> Iterator[tuple]:
+        waiting = dict((node, set(node.requires)) for node in nodes)
+        running = dict()
+
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            while waiting or running:
+                for node in [node for node, requires in waiting.items() if not requires]:
+                    del waiting[node]
+                    running[executor.submit(
+                        pooled, node.stage.worker(), config, command, *node.stage.task(node.corpus, node.book)
+                    )] = node
+
+                done, _ = wait(running.keys(), return_when=FIRST_COMPLETED)
+                for future in done:
+                    node = running.pop(future)
+                    report = future.result()
+                    logger.tally(report.errors, report.warnings)
+                    self._record(node, report)
+                    for requires in waiting.values():
+                        requires.discard(node)
+                    yield node, report
+
+    def _record(self, node: Node, report: Report):
+        if report.errors:
+            return
+        self._manifest.record(
+            node.key, self._version, node.stage.inputs(node.corpus, node.book),
+            node.stage.outputs(node.corpus, node.book))
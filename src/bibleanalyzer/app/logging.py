@@ -58,6 +58,11 @@ class Logger(logging.Logger):
         self._err_cnt += 1
         self.log(logging.ERROR, msg, *args, **kwargs)
 
+    def tally(self, errors: int, warnings: int):
+        """Account for errors and warnings that were logged by another logger, such as in a worker process."""
+        self._err_cnt += errors
+        self._warn_cnt += warnings
+
     @classmethod
     def file_format(cls, msg: str, path: Path, line: int, token: str = "here") -> str:
         return "{}:\n  File \"{}\", line {}, in {}".format(msg, path, line, token)
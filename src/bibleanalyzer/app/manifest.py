@@ -0,0 +1,99 @@
+#
+# Copyright (c) 2022 by Kristoffer Paulsson <kristoffer.paulsson@talenten.se>.
+#
+# Permission to use, copy, modify, and/or distribute this software for any purpose with
+# or without fee is hereby granted, provided that the above copyright notice and this
+# permission notice appear in all copies.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES WITH REGARD TO
+# THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS. IN NO
+# EVENT SHALL THE AUTHOR BE LIABLE FOR ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL
+# DAMAGES OR ANY DAMAGES WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER
+# IN AN ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF OR IN
+# CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+#
+#     https://opensource.org/licenses/ISC
+#
+# SPDX-License-Identifier: ISC
+#
+# Contributors:
+#     Kristoffer Paulsson - initial implementation
+#
+"""Manifest of the cache directory, used for skipping books whose inputs haven't changed."""
+import hashlib
+import json
+from pathlib import Path
+
+
+class Manifest:
+    """Records per book and stage the digests of the inputs and outputs and the version they were built with."""
+
+    FILENAME = "manifest.json"
+
+    def __init__(self, cache: Path):
+        self._path = cache.joinpath(self.FILENAME)
+        self._entries = dict()
+
+        if self._path.is_file():
+            try:
+                self._entries = json.loads(self._path.read_text(encoding="utf-8"))
+            except ValueError:
+                self._entries = dict()
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    @classmethod
+    def digest(cls, path: Path) -> str:
+        hash = hashlib.sha256()
+        with path.open("rb") as file:
+            for chunk in iter(lambda: file.read(1 << 20), b""):
+                hash.update(chunk)
+        return hash.hexdigest()
+
+    @classmethod
+    def stamp(cls, path: Path) -> dict:
+        stat = path.stat()
+        return {"digest": cls.digest(path), "size": stat.st_size, "mtime": stat.st_mtime_ns}
+
+    @classmethod
+    def matches(cls, stamp: dict, path: Path) -> bool:
+        """Compares a file against its stamp, only hashing the file if it has been touched."""
+        if not stamp or not path.is_file():
+            return False
+
+        stat = path.stat()
+        if stat.st_size != stamp["size"]:
+            return False
+        elif stat.st_mtime_ns == stamp["mtime"]:
+            return True
+        else:
+            return cls.digest(path) == stamp["digest"]
+
+    def fresh(self, key: str, version: str, inputs: list, outputs: list) -> bool:
+        entry = self._entries.get(key)
+        if not entry or entry["version"] != version:
+            return False
+
+        for kind, paths in (("inputs", inputs), ("outputs", outputs)):
+            stamps = entry[kind]
+            if set(stamps.keys()) != set(str(path) for path in paths):
+                return False
+            for path in paths:
+                if not self.matches(stamps[str(path)], path):
+                    return False
+        return True
+
+    def record(self, key: str, version: str, inputs: list, outputs: list):
+        self._entries[key] = {
+            "version": version,
+            "inputs": dict((str(path), self.stamp(path)) for path in inputs),
+            "outputs": dict((str(path), self.stamp(path)) for path in outputs),
+        }
+
+    def forget(self, key: str):
+        self._entries.pop(key, None)
+
+    def save(self):
+        self._path.write_text(json.dumps(self._entries, indent=2, sort_keys=True), encoding="utf-8")
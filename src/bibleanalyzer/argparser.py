@@ -40,6 +40,10 @@ class CLI:
         self._line(parsers)
         self._analyze(parsers)
         self._csv(parsers)
+        self._store(parsers)
+        self._index(parsers)
+        self._concordance(parsers)
+        self._pipeline(parsers)
         self._clean(parsers)
 
     @classmethod
@@ -50,20 +54,62 @@ class CLI:
         load = subparser.add_parser(name="load", help="Imports the corpora and caches them as \"parsings.\"")
         load.add_argument("corpus", choices=["all", "nt", "ot"], help="Which corpora to load.")
         load.add_argument("-v", "--verify", action="store_true", default=False, help="Verify output against source.")
+        load.add_argument("-j", "--jobs", type=int, default=1, help="Number of books to parse in parallel.")
+        load.add_argument("-f", "--force", action="store_true", default=False,
+                          help="Parse every book even if its corpus is unchanged.")
+        load.add_argument("-m", "--mmap", action="store_true", default=False,
+                          help="Read the corpus files memory mapped and only decode what is parsed.")
 
     def _line(self, subparser):
         line = subparser.add_parser(name="line", help="Lines up the corpora \"parsings\" into \"linear\" for analysis.")
         line.add_argument("corpus", choices=["all", "nt", "ot"], help="Which parsings to process.")
         line.add_argument("-v", "--verify", action="store_true", default=False, help="Verify output against source.")
+        line.add_argument("-j", "--jobs", type=int, default=1, help="Number of books to line up in parallel.")
+        line.add_argument("-f", "--force", action="store_true", default=False,
+                          help="Line up every book even if its parsing is unchanged.")
 
     def _analyze(self, subparser):
         line = subparser.add_parser(name="analyze", help="Analyzes the linear corpora.")
         line.add_argument("corpus", choices=["all", "nt", "ot"], help="Which linear to process.")
         line.add_argument("-v", "--verify", action="store_true", default=False, help="Verify output against source.")
+        line.add_argument("-j", "--jobs", type=int, default=1, help="Number of books to build and analyze in parallel.")
 
     def _csv(self, subparser):
         load = subparser.add_parser(name="csv", help="Exports the loaded corpora to comma separated value files.")
         load.add_argument("corpus", choices=["all", "nt", "ot"], help="Which parsings to export.")
+        load.add_argument("-j", "--jobs", type=int, default=1, help="Number of stale books to build in parallel.")
+
+    def _store(self, subparser):
+        store = subparser.add_parser(
+            name="store", help="Stores the parsings and linear in an SQLite database for lookups.")
+        store.add_argument("corpus", choices=["all", "nt", "ot"], help="Which parsings and linear to store.")
+        store.add_argument("-j", "--jobs", type=int, default=1, help="Number of stale books to build in parallel.")
+        store.add_argument("-f", "--force", action="store_true", default=False,
+                           help="Store every book even if its parsing and linear are unchanged.")
+
+    def _index(self, subparser):
+        index = subparser.add_parser(
+            name="index", help="Indexes the lexemes, morphology and phrases of the whole linear for lookups.")
+        index.set_defaults(corpus="all")
+        index.add_argument("-j", "--jobs", type=int, default=1, help="Number of stale books to build in parallel.")
+        index.add_argument("-f", "--force", action="store_true", default=False,
+                           help="Index the corpus even if its linear is unchanged.")
+
+    def _concordance(self, subparser):
+        concordance = subparser.add_parser(
+            name="concordance", help="Lists every occurrence of a lexeme in its context, requires the index.")
+        concordance.add_argument("lexeme", help="The lexeme to list, as in the corpus.")
+        concordance.add_argument("-w", "--width", type=int, default=5, help="Number of words to the left and right.")
+        concordance.add_argument("-o", "--output", default=None, help="Write the listing to a CSV file instead.")
+
+    def _pipeline(self, subparser):
+        pipeline = subparser.add_parser(
+            name="pipeline", help="Loads, lines up and analyzes the corpora in one pass without caching.")
+        pipeline.add_argument("corpus", choices=["all", "nt", "ot"], help="Which corpora to process.")
+        pipeline.add_argument("-c", "--cache", action="store_true", default=False,
+                              help="Also write the parsings and linear to the cache.")
+        pipeline.add_argument("-m", "--mmap", action="store_true", default=False,
+                              help="Read the corpus files memory mapped and only decode what is parsed.")
 
     def _clean(self, subparser):
         clean = subparser.add_parser(name="clean", help="Cleanses the cache or the logs directories.")
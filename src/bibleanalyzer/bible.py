@@ -100,6 +100,6 @@ class Bible:
         for token in token_iter:
             if ref.is_inside(token_iter.counter):
                 if isinstance(token, WordToken):
-                    Application.instance().logger.info(Grammar.format(Grammar.classify(token)))
+                    Application.instance().logger.info(Grammar.format(Grammar.classify(token), token))
                 else:
                     Application.instance().logger.info(token)
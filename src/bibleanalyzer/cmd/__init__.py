@@ -21,19 +21,37 @@
 #
 """The CMD (command) package stores all executable commands of the BibleAnalyzer.
 The init also contains the Command baseclass."""
+import hashlib
 import importlib
+import json
 import logging
+import pickle
+import time
 from argparse import Namespace
 from collections import ChainMap
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable, Iterator
 
 from bibleanalyzer.app.config import Config
-from ..data import NAME, VERSION
+from ..data import BOOKS, NAME, VERSION
+from bibleanalyzer.app.build import BuildGraph, Report, pooled
 from bibleanalyzer.app.logging import Logger
+from bibleanalyzer.app.manifest import Manifest
+
+
+def dump(path: Path, data: object) -> bool:
+    """Pickles the data to a cache file and checks the written file against the digest of what was pickled."""
+    content = pickle.dumps(data)
+    path.write_bytes(content)
+    return Manifest.digest(path) == hashlib.sha256(content).hexdigest()
 
 
 class Command:
     SUCCESS = 0
     FAIL = 0
+    FORMAT = 6
+    REQUIRES = None
 
     logger = None
 
@@ -45,6 +63,8 @@ class Command:
         self._runtime(config)
         self._validate(config)
         self._config = config
+        self._manifest = None
+        self._missing = set()
 
     @classmethod
     def execute(cls, args: Namespace) -> int:
@@ -61,6 +81,7 @@ class Command:
             )
 
             cmd = klass(config, args)
+            cmd.build()
             cmd()
         except Exception as e:
             status = cls.FAIL
@@ -86,10 +107,90 @@ class Command:
         self.logger.info("Cache directory: {}".format(config.get("cache")))
         self.logger.info("-" * 10 + " Runtime information " + "-" * 10)
 
+    @property
+    def version(self) -> str:
+        """Version of the program and cache format, books built with another version are rebuilt."""
+        return "{}/{}".format(VERSION, self.FORMAT)
+
+    @property
+    def manifest(self) -> Manifest:
+        if self._manifest is None:
+            self._manifest = Manifest(self._config.get("cache"))
+        return self._manifest
+
+    @property
+    def missing(self) -> set:
+        """Books whose source the build found missing and reported, which the command needn't report again."""
+        return self._missing
+
+    def unchanged(self, key: str, inputs: list, outputs: list) -> bool:
+        """Tells whether the outputs were built from the same inputs by this version and are still intact."""
+        if getattr(self._args, "force", False):
+            return False
+        return self.manifest.fresh(key, self.version, inputs, outputs)
+
+    @property
+    def jobs(self) -> int:
+        return max(1, getattr(self._args, "jobs", 1) or 1)
+
+    def dispatch(self, worker: Callable, tasks: list) -> Iterator[Report]:
+        """Runs the worker over every task, in a process pool if more than one job is asked for.
+        Reports are yielded in task order with the error and warning counts of their task, which are
+        added to the command logger, so the totals are the same as for a serial run."""
+        if self.jobs > 1 and len(tasks) > 1:
+            with ProcessPoolExecutor(max_workers=self.jobs) as executor:
+                futures = [executor.submit(pooled, worker, self._config, self._args.command, *task) for task in tasks]
+                for future in futures:
+                    report = future.result()
+                    self.logger.tally(report.errors, report.warnings)
+                    yield report
+        else:
+            for task in tasks:
+                start = time.perf_counter()
+                errors, warnings = self.logger.errors, self.logger.warnings
+                report = worker(self.logger, self._config, *task)
+                report.errors = self.logger.errors - errors
+                report.warnings = self.logger.warnings - warnings
+                report.elapsed = time.perf_counter() - start
+                yield report
+
+    def stages(self) -> list:
+        """The stages a command can require, imported here as their modules import this one."""
+        from .load import LoadStage
+        from .line import LineStage
+        return [LoadStage(self._config), LineStage(self._config)]
+
+    def build(self):
+        """Builds whatever is stale of the stage the command requires, and of the stages upstream of it,
+        for the books of the corpus given to the command."""
+        if not self.REQUIRES:
+            return
+
+        corpora = ["ot", "nt"] if self._args.corpus == "all" else [self._args.corpus]
+        books = [(corpus, book) for corpus in corpora for book in json.loads(BOOKS)[corpus]]
+        graph = BuildGraph(self.stages(), self.manifest, self.version)
+        nodes = graph.plan(self.REQUIRES, books)
+
+        for stage, book, path in graph.missing:
+            self._missing.add(book)
+            self.logger.error("The source of {} for {} is missing at: {}".format(stage, book.capitalize(), path))
+        if not nodes:
+            return
+
+        self.logger.info("Building {} stale stages before running".format(len(nodes)))
+        try:
+            for node, report in graph.run(nodes, self.logger, self._config, self._args.command, self.jobs):
+                self.logger.info("Built {} of {} in {:.2f} seconds".format(
+                    node.stage.NAME, node.book.title(), report.elapsed))
+        finally:
+            self.manifest.save()
+
     def __call__(self):
         raise NotImplementedError()
 
 
 __all__ = [
-    "Command"
+    "Command",
+    "Report",
+    "dump"
 ]
@@ -20,18 +20,26 @@
 #     Kristoffer Paulsson - initial implementation
 #
 """Module containing the ANALYZE command class."""
+import itertools
 import json
+from contextlib import nullcontext
 from pathlib import Path
 from pickle import Unpickler
 
-from . import Command
+from . import Command, Report
 from ..analyzer import Analyzer
+from ..app.config import Config
+from ..app.logging import Logger
 from ..data import BOOKS
-from bibleanalyzer.util.model import WordToken, PunctuationToken, VerseToken
 from ..structor import Structor
+from ..util.columnar import LinearColumns
+from ..util.vocabulary import Vocabulary
 
 
 class AnalyzeCommand(Command):
+    REQUIRES = "line"
+    SPLIT = 1 << 16
+
     def __call__(self):
         if self._args.corpus == "all":
             self.iterate("ot")
@@ -40,34 +48,62 @@ class AnalyzeCommand(Command):
             self.iterate(self._args.corpus)
 
     def iterate(self, corpus: str):
-        letters = set()
-        stats = dict()
-        terms = set()
-
         self.logger.info("Starting with parsing: {}".format(corpus.upper()))
         path = self._config.get("cache")
 
-        for book in json.loads(BOOKS)[corpus]:
-            filename = path.joinpath("linear-{}.pickle".format(book))
+        books = json.loads(BOOKS)[corpus]
+        tasks = list()
+        for book in books:
+            filename = path.joinpath("linear-{}.columns".format(book))
             if not filename.is_file():
-                self.logger.error("The linear for {} is missing at: {}".format(book.capitalize(), filename))
-            terms |= self.analyze(filename, corpus, book)
+                filename = path.joinpath("linear-{}.pickle".format(book))
+            if not filename.is_file():
+                if book not in self.missing:
+                    self.logger.error("The linear for {} is missing at: {}".format(book.capitalize(), filename))
+                continue
+            tasks += self.tasks(filename, corpus, book)
+
+        # The largest books first, so that they aren't left running alone at the end.
+        tasks.sort(key=lambda task: task[0], reverse=True)
+
+        results = dict((book, list()) for book in books)
+        for report in self.dispatch(analyze_book, [task for _, task in tasks]):
+            self.logger.info("Analyzed {} in {:.2f} seconds".format(report.book.title(), report.elapsed))
+            results[report.book].append(report.result)
+
+        terms = set()
+        for book in books:
+            for result in results[book]:
+                terms |= result
 
         print(len(terms), terms)
         self.logger.info("Finished with corpus: {}".format(corpus.upper()))
 
-    def analyze(self, filename: Path, corpus: str, book: str) -> set:
-        terms = set()
-        with filename.open("rb") as cache:
-            for section in Structor(Unpickler(cache).load()).section_iter():
-                for clause in section:
-                    terms |= Analyzer.analyze(clause)
-        return terms
+    def tasks(self, filename: Path, corpus: str, book: str) -> list:
+        """Tasks analyzing a book, each with its size for scheduling. With more than one job, books over SPLIT
+        tokens are split into ranges of whole sections to be analyzed side by side."""
+        size = filename.stat().st_size
+        if self.jobs == 1 or filename.suffix != ".columns":
+            return [(size, (filename, corpus, book))]
+
+        with LinearColumns(filename) as linear:
+            index = linear.section_index
+            count = index.count(1)
+            starts = [index.positions[index.section(1, current)[0]] for current in range(count)] + [len(linear)]
+
+        tasks = list()
+        first = 0
+        for current in range(1, count + 1):
+            if starts[current] - starts[first] >= self.SPLIT or current == count:
+                tasks.append((size * (starts[current] - starts[first]) // starts[-1], (
+                    filename, corpus, book, first, current)))
+                first = current
+        return tasks
 
     def export_json(self, filename: Path, corpus: str, book: str) -> list:
         sections = list()
-        with filename.open("rb") as cache:
-            for section in Structor(Unpickler(cache).load()).secref_iter():
+        with linear(filename) as tokens:
+            for section in Structor(tokens).secref_iter():
                 sections.append({
                     "chapter": section[0],
                     "verse": section[1],
@@ -78,21 +114,32 @@ class AnalyzeCommand(Command):
         return sections
 
 
-class Reconstructor:
+def linear(filename: Path):
+    """Opens the columns of a linear, or loads a pickled linear, for use as a context manager."""
+    if filename.suffix == ".columns":
+        return LinearColumns(filename)
+
+    with filename.open("rb") as cache:
+        return nullcontext(Unpickler(cache).load())
 
-    def __init__(self, book: str):
-        self._book = book
-        self._verify = ""
 
-    @property
-    def verify(self) -> str:
-        return self._verify.strip()
+def analyze_book(
+        logger: Logger, config: Config, filename: Path, corpus: str, book: str, first: int = 0, last: int = None
+) -> Report:
+    """Analyzes the sections of a book from first up to last, or all of them, into a set of terms.
+    Columns are analyzed in one batch over their arrays, a pickled linear clause by clause."""
+    terms = set()
+    with linear(filename) as tokens:
+        if isinstance(tokens, LinearColumns):
+            index = tokens.section_index
+            start, stop = index.clauses(1, first, last)
+            for group in Analyzer.agreements(
+                    index.starts[start:stop], index.stops[start:stop], tokens.packed, tokens.lexemes):
+                terms.add(" ".join(tokens.vocabulary.value(Vocabulary.LEXEME, lexeme) for lexeme in group))
+            return Report(book=book, result=terms)
 
-    def process(self, data: list):
-        for token in data:
-            if isinstance(token, WordToken):
-                self._verify += " " + token.word
-            elif isinstance(token, PunctuationToken):
-                self._verify += token.diacritic
-            elif isinstance(token, VerseToken):
-                self._verify += "\n"
+        sections = Structor(tokens).section_iter(1, first)
+        for section in itertools.islice(sections, None if last is None else last - first):
+            for clause in section:
+                terms |= Analyzer.analyze(clause)
+    return Report(book=book, result=terms)
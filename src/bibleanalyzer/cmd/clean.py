@@ -31,7 +31,7 @@ class CleanCommand(Command):
             self.clean(self._config["logs"], [".log"])
 
         if self._args.cache:
-            self.clean(self._config["cache"], [".pickle", ".csv", ".json"])
+            self.clean(self._config["cache"], [".pickle", ".columns", ".csv", ".json", ".sqlite"])
 
     def clean(self, folder: Path, suffixes: list):
         count = 0
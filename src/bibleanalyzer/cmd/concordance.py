@@ -0,0 +1,68 @@
+#
+# Copyright (c) 2022 by Kristoffer Paulsson <kristoffer.paulsson@talenten.se>.
+#
+# Permission to use, copy, modify, and/or distribute this software for any purpose with
+# or without fee is hereby granted, provided that the above copyright notice and this
+# permission notice appear in all copies.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES WITH REGARD TO
+# THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS. IN NO
+# EVENT SHALL THE AUTHOR BE LIABLE FOR ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL
+# DAMAGES OR ANY DAMAGES WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER
+# IN AN ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF OR IN
+# CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+#
+#     https://opensource.org/licenses/ISC
+#
+# SPDX-License-Identifier: ISC
+#
+# Contributors:
+#     Kristoffer Paulsson - initial implementation
+#
+"""Module containing the CONCORDANCE command class."""
+import csv
+import sys
+import time
+from collections import ChainMap
+
+from . import Command
+from .index import IndexCommand
+from ..app.manifest import Manifest
+from ..concordance import Concordance
+from ..index.postings import PostingsIndex
+
+
+class ConcordanceCommand(Command):
+
+    def _validate(self, config: ChainMap):
+        Command._validate(self, config)
+        cache = config.get("cache")
+        if not cache.joinpath(PostingsIndex.FILENAME).is_file():
+            raise RuntimeError("Postings index not found, run the index command first.")
+        if not Manifest(cache).fresh(
+                IndexCommand.key(), self.version, IndexCommand.linears(cache), IndexCommand.outputs(cache)):
+            raise RuntimeError("Postings index is stale against the linear, run the index command again.")
+
+    def __call__(self):
+        start = time.perf_counter()
+        count = 0
+        with Concordance(self._config.get("cache"), self._args.width) as concordance:
+            if not concordance.index.lexeme(self._args.lexeme):
+                self.logger.warning("The lexeme {} isn't in the corpus".format(self._args.lexeme))
+                return
+
+            if self._args.output:
+                with open(self._args.output, "w", encoding="utf-8", newline="") as file:
+                    writer = csv.DictWriter(file, fieldnames=Concordance.FIELDS)
+                    writer.writeheader()
+                    for line in concordance.lines(self._args.lexeme):
+                        writer.writerow(line.row())
+                        count += 1
+            else:
+                write = sys.stdout.write
+                for line in concordance.lines(self._args.lexeme):
+                    write(str(line) + "\n")
+                    count += 1
+
+        self.logger.info("Listed {} occurrences of {} in {} seconds".format(
+            count, self._args.lexeme, round(time.perf_counter() - start, 2)))
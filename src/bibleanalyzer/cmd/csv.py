@@ -32,6 +32,8 @@ from ..data import BOOKS
 
 
 class CsvCommand(Command):
+    REQUIRES = "load"
+
     def __call__(self):
         if self._args.corpus == "all":
             self.iterate2("ot")
@@ -46,7 +48,9 @@ class CsvCommand(Command):
         for book in json.loads(BOOKS)[corpus]:
             filename = path.joinpath("parsing-{}.pickle".format(book))
             if not filename.is_file():
-                self.logger.error("The parsing for {} is missing at: {}".format(book.capitalize(), filename))
+                if book not in self.missing:
+                    self.logger.error("The parsing for {} is missing at: {}".format(book.capitalize(), filename))
+                continue
             print(self.export(filename, corpus, book))
 
         self.logger.info("Finished with corpus: {}".format(corpus.upper()))
@@ -85,7 +89,10 @@ class CsvCommand(Command):
             for book in json.loads(BOOKS)[corpus]:
                 filename = path.joinpath("parsing-{}.pickle".format(book))
                 if not filename.is_file():
-                    self.logger.error("The parsing for {} is missing at: {}".format(book.capitalize(), filename))
+                    if book not in self.missing:
+                        self.logger.error(
+                            "The parsing for {} is missing at: {}".format(book.capitalize(), filename))
+                    continue
                 self.export2(filename, writer, book)
 
         self.logger.info("Finished with corpus: {}".format(corpus.upper()))
@@ -0,0 +1,100 @@
+#
+# Copyright (c) 2022 by Kristoffer Paulsson <kristoffer.paulsson@talenten.se>.
+#
+# Permission to use, copy, modify, and/or distribute this software for any purpose with
+# or without fee is hereby granted, provided that the above copyright notice and this
+# permission notice appear in all copies.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES WITH REGARD TO
+# THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS. IN NO
+# EVENT SHALL THE AUTHOR BE LIABLE FOR ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL
+# DAMAGES OR ANY DAMAGES WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER
+# IN AN ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF OR IN
+# CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+#
+#     https://opensource.org/licenses/ISC
+#
+# SPDX-License-Identifier: ISC
+#
+# Contributors:
+#     Kristoffer Paulsson - initial implementation
+#
+"""Module containing the INDEX command class."""
+import json
+import time
+from contextlib import ExitStack
+from pathlib import Path
+
+from . import Command
+from ..data import BOOKS
+from ..index.bitmap import MorphologyBitmaps
+from ..index.postings import PostingsIndex
+from ..index.suffix import SuffixIndex
+from ..util.columnar import LinearColumns
+from ..util.vocabulary import Vocabulary
+
+
+class IndexCommand(Command):
+    REQUIRES = "line"
+
+    def __call__(self):
+        # The indexes share one position scheme over the whole corpus, so they always index every book.
+        corpora = ["ot", "nt"]
+        inputs = [filename for corpus in corpora for filename in self.inputs(corpus)]
+        outputs = self.outputs(self._config.get("cache"))
+        postings, bitmaps, lexemes, forms = outputs
+
+        if self.unchanged(self.key(), inputs, outputs):
+            self.logger.info("The linear is unchanged, skipping")
+            return
+
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            vocabulary = stack.enter_context(Vocabulary(self._config.get("cache").joinpath(Vocabulary.FILENAME)))
+            books = [(self.book(filename), stack.enter_context(LinearColumns(filename, vocabulary)))
+                     for filename in inputs]
+            PostingsIndex.write(postings, books)
+            MorphologyBitmaps.write(bitmaps, books)
+            SuffixIndex.write(lexemes, books, Vocabulary.LEXEME)
+            SuffixIndex.write(forms, books, Vocabulary.FORM)
+        self.manifest.record(self.key(), self.version, inputs, outputs)
+        self.manifest.save()
+
+        msg = "Indexed {} books in {} seconds".format(len(inputs), round(time.perf_counter() - start, 2))
+        self.logger.info(msg)
+        print(msg)
+
+    def inputs(self, corpus: str) -> list:
+        path = self._config.get("cache")
+        inputs = list()
+        for book in json.loads(BOOKS)[corpus]:
+            filename = path.joinpath("linear-{}.columns".format(book))
+            if not filename.is_file():
+                if book not in self.missing:
+                    self.logger.error("The linear for {} is missing at: {}".format(book.capitalize(), filename))
+                continue
+            inputs.append(filename)
+        return inputs
+
+    @classmethod
+    def key(cls) -> str:
+        return "index"
+
+    @classmethod
+    def linears(cls, cache: Path) -> list:
+        """The linear of every book in the cache, in the order the indexes take them."""
+        filenames = [cache.joinpath("linear-{}.columns".format(book)) for book in PostingsIndex.BOOKS]
+        return [filename for filename in filenames if filename.is_file()]
+
+    @classmethod
+    def outputs(cls, cache: Path) -> list:
+        return [
+            cache.joinpath(PostingsIndex.FILENAME),
+            cache.joinpath(MorphologyBitmaps.FILENAME),
+            cache.joinpath(SuffixIndex.filename(Vocabulary.LEXEME)),
+            cache.joinpath(SuffixIndex.filename(Vocabulary.FORM)),
+        ]
+
+    @classmethod
+    def book(cls, filename: Path) -> str:
+        return filename.stem.split("-", 1)[1]
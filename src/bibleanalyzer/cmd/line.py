@@ -22,15 +22,24 @@
 """Module containing the LINE command class."""
 import json
 from pathlib import Path
-from pickle import Pickler, Unpickler
+from pickle import Unpickler
+from typing import Callable
 
-from . import Command
+from . import Command, Report, dump
+from ..app.build import Stage
+from ..app.config import Config
+from ..app.logging import Logger
 from ..data import BOOKS
 from ..liner import Liner
+from bibleanalyzer.util.columnar import LinearColumns
 from bibleanalyzer.util.model import WordToken, PunctuationToken, VerseToken
+from bibleanalyzer.util.verify import VerseDigest
+from bibleanalyzer.util.vocabulary import Vocabulary
 
 
 class LineCommand(Command):
+    REQUIRES = "load"
+
     def __call__(self):
         if self._args.corpus == "all":
             self.iterate("ot")
@@ -39,70 +48,144 @@ class LineCommand(Command):
             self.iterate(self._args.corpus)
 
     def iterate(self, corpus: str):
-        letters = set()
-        stats = dict()
-
         self.logger.info("Starting with parsing: {}".format(corpus.upper()))
         path = self._config.get("cache")
+        stage = LineStage(self._config)
+        tasks = list()
 
         for book in json.loads(BOOKS)[corpus]:
             filename = path.joinpath("parsing-{}.pickle".format(book))
             if not filename.is_file():
-                self.logger.error("The parsing for {} is missing at: {}".format(book.capitalize(), filename))
-            liner = self.lineup(filename, corpus, book)
+                if book not in self.missing:
+                    self.logger.error("The parsing for {} is missing at: {}".format(book.capitalize(), filename))
+                continue
+            elif self.unchanged(self.key(book), [filename], self.outputs(book)) and stage.current(corpus, book):
+                self.logger.info("The parsing for {} is unchanged, skipping".format(book.capitalize()))
+                continue
+            tasks.append((filename, corpus, book, self._args.verify))
+
+        for report in self.dispatch(line_book, tasks):
+            self.logger.info("Lined up {} in {:.2f} seconds".format(report.book.title(), report.elapsed))
+            if report.errors:
+                continue
+            self.manifest.record(
+                self.key(report.book), self.version, [path.joinpath("parsing-{}.pickle".format(report.book))],
+                self.outputs(report.book)
+            )
+
+        self.manifest.save()
+        self.logger.info("Finished with corpus: {}".format(corpus.upper()))
 
-            letters |= liner.letters
-            for key, value in liner.stats.items():
-                if key in stats.keys():
-                    stats[key] += value
-                else:
-                    stats[key] = value
+    def key(self, book: str) -> str:
+        return "line-{}".format(book)
 
-        self.logger.info("Finished with corpus: {}".format(corpus.upper()))
+    def cache_path(self, book: str) -> Path:
+        return self._config.get("cache").joinpath("linear-{}.pickle".format(book))
 
-    def lineup(self, filename: Path, corpus: str, book: str) -> Liner:
-        liner = Liner(self.logger)
-        with filename.open("rb") as cache:
-            data = Unpickler(cache).load()
+    def columns_path(self, book: str) -> Path:
+        return self._config.get("cache").joinpath("linear-{}.columns".format(book))
 
-            liner.process(data, book)
+    def outputs(self, book: str) -> list:
+        return [self.cache_path(book), self.columns_path(book)]
 
-        cache_path = self._config.get("cache").joinpath("linear-{}.pickle".format(book))
-        with cache_path.open("wb") as cache:
-            cache.truncate()
-            Pickler(cache).dump(liner.linear)
 
-        reconstruction = Reconstructor(book)
-        with cache_path.open("rb") as cache:
-            reconstruction.process(Unpickler(cache).load())
+class LineStage(Stage):
+    """Lining up of a book from its parsing."""
 
-        if liner.verify != reconstruction.verify:
-            self.logger.error("Failed verification of {} in {}".format(book.title(), corpus.upper()))
-            with self._config.get("cache").joinpath("verify-{}_1.txt".format(book)).open("w") as cache:
-                cache.truncate()
-                cache.write(liner.verify)
-            with self._config.get("cache").joinpath("verify-{}_2.txt".format(book)).open("w") as cache:
+    NAME = "line"
+    REQUIRES = ("load",)
+
+    def __init__(self, config: Config):
+        Stage.__init__(self, config)
+        self._generation = None
+
+    def inputs(self, corpus: str, book: str) -> list:
+        return [self._config.get("cache").joinpath("parsing-{}.pickle".format(book))]
+
+    def outputs(self, corpus: str, book: str) -> list:
+        return [
+            self._config.get("cache").joinpath("linear-{}.pickle".format(book)),
+            self._config.get("cache").joinpath("linear-{}.columns".format(book))
+        ]
+
+    def current(self, corpus: str, book: str) -> bool:
+        """The columns hold vocabulary ids, so they are only current with the vocabulary they were written with."""
+        if self._generation is None:
+            self._generation = Vocabulary.read_generation(self._config.get("cache").joinpath(Vocabulary.FILENAME))
+        generation = LinearColumns.generation(self.outputs(corpus, book)[1])
+        return generation is not None and generation == self._generation
+
+    def task(self, corpus: str, book: str) -> tuple:
+        return self.inputs(corpus, book)[0], corpus, book
+
+    def worker(self) -> Callable:
+        return line_book
+
+
+def line_book(logger: Logger, config: Config, filename: Path, corpus: str, book: str, verify: bool = False) -> Report:
+    """Lines up one book and caches the linear, both pickled and as columns. The pickle is only read back
+    and reconstructed if the written file doesn't match what was pickled, or if a verification is asked for."""
+    liner = Liner(logger)
+    with filename.open("rb") as cache:
+        data = Unpickler(cache).load()
+
+        liner.process(data, book)
+
+    cache_path = config.get("cache").joinpath("linear-{}.pickle".format(book))
+    LinearColumns.write(config.get("cache").joinpath("linear-{}.columns".format(book)), liner.linear)
+    if dump(cache_path, liner.linear) and not verify:
+        return Report(book=book)
+
+    reconstruction = Reconstructor(book)
+    with cache_path.open("rb") as cache:
+        data = Unpickler(cache).load()
+        reconstruction.process(data)
+
+    verses = liner.digest.differ(reconstruction.digest)
+    if verses:
+        logger.error("Failed verification of {} in {}".format(book.title(), corpus.upper()))
+        for suffix, linear in (("1", liner.linear), ("2", data)):
+            texts = Reconstructor.verses(linear, verses)
+            with config.get("cache").joinpath("verify-{}_{}.txt".format(book, suffix)).open("w") as cache:
                 cache.truncate()
-                cache.write(reconstruction.verify)
+                cache.write("\n".join("{}: {}".format(verse, texts.get(verse, "")) for verse in verses))
 
-        return liner
+    return Report(book=book)
 
 
 class Reconstructor:
 
     def __init__(self, book: str):
         self._book = book
-        self._verify = ""
+        self._digest = VerseDigest()
+        self._digest.verse()
 
     @property
-    def verify(self) -> str:
-        return self._verify.strip()
+    def digest(self) -> VerseDigest:
+        return self._digest
 
     def process(self, data: list):
         for token in data:
             if isinstance(token, WordToken):
-                self._verify += " " + token.word
+                self._digest.update(" " + token.word)
             elif isinstance(token, PunctuationToken):
-                self._verify += token.diacritic
+                self._digest.update(token.diacritic)
             elif isinstance(token, VerseToken):
-                self._verify += "\n"
+                self._digest.verse()
+
+    @classmethod
+    def verses(cls, data: list, verses: list) -> dict:
+        """Reconstructs the text of the given verses only, counting the tokens before the first verse as one."""
+        wanted = set(verses)
+        texts = dict()
+        verse = 0
+
+        for token in data:
+            if isinstance(token, VerseToken):
+                verse += 1
+            elif verse in wanted:
+                if isinstance(token, WordToken):
+                    texts[verse] = texts.get(verse, "") + " " + token.word
+                elif isinstance(token, PunctuationToken):
+                    texts[verse] = texts.get(verse, "") + token.diacritic
+        return texts
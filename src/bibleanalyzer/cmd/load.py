@@ -22,11 +22,16 @@
 """Module containing the LOAD command class."""
 import json
 from pathlib import Path
-from pickle import Pickler, Unpickler
+from pickle import Unpickler
+from typing import Callable
 
-from . import Command
+from . import Command, Report, dump
+from ..app.build import Stage
+from ..app.config import Config
+from ..app.logging import Logger
 from ..data import BOOKS
 from ..loader import TextLoader
+from ..util.verify import VerseDigest
 
 
 class LoadCommand(Command):
@@ -46,42 +51,117 @@ class LoadCommand(Command):
         translation = self.CORPUS[corpus]
         self.logger.info("Starting with corpora: {}".format(corpus.upper()))
         path = self._config.get("corpus").joinpath(corpus)
+        tasks = list()
 
         for book in json.loads(BOOKS)[corpus]:
             filename = path.joinpath("{}.txt".format(book))
             if not filename.is_file():
-                self.logger.error("The corpus for {} is missing at: {}".format(book.capitalize(), filename))
-            self.parse(filename, corpus, book, translation)
-
+                if book not in self.missing:
+                    self.logger.error("The corpus for {} is missing at: {}".format(book.capitalize(), filename))
+                continue
+            elif self.unchanged(self.key(book), [filename], [self.cache_path(book)]):
+                self.logger.info("The corpus for {} is unchanged, skipping".format(book.capitalize()))
+                continue
+            tasks.append((filename, corpus, book, translation, self._args.mmap, self._args.verify))
+
+        for report in self.dispatch(parse_book, tasks):
+            self.logger.info("Parsed {} in {:.2f} seconds".format(report.book.title(), report.elapsed))
+            if report.errors:
+                continue
+            self.manifest.record(
+                self.key(report.book), self.version, [path.joinpath("{}.txt".format(report.book))],
+                [self.cache_path(report.book)]
+            )
+
+        self.manifest.save()
         self.logger.info("Finished with corpus: {}".format(corpus.upper()))
 
-    def parse(self, filename: Path, corpus: str, book: str, translation: str):
-        loader = TextLoader(self.logger, translation)
-        loader.process(filename)
+    def key(self, book: str) -> str:
+        return "load-{}".format(book)
+
+    def cache_path(self, book: str) -> Path:
+        return self._config.get("cache").joinpath("parsing-{}.pickle".format(book))
+
+    def parse(self, filename: Path, corpus: str, book: str, translation: str) -> Report:
+        return parse_book(
+            self.logger, self._config, filename, corpus, book, translation, self._args.mmap, self._args.verify)
+
+
+class LoadStage(Stage):
+    """Parsing of a book from its corpus file."""
+
+    NAME = "load"
+
+    def inputs(self, corpus: str, book: str) -> list:
+        return [self._config.get("corpus").joinpath(corpus, "{}.txt".format(book))]
+
+    def outputs(self, corpus: str, book: str) -> list:
+        return [self._config.get("cache").joinpath("parsing-{}.pickle".format(book))]
+
+    def task(self, corpus: str, book: str) -> tuple:
+        return self.inputs(corpus, book)[0], corpus, book, LoadCommand.CORPUS[corpus]
 
-        cache_path = self._config.get("cache").joinpath("parsing-{}.pickle".format(book))
-        with cache_path.open("wb") as cache:
-            Pickler(cache).dump(loader.data)
+    def worker(self) -> Callable:
+        return parse_book
 
-        reconstruction = Reconstructor(book)
-        with cache_path.open("rb") as cache:
-            reconstruction.process(Unpickler(cache).load())
 
-        if loader.verify != reconstruction.verify:
-            self.logger.error("Failed verification of {} in {}".format(book.title(), corpus.upper()))
+def parse_book(
+        logger: Logger, config: Config, filename: Path, corpus: str, book: str, translation: str,
+        mapped: bool = False, verify: bool = False
+) -> Report:
+    """Parses one book and caches the parsing, runs in a worker process when loading in parallel.
+    The cache is only read back and reconstructed if the written file doesn't match what was pickled,
+    or if a full verification is asked for."""
+    loader = TextLoader(logger, translation, mapped)
+    loader.process(filename)
+
+    cache_path = config.get("cache").joinpath("parsing-{}.pickle".format(book))
+    if dump(cache_path, loader.data) and not verify:
+        return Report(book=book)
+
+    reconstruction = Reconstructor(book)
+    with cache_path.open("rb") as cache:
+        data = Unpickler(cache).load()
+        reconstruction.process(data)
+
+    verses = loader.digest.differ(reconstruction.digest)
+    if verses:
+        logger.error("Failed verification of {} in {}".format(book.title(), corpus.upper()))
+        original = Reconstructor.verses(loader.data, verses)
+        cached = Reconstructor.verses(data, verses)
+        for verse in verses:
+            logger.error("Verse {} differs, parsed: '{}', cached: '{}'".format(
+                verse + 1, original.get(verse, ""), cached.get(verse, "")))
+
+    return Report(book=book)
 
 
 class Reconstructor:
 
     def __init__(self, book: str):
         self._book = book
-        self._verify = ""
+        self._digest = VerseDigest()
 
     @property
-    def verify(self) -> str:
-        return self._verify.strip()
+    def digest(self) -> VerseDigest:
+        return self._digest
 
     def process(self, data: list):
         for item in data:
             if item.text:
-                self._verify += item.text.strip() + "\n"
+                self._digest.verse()
+                self._digest.update(item.text.strip())
+
+    @classmethod
+    def verses(cls, data: list, verses: list) -> dict:
+        """Reconstructs the text of the given verses only."""
+        wanted = set(verses)
+        texts = dict()
+        verse = -1
+
+        for item in data:
+            if item.text:
+                verse += 1
+                if verse in wanted:
+                    texts[verse] = item.text.strip()
+        return texts
@@ -0,0 +1,88 @@
+#
+# Copyright (c) 2021 by Kristoffer Paulsson <kristoffer.paulsson@talenten.se>.
+#
+# Permission to use, copy, modify, and/or distribute this software for any purpose with
+# or without fee is hereby granted, provided that the above copyright notice and this
+# permission notice appear in all copies.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES WITH REGARD TO
+# THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS. IN NO
+# EVENT SHALL THE AUTHOR BE LIABLE FOR ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL
+# DAMAGES OR ANY DAMAGES WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER
+# IN AN ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF OR IN
+# CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+#
+#     https://opensource.org/licenses/ISC
+#
+# SPDX-License-Identifier: ISC
+#
+# Contributors:
+#     Kristoffer Paulsson - initial implementation
+#
+"""Module containing the PIPELINE command class."""
+import json
+import time
+
+from . import Command, dump
+from .line import LineStage
+from .load import LoadCommand, LoadStage
+from ..analyzer import Analyzer
+from ..data import BOOKS
+from ..pipeline import Pipeline
+from ..util.columnar import LinearColumns
+
+
+class PipelineCommand(Command):
+    def __call__(self):
+        if self._args.corpus == "all":
+            self.iterate("ot")
+            self.iterate("nt")
+        else:
+            self.iterate(self._args.corpus)
+
+        if self._args.cache:
+            self.manifest.save()
+
+    def iterate(self, corpus: str):
+        terms = set()
+        load = LoadStage(self._config)
+        line = LineStage(self._config)
+
+        self.logger.info("Starting with corpus: {}".format(corpus.upper()))
+        for book in json.loads(BOOKS)[corpus]:
+            filename = load.inputs(corpus, book)[0]
+            if not filename.is_file():
+                self.logger.error("The corpus for {} is missing at: {}".format(book.capitalize(), filename))
+                continue
+
+            start = time.perf_counter()
+            errors = self.logger.errors
+            pipeline = Pipeline(self.logger, LoadCommand.CORPUS[corpus], self._args.mmap, self._args.cache)
+            for section in pipeline.process(filename, book).section_iter():
+                for clause in section:
+                    terms |= Analyzer.analyze(clause)
+
+            if self._args.cache:
+                self.cache(load, line, corpus, book, pipeline, errors)
+            self.logger.info("Streamed {} in {:.2f} seconds".format(book.title(), time.perf_counter() - start))
+
+        print(len(terms), terms)
+        self.logger.info("Finished with corpus: {}".format(corpus.upper()))
+
+    def cache(self, load: LoadStage, line: LineStage, corpus: str, book: str, pipeline: Pipeline, errors: int):
+        """Writes the parsing and linear as the load and line commands would and records them as built,
+        unless more errors were logged than the given count from before the book was streamed."""
+        parsing = load.outputs(corpus, book)[0]
+        pickled, columns = line.outputs(corpus, book)
+
+        if not dump(parsing, pipeline.entries) or not dump(pickled, pipeline.linear):
+            self.logger.error("Failed to write the caches of {}".format(book.title()))
+            return
+        LinearColumns.write(columns, pipeline.linear)
+        if self.logger.errors > errors:
+            self.manifest.forget(load.key(book))
+            self.manifest.forget(line.key(book))
+            return
+
+        self.manifest.record(load.key(book), self.version, load.inputs(corpus, book), load.outputs(corpus, book))
+        self.manifest.record(line.key(book), self.version, line.inputs(corpus, book), line.outputs(corpus, book))
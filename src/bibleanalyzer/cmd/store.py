@@ -0,0 +1,89 @@
+#
+# Copyright (c) 2021 by Kristoffer Paulsson <kristoffer.paulsson@talenten.se>.
+#
+# Permission to use, copy, modify, and/or distribute this software for any purpose with
+# or without fee is hereby granted, provided that the above copyright notice and this
+# permission notice appear in all copies.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES WITH REGARD TO
+# THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS. IN NO
+# EVENT SHALL THE AUTHOR BE LIABLE FOR ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL
+# DAMAGES OR ANY DAMAGES WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER
+# IN AN ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF OR IN
+# CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+#
+#     https://opensource.org/licenses/ISC
+#
+# SPDX-License-Identifier: ISC
+#
+# Contributors:
+#     Kristoffer Paulsson - initial implementation
+#
+"""Module containing the STORE command class."""
+import itertools
+import json
+import time
+from pickle import Unpickler
+
+from . import Command
+from ..data import BOOKS
+from ..store import CorpusStore
+from ..util.columnar import LinearColumns
+
+
+class StoreCommand(Command):
+    REQUIRES = "line"
+
+    def __call__(self):
+        corpora = ["ot", "nt"] if self._args.corpus == "all" else [self._args.corpus]
+        path = self._config.get("cache").joinpath(CorpusStore.FILENAME)
+        self._existing = path.is_file()
+        self._stored = list()
+
+        start = time.perf_counter()
+        with CorpusStore(path) as store:
+            store.ingest(itertools.chain.from_iterable(self.iterate(corpus) for corpus in corpora))
+
+        for key, inputs in self._stored:
+            self.manifest.record(key, self.version, inputs, list())
+        self.manifest.save()
+
+        msg = "Stored {} books in {} seconds".format(len(self._stored), round(time.perf_counter() - start, 2))
+        self.logger.info(msg)
+        print(msg)
+
+    def iterate(self, corpus: str):
+        self.logger.info("Starting with storing: {}".format(corpus.upper()))
+        path = self._config.get("cache")
+
+        for book in json.loads(BOOKS)[corpus]:
+            parsing = path.joinpath("parsing-{}.pickle".format(book))
+            linear = path.joinpath("linear-{}.pickle".format(book))
+            if not parsing.is_file() or not linear.is_file():
+                if book not in self.missing:
+                    self.logger.error(
+                        "The parsing or linear for {} is missing at: {}".format(book.capitalize(), path))
+                continue
+            elif self._existing and self.unchanged(self.key(book), [parsing, linear], list()):
+                self.logger.info("The parsing and linear for {} are unchanged, skipping".format(book.capitalize()))
+                continue
+
+            with parsing.open("rb") as cache:
+                entries = Unpickler(cache).load()
+
+            yield corpus, book, entries, self.linear(book)
+            self._stored.append((self.key(book), [parsing, linear]))
+
+        self.logger.info("Finished with corpus: {}".format(corpus.upper()))
+
+    def key(self, book: str) -> str:
+        return "store-{}".format(book)
+
+    def linear(self, book: str) -> list:
+        columns = self._config.get("cache").joinpath("linear-{}.columns".format(book))
+        if columns.is_file():
+            with LinearColumns(columns) as linear:
+                return list(linear)
+
+        with self._config.get("cache").joinpath("linear-{}.pickle".format(book)).open("rb") as cache:
+            return Unpickler(cache).load()
@@ -0,0 +1,138 @@
+#
+# Copyright (c) 2022 by Kristoffer Paulsson <kristoffer.paulsson@talenten.se>.
+#
+# Permission to use, copy, modify, and/or distribute this software for any purpose with
+# or without fee is hereby granted, provided that the above copyright notice and this
+# permission notice appear in all copies.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES WITH REGARD TO
+# THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS. IN NO
+# EVENT SHALL THE AUTHOR BE LIABLE FOR ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL
+# DAMAGES OR ANY DAMAGES WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER
+# IN AN ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF OR IN
+# CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+#
+#     https://opensource.org/licenses/ISC
+#
+# SPDX-License-Identifier: ISC
+#
+# Contributors:
+#     Kristoffer Paulsson - initial implementation
+#
+"""Keyword in context listings of the lexemes of the corpus."""
+from pathlib import Path
+from typing import Iterator
+
+from bibleanalyzer.index.postings import PostingsIndex
+from bibleanalyzer.util.columnar import LinearColumns
+from bibleanalyzer.util.vocabulary import Vocabulary
+
+
+class ConcordanceLine:
+    """A word with the words to the left and right of it and the verse it is in."""
+
+    __slots__ = ("book", "chapter", "verse", "left", "keyword", "right")
+
+    def __init__(self, book: str, chapter: int, verse: int, left: str, keyword: str, right: str):
+        self.book = book
+        self.chapter = chapter
+        self.verse = verse
+        self.left = left
+        self.keyword = keyword
+        self.right = right
+
+    @property
+    def reference(self) -> str:
+        return "{} {}:{}".format(self.book, self.chapter, self.verse)
+
+    def row(self) -> dict:
+        return {"book": self.book, "chapter": self.chapter, "verse": self.verse,
+                "left": self.left, "keyword": self.keyword, "right": self.right.lstrip()}
+
+    def __str__(self) -> str:
+        return "{:<20}{:>48} {}{}".format(self.reference, self.left, self.keyword, self.right)
+
+
+class Concordance:
+    """Lists the occurrences of a lexeme in order of the corpus from the postings index. The context is read from
+    the linear columns of one book at a time, only the tokens around each occurrence are looked at."""
+
+    FIELDS = ("book", "chapter", "verse", "left", "keyword", "right")
+
+    def __init__(self, cache: Path, width: int = 5):
+        self._cache = cache
+        self._width = width
+        self._vocabulary = Vocabulary(cache.joinpath(Vocabulary.FILENAME))
+        self._index = PostingsIndex(cache.joinpath(PostingsIndex.FILENAME), self._vocabulary)
+        self._forms = self._vocabulary.values(Vocabulary.FORM)
+
+    @property
+    def index(self) -> PostingsIndex:
+        return self._index
+
+    def lines(self, lexeme: str) -> Iterator[ConcordanceLine]:
+        book = None
+        columns = None
+        try:
+            for position in self._index.positions(self._index.lexeme(lexeme)):
+                current = PostingsIndex.BOOKS[position >> PostingsIndex.SHIFT]
+                if current != book:
+                    if columns:
+                        columns.close()
+                    book = current
+                    columns = LinearColumns(self._cache.joinpath("linear-{}.columns".format(book)), self._vocabulary)
+                    self._forms = self._vocabulary.values(Vocabulary.FORM)
+                yield self.line(columns, book, position & PostingsIndex.MASK)
+        finally:
+            if columns:
+                columns.close()
+
+    def line(self, columns: LinearColumns, book: str, offset: int) -> ConcordanceLine:
+        kinds = columns.kinds
+        words = columns.words
+        forms = self._forms
+        word = LinearColumns.WORD
+        punctuation = LinearColumns.PUNCTUATION
+
+        left = list()
+        count = 0
+        index = offset - 1
+        while index >= 0 and count < self._width:
+            kind = kinds[index]
+            if kind == word:
+                left.append(" " + forms[words[index]])
+                count += 1
+            elif kind == punctuation:
+                left.append(forms[words[index]])
+            index -= 1
+
+        right = list()
+        count = 0
+        index = offset + 1
+        length = len(kinds)
+        while index < length:
+            kind = kinds[index]
+            if kind == word:
+                if count == self._width:
+                    break
+                right.append(" " + forms[words[index]])
+                count += 1
+            elif kind == punctuation:
+                right.append(forms[words[index]])
+            elif count == self._width:
+                break
+            index += 1
+
+        return ConcordanceLine(
+            book, columns.chapters[offset], columns.verses[offset], "".join(reversed(left)).lstrip(),
+            forms[words[offset]], "".join(right))
+
+    def close(self):
+        self._index.close()
+        self._vocabulary.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
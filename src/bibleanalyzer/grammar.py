@@ -30,5 +30,5 @@ class Grammar:
         return MorphologyBWG.parse(word)
 
     @classmethod
-    def format(cls, word: Word):
-        return MorphologyBWG.format_word(word)
+    def format(cls, word: Word, token: WordToken):
+        return MorphologyBWG.format_word(word, token)
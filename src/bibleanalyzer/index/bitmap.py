@@ -0,0 +1,267 @@
+#
+# Copyright (c) 2022 by Kristoffer Paulsson <kristoffer.paulsson@talenten.se>.
+#
+# Permission to use, copy, modify, and/or distribute this software for any purpose with
+# or without fee is hereby granted, provided that the above copyright notice and this
+# permission notice appear in all copies.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES WITH REGARD TO
+# THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS. IN NO
+# EVENT SHALL THE AUTHOR BE LIABLE FOR ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL
+# DAMAGES OR ANY DAMAGES WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER
+# IN AN ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF OR IN
+# CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+#
+#     https://opensource.org/licenses/ISC
+#
+# SPDX-License-Identifier: ISC
+#
+# Contributors:
+#     Kristoffer Paulsson - initial implementation
+#
+"""Bitmap indexes of the morphology of the corpus, one bitmap per value of every inflexion.
+
+The bitmaps are over the positions of the postings index and split into chunks of 65536 positions as roaring
+bitmaps are. A chunk is a Python integer in memory, so AND and OR run a machine word at a time, and is stored
+as its sorted low 16 bits when sparse or as the 8192 bytes of the integer when dense."""
+import array
+from pathlib import Path
+
+from bibleanalyzer.index.postings import PostingsIndex
+from bibleanalyzer.util.columnar import ColumnsFile
+from bibleanalyzer.util.morphology import Inflexion
+from bibleanalyzer.util.packed import PackedMorphology
+
+CHUNK = 16
+SIZE = 1 << CHUNK
+FULL = (1 << SIZE) - 1
+SPARSE = SIZE // 16
+
+BITS = tuple(tuple(bit for bit in range(8) if byte >> bit & 1) for byte in range(256))
+
+
+def bits(value: int):
+    """Positions of the set bits of an integer of a chunk in ascending order."""
+    data = value.to_bytes(SIZE // 8, "little")
+    for index, byte in enumerate(data):
+        if byte:
+            for bit in BITS[byte]:
+                yield index << 3 | bit
+
+
+def count(value: int) -> int:
+    return bin(value).count("1")
+
+
+class Bitmap:
+    """A set of positions as chunks of bits keyed by the high bits of the positions, without empty chunks."""
+
+    __slots__ = ("_chunks",)
+
+    def __init__(self, chunks: dict = None):
+        self._chunks = chunks if chunks is not None else dict()
+
+    @classmethod
+    def positions(cls, positions) -> "Bitmap":
+        chunks = dict()
+        for position in positions:
+            key = position >> CHUNK
+            chunks[key] = chunks.get(key, 0) | 1 << (position & (SIZE - 1))
+        return cls(chunks)
+
+    @classmethod
+    def range(cls, start: int, stop: int) -> "Bitmap":
+        """Every position from start up to stop."""
+        chunks = dict()
+        for key in range(start >> CHUNK, (stop + SIZE - 1) >> CHUNK):
+            low = max(start - (key << CHUNK), 0)
+            high = min(stop - (key << CHUNK), SIZE)
+            chunks[key] = FULL if low == 0 and high == SIZE else (1 << high) - (1 << low)
+        return cls(chunks)
+
+    @property
+    def chunks(self) -> dict:
+        return self._chunks
+
+    def __and__(self, other: "Bitmap") -> "Bitmap":
+        chunks = dict()
+        small, large = sorted((self._chunks, other._chunks), key=len)
+        for key, value in small.items():
+            value &= large.get(key, 0)
+            if value:
+                chunks[key] = value
+        return Bitmap(chunks)
+
+    def __or__(self, other: "Bitmap") -> "Bitmap":
+        chunks = dict(self._chunks)
+        for key, value in other._chunks.items():
+            chunks[key] = chunks.get(key, 0) | value
+        return Bitmap(chunks)
+
+    def __sub__(self, other: "Bitmap") -> "Bitmap":
+        chunks = dict()
+        for key, value in self._chunks.items():
+            value &= ~other._chunks.get(key, 0)
+            if value:
+                chunks[key] = value
+        return Bitmap(chunks)
+
+    def __contains__(self, position: int) -> bool:
+        return bool(self._chunks.get(position >> CHUNK, 0) >> (position & (SIZE - 1)) & 1)
+
+    def __len__(self) -> int:
+        return sum(count(value) for value in self._chunks.values())
+
+    def __iter__(self):
+        for key in sorted(self._chunks.keys()):
+            base = key << CHUNK
+            for bit in bits(self._chunks[key]):
+                yield base | bit
+
+    def __eq__(self, other: "Bitmap") -> bool:
+        if not isinstance(other, Bitmap):
+            return NotImplemented
+        return self._chunks == other._chunks
+
+    def __repr__(self) -> str:
+        return "<Bitmap {} positions>".format(len(self))
+
+
+class MorphologyBitmaps:
+    """The bitmaps of every value of the inflexions of the packed morphology, kept as a columns file in the cache.
+    Values are counted from one as in the packed codes, words without an inflexion are in none of its bitmaps.
+    The inflexions are matched as PackedMorphology.select does, where the case a preposition governs shares the
+    ordinal of the generic case with the same letter, so a case matches nouns and prepositions alike."""
+
+    FILENAME = "bitmaps.columns"
+
+    def __init__(self, path: Path):
+        self._file = ColumnsFile(path)
+        self._starts = self._file["bitmap_starts"]
+        self._keys = self._file["container_keys"]
+        self._sizes = self._file["container_sizes"]
+        self._offsets = self._file["container_offsets"]
+        self._data = self._file["data"]
+        self._books = self._file["book_sizes"]
+        self._bitmaps = dict()
+
+    @classmethod
+    def write(cls, path: Path, books):
+        """Writes the bitmaps of the books, given as book name and linear columns in any order, in one pass.
+        The positions of a chunk are first gathered per packed code and then added to the bitmap of each of
+        its values, as a book has far fewer distinct codes than words."""
+        values = dict()
+        for name, (shift, mask) in PackedMorphology.LAYOUT.items():
+            for value in range(1, mask + 1):
+                values[(name, value)] = dict()
+        sizes = array.array("I", bytes(4 * len(PostingsIndex.BOOKS)))
+
+        for book, columns in books:
+            ordinal = PostingsIndex.BOOKS.index(book)
+            base = ordinal << PostingsIndex.SHIFT
+            packed = columns.packed
+            sizes[ordinal] = len(packed)
+            for start in range(0, len(packed), SIZE):
+                chunk = dict()
+                for offset in range(start, min(start + SIZE, len(packed))):
+                    code = packed[offset]
+                    if code:
+                        if code not in chunk:
+                            chunk[code] = bytearray(SIZE // 8)
+                        chunk[code][(offset - start) >> 3] |= 1 << (offset & 7)
+
+                key = (base | start) >> CHUNK
+                for code, data in chunk.items():
+                    integer = int.from_bytes(data, "little")
+                    for name, (shift, mask) in PackedMorphology.LAYOUT.items():
+                        value = (code >> shift) & mask
+                        if value:
+                            containers = values[(name, value)]
+                            containers[key] = containers.get(key, 0) | integer
+
+        starts = array.array("I", [0])
+        keys = array.array("I")
+        counts = array.array("I")
+        offsets = array.array("Q", [0])
+        data = bytearray()
+        for containers in values.values():
+            for key in sorted(containers.keys()):
+                integer = containers[key]
+                size = count(integer)
+                if size <= SPARSE:
+                    data += array.array("H", bits(integer)).tobytes()
+                else:
+                    data += integer.to_bytes(SIZE // 8, "little")
+                keys.append(key)
+                counts.append(size)
+                offsets.append(len(data))
+            starts.append(len(keys))
+
+        ColumnsFile.write(path, {
+            "bitmap_starts": starts,
+            "container_keys": keys,
+            "container_sizes": counts,
+            "container_offsets": offsets,
+            "data": array.array("B", data),
+            "book_sizes": sizes,
+        })
+
+    def _number(self, name: str, value: int) -> int:
+        """Number of the bitmap of a value of an inflexion, in the order the bitmaps are written."""
+        number = 0
+        for current, (shift, mask) in PackedMorphology.LAYOUT.items():
+            if current == name:
+                if not 0 < value <= mask:
+                    raise ValueError("No value {} of {}".format(value, name))
+                return number + value - 1
+            number += mask
+        raise ValueError("No inflexion named {}".format(name))
+
+    def bitmap(self, name: str, member: Inflexion) -> Bitmap:
+        """The positions of the words having a member of an inflexion."""
+        number = self._number(name, PackedMorphology.ordinal(member))
+        if number not in self._bitmaps:
+            chunks = dict()
+            for container in range(self._starts[number], self._starts[number + 1]):
+                data = self._data[self._offsets[container]:self._offsets[container + 1]]
+                if self._sizes[container] <= SPARSE:
+                    value = bytearray(SIZE // 8)
+                    for bit in data.cast("H"):
+                        value[bit >> 3] |= 1 << (bit & 7)
+                    data = value
+                chunks[self._keys[container]] = int.from_bytes(data, "little")
+            self._bitmaps[number] = Bitmap(chunks)
+        return self._bitmaps[number]
+
+    def select(self, **inflexions) -> Bitmap:
+        """The positions of the words having all given inflexions, as an AND of their bitmaps.
+        A tuple of members for an inflexion matches any of them, as an OR of their bitmaps."""
+        result = None
+        for name, members in inflexions.items():
+            if not isinstance(members, tuple):
+                members = (members,)
+            bitmap = Bitmap()
+            for member in members:
+                bitmap |= self.bitmap(name, member)
+            result = bitmap if result is None else result & bitmap
+        return result if result is not None else Bitmap()
+
+    def books(self, *books: str) -> Bitmap:
+        """The positions of the whole of the books, for narrowing down a selection."""
+        result = Bitmap()
+        for book in books:
+            ordinal = PostingsIndex.BOOKS.index(book)
+            base = ordinal << PostingsIndex.SHIFT
+            result |= Bitmap.range(base, base + self._books[ordinal])
+        return result
+
+    def close(self):
+        self._starts = self._keys = self._sizes = self._offsets = self._data = self._books = None
+        self._bitmaps.clear()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -0,0 +1,257 @@
+#
+# Copyright (c) 2022 by Kristoffer Paulsson <kristoffer.paulsson@talenten.se>.
+#
+# Permission to use, copy, modify, and/or distribute this software for any purpose with
+# or without fee is hereby granted, provided that the above copyright notice and this
+# permission notice appear in all copies.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES WITH REGARD TO
+# THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS. IN NO
+# EVENT SHALL THE AUTHOR BE LIABLE FOR ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL
+# DAMAGES OR ANY DAMAGES WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER
+# IN AN ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF OR IN
+# CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+#
+#     https://opensource.org/licenses/ISC
+#
+# SPDX-License-Identifier: ISC
+#
+# Contributors:
+#     Kristoffer Paulsson - initial implementation
+#
+"""Inverted index of the lexemes of the corpus, with the positions of every lexeme delta and varint encoded."""
+import array
+import bisect
+import json
+from pathlib import Path
+
+from bibleanalyzer.data import BOOKS, OLD_TESTAMENT, NEW_TESTAMENT
+from bibleanalyzer.util.columnar import ColumnsFile, LinearColumns
+from bibleanalyzer.util.reference import BibleReference
+from bibleanalyzer.util.vocabulary import Vocabulary
+
+
+def encode(positions, data: bytearray):
+    """Appends the gaps between sorted positions to the data as unsigned LEB128 varints."""
+    previous = 0
+    for position in positions:
+        gap = position - previous
+        previous = position
+        while gap > 0x7f:
+            data.append(gap & 0x7f | 0x80)
+            gap >>= 7
+        data.append(gap)
+
+
+def decode(data, start: int, stop: int) -> array.array:
+    """Positions of the varints between start and stop of the data, summing up the gaps."""
+    positions = array.array("I")
+    position = 0
+    gap = 0
+    shift = 0
+    for index in range(start, stop):
+        byte = data[index]
+        gap |= (byte & 0x7f) << shift
+        if byte & 0x80:
+            shift += 7
+        else:
+            position += gap
+            positions.append(position)
+            gap = 0
+            shift = 0
+    return positions
+
+
+class TokenSpan:
+    """Tokens from start up to stop in the linear of a book."""
+
+    __slots__ = ("_book", "_start", "_stop")
+
+    def __init__(self, book: str, start: int, stop: int):
+        self._book = book
+        self._start = start
+        self._stop = stop
+
+    @property
+    def book(self) -> str:
+        return self._book
+
+    @property
+    def start(self) -> int:
+        return self._start
+
+    @property
+    def stop(self) -> int:
+        return self._stop
+
+    def __eq__(self, other: "TokenSpan") -> bool:
+        if not isinstance(other, TokenSpan):
+            return NotImplemented
+        return (self._book, self._start, self._stop) == (other._book, other._start, other._stop)
+
+    def __hash__(self) -> int:
+        return hash((self._book, self._start, self._stop))
+
+    def __repr__(self) -> str:
+        return "<TokenSpan {} {}:{}>".format(self._book, self._start, self._stop)
+
+
+class PostingsIndex:
+    """Sorted positions of every lexeme id of the vocabulary throughout the corpus, kept as a columns file.
+    A position is the ordinal of the book in the corpus shifted 24 bits up with the offset in its linear added,
+    and the positions of each lexeme are stored as varint gaps. Every verse of every book is kept alongside,
+    repeated verses included, so positions can be resolved to references without opening the linear."""
+
+    FILENAME = "postings.columns"
+
+    BOOKS = json.loads(BOOKS)[OLD_TESTAMENT] + json.loads(BOOKS)[NEW_TESTAMENT]
+    SHIFT = 24
+    MASK = (1 << SHIFT) - 1
+
+    def __init__(self, path: Path, vocabulary: Vocabulary = None):
+        self._file = ColumnsFile(path)
+        self._offsets = self._file["offsets"]
+        self._data = self._file["data"]
+        self._verse_starts = self._file["verse_starts"]
+        self._verse_stops = self._file["verse_stops"]
+        self._verse_keys = self._file["verse_keys"]
+        self._owned = vocabulary is None
+        self._vocabulary = vocabulary if vocabulary else Vocabulary(path.parent.joinpath(Vocabulary.FILENAME))
+
+    @classmethod
+    def write(cls, path: Path, books):
+        """Writes the index of the books, given as book name and linear columns in any order, in one pass."""
+        postings = dict()
+        verses = list()
+        for book, columns in books:
+            base = cls.BOOKS.index(book) << cls.SHIFT
+            if len(columns) > cls.MASK:
+                raise ValueError("The linear of {} is too long to index".format(book.capitalize()))
+
+            verse = None
+            chapters = columns.chapters
+            numbers = columns.verses
+            for offset, (kind, lexeme) in enumerate(zip(columns.kinds, columns.lexemes)):
+                if lexeme:
+                    postings.setdefault(lexeme, list()).append(base | offset)
+                elif kind == LinearColumns.CHAPTER or kind == LinearColumns.VERSE:
+                    if verse:
+                        verses.append((verse[0], base | offset, verse[1]))
+                        verse = None
+                    if kind == LinearColumns.VERSE:
+                        verse = (base | offset, chapters[offset] << 16 | numbers[offset])
+            if verse:
+                verses.append((verse[0], base | len(columns), verse[1]))
+
+        offsets = array.array("Q", [0])
+        data = bytearray()
+        for lexeme in range(1, max(postings.keys(), default=0) + 1):
+            encode(sorted(postings.get(lexeme, ())), data)
+            offsets.append(len(data))
+
+        verses.sort()
+        ColumnsFile.write(path, {
+            "offsets": offsets,
+            "data": array.array("B", data),
+            "verse_starts": array.array("I", [verse[0] for verse in verses]),
+            "verse_stops": array.array("I", [verse[1] for verse in verses]),
+            "verse_keys": array.array("I", [verse[2] for verse in verses]),
+        })
+
+    @property
+    def vocabulary(self) -> Vocabulary:
+        return self._vocabulary
+
+    def lexeme(self, value: str) -> int:
+        """Id of a lexeme, or zero if the corpus hasn't got it."""
+        try:
+            return self._vocabulary.index(Vocabulary.LEXEME, value)
+        except KeyError:
+            return 0
+
+    def positions(self, lexeme: int) -> array.array:
+        """Sorted positions of a lexeme id."""
+        if not 0 < lexeme < len(self._offsets):
+            return array.array("I")
+        return decode(self._data, self._offsets[lexeme - 1], self._offsets[lexeme])
+
+    def union(self, *lexemes: int) -> list:
+        """Sorted positions where any of the lexeme ids occur."""
+        positions = set()
+        for lexeme in lexemes:
+            positions.update(self.positions(lexeme))
+        return sorted(positions)
+
+    def verses(self, positions) -> list:
+        """Ordinals of the verses the sorted positions are within, each verse once."""
+        ordinals = list()
+        ordinal = -1
+        for position in positions:
+            if ordinal < 0 or position >= self._verse_stops[ordinal] or position < self._verse_starts[ordinal]:
+                ordinal = bisect.bisect_right(self._verse_starts, position) - 1
+                if ordinal < 0 or position >= self._verse_stops[ordinal]:
+                    continue
+            if not ordinals or ordinals[-1] != ordinal:
+                ordinals.append(ordinal)
+        return ordinals
+
+    def intersect(self, *lexemes: int) -> list:
+        """Spans of the verses where all of the lexeme ids occur. The verses of the rarest lexeme are looked up
+        among the verses of the others, leaving the more common the more are left out."""
+        if not lexemes:
+            return list()
+        candidates = sorted((self.positions(lexeme) for lexeme in lexemes), key=len)
+        ordinals = self.verses(candidates[0])
+        for positions in candidates[1:]:
+            if not ordinals:
+                break
+            others = self.verses(positions)
+            found = list()
+            low = 0
+            for ordinal in ordinals:
+                low = bisect.bisect_left(others, ordinal, low)
+                if low == len(others):
+                    break
+                if others[low] == ordinal:
+                    found.append(ordinal)
+            ordinals = found
+        return [self.verse(ordinal) for ordinal in ordinals]
+
+    def verse(self, ordinal: int) -> TokenSpan:
+        start = self._verse_starts[ordinal]
+        return TokenSpan(self.BOOKS[start >> self.SHIFT], start & self.MASK, self._verse_stops[ordinal] & self.MASK)
+
+    def spans(self, positions) -> list:
+        """Spans of one token each for positions."""
+        return [TokenSpan(self.BOOKS[position >> self.SHIFT], position & self.MASK, (position & self.MASK) + 1)
+                for position in positions]
+
+    def _key(self, book: str, offset: int) -> int:
+        position = self.BOOKS.index(book) << self.SHIFT | offset
+        ordinal = bisect.bisect_right(self._verse_starts, position) - 1
+        if ordinal < 0 or position >= self._verse_stops[ordinal]:
+            raise ValueError("Position {} of {} is outside of the verses".format(offset, book.capitalize()))
+        return self._verse_keys[ordinal]
+
+    def reference(self, span: TokenSpan) -> BibleReference:
+        """The reference of the verses the span is within."""
+        first = self._key(span.book, span.start)
+        last = self._key(span.book, max(span.start, span.stop - 1))
+        if first == last:
+            return BibleReference(span.book, first >> 16, first & 0xffff)
+        elif first >> 16 == last >> 16:
+            return BibleReference(span.book, first >> 16, first & 0xffff, to_verse=last & 0xffff)
+        else:
+            return BibleReference(span.book, first >> 16, first & 0xffff, last >> 16, last & 0xffff)
+
+    def close(self):
+        self._offsets = self._data = self._verse_starts = self._verse_stops = self._verse_keys = None
+        self._file.close()
+        if self._owned:
+            self._vocabulary.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
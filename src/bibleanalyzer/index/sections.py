@@ -0,0 +1,149 @@
+#
+# Copyright (c) 2022 by Kristoffer Paulsson <kristoffer.paulsson@talenten.se>.
+#
+# Permission to use, copy, modify, and/or distribute this software for any purpose with
+# or without fee is hereby granted, provided that the above copyright notice and this
+# permission notice appear in all copies.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES WITH REGARD TO
+# THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS. IN NO
+# EVENT SHALL THE AUTHOR BE LIABLE FOR ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL
+# DAMAGES OR ANY DAMAGES WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER
+# IN AN ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF OR IN
+# CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+#
+#     https://opensource.org/licenses/ISC
+#
+# SPDX-License-Identifier: ISC
+#
+# Contributors:
+#     Kristoffer Paulsson - initial implementation
+#
+"""Index of the sections of a book at every level, with the sentences and clauses within them."""
+import array
+import bisect
+
+SENTENCE = (".", ";")
+CLAUSE = ("·", ",", ":", "-")
+LEVELS = 3
+
+
+class SectionIndex:
+    """Positions of the section tokens of a book, each starting a base section, and per level the base sections
+    that start a section of that level. A section token of level one starts a section at all three levels,
+    of level two at level two and three, and of level three only there; the sign of the level is ignored.
+    The sentences of the base sections and the clauses of the sentences are kept as spans of token positions.
+    Finding the section around a token is a bisect in the positions and one in the level."""
+
+    COLUMNS = (
+        "section_positions", "section_level1", "section_level2", "section_level3",
+        "section_sentences", "sentence_clauses", "clause_starts", "clause_stops",
+    )
+
+    def __init__(self, positions, levels: tuple, sentences, clauses, starts, stops):
+        self._positions = positions
+        self._levels = levels
+        self._sentences = sentences
+        self._clauses = clauses
+        self._starts = starts
+        self._stops = stops
+
+    @classmethod
+    def build(cls, marks, length: int) -> "SectionIndex":
+        """Builds the index from the position, section level and diacritic of every section and punctuation token
+        in order, where the level is None for punctuation. Tokens before the first section are left out."""
+        positions = array.array("I")
+        levels = tuple(array.array("I") for _ in range(LEVELS))
+        sentences = array.array("I")
+        clauses = array.array("I")
+        starts = array.array("I")
+        stops = array.array("I")
+
+        for position, level, diacritic in marks:
+            if level is not None:
+                if positions:
+                    stops.append(position)
+                if 0 < abs(level) <= LEVELS:
+                    for current in range(abs(level), LEVELS + 1):
+                        levels[current - 1].append(len(positions))
+                positions.append(position)
+                sentences.append(len(clauses))
+                clauses.append(len(starts))
+                starts.append(position + 1)
+            elif positions:
+                stops.append(position)
+                if diacritic in SENTENCE:
+                    clauses.append(len(starts))
+                elif diacritic not in CLAUSE:
+                    raise ValueError("Not a sentence or clause punctuation token: {}".format(diacritic))
+                starts.append(position + 1)
+
+        if positions:
+            stops.append(length)
+        sentences.append(len(clauses))
+        clauses.append(len(starts))
+        return cls(positions, levels, sentences, clauses, starts, stops)
+
+    @classmethod
+    def read(cls, columns) -> "SectionIndex":
+        """The index from its columns in a columns file."""
+        values = [columns[name] for name in cls.COLUMNS]
+        return cls(values[0], tuple(values[1:LEVELS + 1]), *values[LEVELS + 1:])
+
+    def columns(self) -> dict:
+        """The arrays of the index by column name, for writing to a columns file."""
+        return dict(zip(self.COLUMNS, (
+            self._positions, *self._levels, self._sentences, self._clauses, self._starts, self._stops)))
+
+    @property
+    def positions(self):
+        return self._positions
+
+    @property
+    def starts(self):
+        return self._starts
+
+    @property
+    def stops(self):
+        return self._stops
+
+    def count(self, level: int) -> int:
+        """The number of sections of a level."""
+        return len(self._levels[level - 1])
+
+    def section(self, level: int, index: int) -> tuple:
+        """The first and the stop base section of a section of a level."""
+        starts = self._levels[level - 1]
+        return starts[index], starts[index + 1] if index + 1 < len(starts) else len(self._positions)
+
+    def base(self, position: int) -> int:
+        """The base section a token belongs to, or -1 before the first section."""
+        return bisect.bisect_right(self._positions, position) - 1
+
+    def enclosing(self, position: int, level: int) -> int:
+        """The section of a level a token belongs to, or -1 before the first section of that level."""
+        return bisect.bisect_right(self._levels[level - 1], self.base(position)) - 1
+
+    def section_sentences(self, index: int) -> tuple:
+        """The first and the stop sentence of a base section."""
+        return self._sentences[index], self._sentences[index + 1]
+
+    def sentence_clauses(self, index: int) -> tuple:
+        """The first and the stop clause of a sentence."""
+        return self._clauses[index], self._clauses[index + 1]
+
+    def clauses(self, level: int, first: int = 0, last: int = None) -> tuple:
+        """The first and the stop clause of the sections of a level from first up to last, or to the end."""
+        last = self.count(level) if last is None else last
+        if first >= last:
+            return 0, 0
+        base, _ = self.section(level, first)
+        _, stop = self.section(level, last - 1)
+        return self._clauses[self._sentences[base]], self._clauses[self._sentences[stop]]
+
+    def clause(self, index: int) -> tuple:
+        """The start and stop token positions of a clause."""
+        return self._starts[index], self._stops[index]
+
+    def __len__(self) -> int:
+        return len(self._positions)
@@ -0,0 +1,246 @@
+#
+# Copyright (c) 2022 by Kristoffer Paulsson <kristoffer.paulsson@talenten.se>.
+#
+# Permission to use, copy, modify, and/or distribute this software for any purpose with
+# or without fee is hereby granted, provided that the above copyright notice and this
+# permission notice appear in all copies.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES WITH REGARD TO
+# THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS. IN NO
+# EVENT SHALL THE AUTHOR BE LIABLE FOR ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL
+# DAMAGES OR ANY DAMAGES WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER
+# IN AN ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF OR IN
+# CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+#
+#     https://opensource.org/licenses/ISC
+#
+# SPDX-License-Identifier: ISC
+#
+# Contributors:
+#     Kristoffer Paulsson - initial implementation
+#
+"""Suffix array over the words of the corpus for finding phrases, by lexeme or by form."""
+import array
+from pathlib import Path
+
+from bibleanalyzer.index.postings import PostingsIndex, TokenSpan
+from bibleanalyzer.util.columnar import ColumnsFile, LinearColumns
+from bibleanalyzer.util.vocabulary import Vocabulary
+
+
+def suffixes(stream: list) -> list:
+    """Suffix array of a stream of integers by prefix doubling. Every round sorts the suffixes by the ranks of
+    their first k and next k values, until all ranks differ. With NumPy a round is one argsort."""
+    length = len(stream)
+    try:
+        import numpy
+    except ImportError:
+        rank = list(stream)
+        step = 1
+        while True:
+            base = max(rank, default=0) + 2
+            keys = [rank[index] * base + (rank[index + step] + 1 if index + step < length else 0)
+                    for index in range(length)]
+            order = sorted(range(length), key=keys.__getitem__)
+            current = 0
+            for number, index in enumerate(order):
+                if number and keys[index] != keys[order[number - 1]]:
+                    current += 1
+                rank[index] = current
+            if current == length - 1 or not length:
+                return order
+            step <<= 1
+
+    rank = numpy.asarray(stream, dtype=numpy.int64)
+    step = 1
+    while True:
+        second = numpy.zeros(length, dtype=numpy.int64)
+        if step < length:
+            second[:length - step] = rank[step:] + 1
+        keys = rank * (int(rank.max(initial=0)) + 2) + second
+        order = numpy.argsort(keys, kind="stable")
+        keys = keys[order]
+        rank = numpy.empty(length, dtype=numpy.int64)
+        rank[order] = numpy.concatenate(([0], numpy.cumsum(keys[1:] != keys[:-1])))
+        if not length or rank[order[-1]] == length - 1:
+            return order.tolist()
+        step <<= 1
+
+
+def prefixes(stream: list, order: list) -> list:
+    """Lengths of the longest common prefix of every suffix and the one before it in the suffix array, by Kasai."""
+    length = len(stream)
+    ranks = [0] * length
+    for number, index in enumerate(order):
+        ranks[index] = number
+
+    common = [0] * length
+    height = 0
+    for index in range(length):
+        number = ranks[index]
+        if number:
+            other = order[number - 1]
+            while index + height < length and other + height < length and \
+                    stream[index + height] == stream[other + height]:
+                height += 1
+            common[number] = height
+            if height:
+                height -= 1
+        else:
+            height = 0
+    return common
+
+
+class SuffixIndex:
+    """Suffix and LCP arrays over the lexeme or form ids of the words of the corpus, kept as a columns file.
+    The books follow each other in the stream with a sentinel of their own after each, so no phrase spans two
+    books. Forms are matched as written, accents included."""
+
+    FILENAME = "suffix-{}.columns"
+
+    def __init__(self, path: Path, vocabulary: Vocabulary = None):
+        self._file = ColumnsFile(path)
+        self._table = Vocabulary.TABLES[self._file["table"][0]]
+        self._stream = self._file["stream"]
+        self._positions = self._file["positions"]
+        self._suffixes = self._file["suffixes"]
+        self._prefixes = self._file["prefixes"]
+        self._owned = vocabulary is None
+        self._vocabulary = vocabulary if vocabulary else Vocabulary(path.parent.joinpath(Vocabulary.FILENAME))
+
+    @classmethod
+    def filename(cls, table: str) -> str:
+        return cls.FILENAME.format(table)
+
+    @classmethod
+    def write(cls, path: Path, books, table: str = Vocabulary.LEXEME):
+        """Writes the arrays of the lexemes or forms of the books, given as book name and linear columns in the
+        order of the corpus."""
+        stream = array.array("I")
+        positions = array.array("I")
+        ends = list()
+        size = 0
+        for book, columns in books:
+            base = PostingsIndex.BOOKS.index(book) << PostingsIndex.SHIFT
+            ids = columns.lexemes if table == Vocabulary.LEXEME else columns.words
+            size = max(size, columns.vocabulary.size(table))
+            for offset, kind in enumerate(columns.kinds):
+                if kind == LinearColumns.WORD:
+                    stream.append(ids[offset])
+                    positions.append(base | offset)
+            ends.append(len(stream))
+            stream.append(0)
+            positions.append(base | len(columns))
+
+        # The sentinels follow every id of the table, also of strings that aren't in the stream such as
+        # punctuation, so that no phrase looked up can match one.
+        sentinel = max(size, max(stream, default=0) + 1)
+        for number in ends:
+            stream[number] = sentinel
+            sentinel += 1
+
+        order = suffixes(stream)
+        ColumnsFile.write(path, {
+            "table": array.array("B", [Vocabulary.TABLES.index(table)]),
+            "stream": stream,
+            "positions": positions,
+            "suffixes": array.array("I", order),
+            "prefixes": array.array("I", prefixes(stream, order)),
+        })
+
+    @property
+    def table(self) -> str:
+        return self._table
+
+    @property
+    def vocabulary(self) -> Vocabulary:
+        return self._vocabulary
+
+    def __len__(self) -> int:
+        return len(self._stream)
+
+    def _bound(self, phrase: list, upper: bool) -> int:
+        """Number of the first suffix in the array whose start is greater than the phrase, or greater or equal."""
+        low = 0
+        high = len(self._suffixes)
+        size = len(phrase)
+        while low < high:
+            middle = (low + high) // 2
+            start = self._suffixes[middle]
+            prefix = self._stream[start:start + size].tolist()
+            if prefix < phrase or (upper and prefix == phrase):
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def range(self, phrase: list) -> tuple:
+        """Numbers of the first and past the last suffix starting with a phrase of ids, by two binary searches."""
+        if not phrase:
+            return 0, 0
+        return self._bound(phrase, False), self._bound(phrase, True)
+
+    def ids(self, words: list) -> list:
+        """Ids of the lexemes or forms of a phrase, or None if the corpus hasn't got one of them."""
+        try:
+            return [self._vocabulary.index(self._table, word) for word in words]
+        except KeyError:
+            return None
+
+    def span(self, start: int, size: int) -> TokenSpan:
+        first = self._positions[start]
+        last = self._positions[start + size - 1]
+        return TokenSpan(
+            PostingsIndex.BOOKS[first >> PostingsIndex.SHIFT], first & PostingsIndex.MASK,
+            (last & PostingsIndex.MASK) + 1)
+
+    def find(self, words: list) -> list:
+        """Spans of the occurrences of a phrase of lexemes or forms, in the order of the corpus."""
+        phrase = self.ids(words)
+        if not phrase:
+            return list()
+        first, last = self.range(phrase)
+        starts = sorted(self._suffixes[first:last])
+        return [self.span(start, len(phrase)) for start in starts]
+
+    def repeats(self, count: int = 10, minimum: int = 2) -> list:
+        """The longest phrases of at least minimum words occurring more than once, as the words of each with
+        the spans of its occurrences. Only phrases that can't be extended to the left are reported, as every
+        suffix of a repeated phrase is repeated too."""
+        common = self._prefixes
+        found = list()
+        seen = set()
+        for number in sorted(range(1, len(common)), key=common.__getitem__, reverse=True):
+            size = common[number]
+            if size < minimum or len(found) >= count:
+                break
+
+            first = number - 1
+            while first > 0 and common[first] >= size:
+                first -= 1
+            last = number + 1
+            while last < len(common) and common[last] >= size:
+                last += 1
+            if (first, size) in seen:
+                continue
+            seen.add((first, size))
+
+            starts = sorted(self._suffixes[first:last])
+            if len(set(self._stream[start - 1] if start else None for start in starts)) == 1:
+                continue
+
+            words = [self._vocabulary.value(self._table, value) for value in self._stream[starts[0]:starts[0] + size]]
+            found.append((words, [self.span(start, size) for start in starts]))
+        return found
+
+    def close(self):
+        self._stream = self._positions = self._suffixes = self._prefixes = None
+        self._file.close()
+        if self._owned:
+            self._vocabulary.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -0,0 +1,99 @@
+#
+# Copyright (c) 2022 by Kristoffer Paulsson <kristoffer.paulsson@talenten.se>.
+#
+# Permission to use, copy, modify, and/or distribute this software for any purpose with
+# or without fee is hereby granted, provided that the above copyright notice and this
+# permission notice appear in all copies.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES WITH REGARD TO
+# THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS. IN NO
+# EVENT SHALL THE AUTHOR BE LIABLE FOR ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL
+# DAMAGES OR ANY DAMAGES WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER
+# IN AN ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF OR IN
+# CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+#
+#     https://opensource.org/licenses/ISC
+#
+# SPDX-License-Identifier: ISC
+#
+# Contributors:
+#     Kristoffer Paulsson - initial implementation
+#
+"""Index of the verses of a book by chapter and verse."""
+import array
+import bisect
+
+
+class VerseIndex:
+    """Sorted (chapter, verse) keys with the start and stop position of every verse in the linear.
+    A verse starts at its verse token and stops at the next chapter or verse token.
+    The keys are packed as chapter << 16 | verse, so lookups are a bisect and passages a slice of the linear."""
+
+    def __init__(self, keys, starts, stops):
+        self._keys = keys
+        self._starts = starts
+        self._stops = stops
+
+    @classmethod
+    def build(cls, boundaries, length: int) -> "VerseIndex":
+        """Builds the index from the position, chapter and verse of every chapter and verse token in order,
+        where a chapter token has verse zero. If a verse occurs twice the first occurrence is kept."""
+        verses = list()
+        for position, chapter, verse in boundaries:
+            if verses and verses[-1][2] is None:
+                verses[-1][2] = position
+            if verse:
+                verses.append([chapter << 16 | verse, position, None])
+        if verses and verses[-1][2] is None:
+            verses[-1][2] = length
+
+        keys = array.array("I")
+        starts = array.array("I")
+        stops = array.array("I")
+        for key, start, stop in sorted(verses, key=lambda verse: verse[0]):
+            if not keys or keys[-1] != key:
+                keys.append(key)
+                starts.append(start)
+                stops.append(stop)
+        return cls(keys, starts, stops)
+
+    @property
+    def keys(self):
+        return self._keys
+
+    @property
+    def starts(self):
+        return self._starts
+
+    @property
+    def stops(self):
+        return self._stops
+
+    def find(self, chapter: int, verse: int) -> int:
+        """Index of a verse in the index, or -1 if the book hasn't got it."""
+        key = chapter << 16 | verse
+        index = bisect.bisect_left(self._keys, key)
+        return index if index < len(self._keys) and self._keys[index] == key else -1
+
+    def start(self, chapter: int, verse: int) -> int:
+        """Position of the verse token of a verse, or -1 if the book hasn't got it."""
+        index = self.find(chapter, verse)
+        return self._starts[index] if index >= 0 else -1
+
+    def verse(self, chapter: int, verse: int) -> slice:
+        """The tokens of one verse as a slice of the linear, empty if the book hasn't got it."""
+        index = self.find(chapter, verse)
+        return slice(self._starts[index], self._stops[index]) if index >= 0 else slice(0, 0)
+
+    def verses(self, chapter: int, verse: int, to_chapter: int, to_verse: int) -> slice:
+        """The tokens from one verse up to and including another, of the verses the book has in between."""
+        first = bisect.bisect_left(self._keys, chapter << 16 | verse)
+        last = bisect.bisect_right(self._keys, to_chapter << 16 | to_verse) - 1
+        return slice(self._starts[first], self._stops[last]) if first <= last else slice(0, 0)
+
+    def chapters(self, chapter: int, to_chapter: int = None) -> slice:
+        """The tokens from the first verse of a chapter to the last verse of another, or of the same chapter."""
+        return self.verses(chapter, 0, chapter if to_chapter is None else to_chapter, 0xFFFF)
+
+    def __len__(self) -> int:
+        return len(self._keys)
@@ -20,10 +20,13 @@
 #     Kristoffer Paulsson - initial implementation
 #
 """Parsing liner. Lines up the corpora parsings in a linear fashion and caches them for analysis."""
+import functools
 import re
+import sys
 
 from bibleanalyzer.util.model import PunctuationToken, WordToken, ChapterToken, VerseToken, DataEntry, SectionToken
 from bibleanalyzer.util.transliterator import KoineTransliterator
+from bibleanalyzer.util.verify import VerseDigest
 from . import Processor, ProcessException
 from .app import Application
 from .grammar import Grammar
@@ -33,14 +36,22 @@ from .util.morphology import Speech, TypeNoun
 from .util.reference import BibleReferenceCounter
 
 TOKEN_REGEX = r"""([᾽\w]+|[\W])"""
+TOKEN_PATTERN = re.compile(TOKEN_REGEX)
+BRACKETS = str.maketrans("", "", "[]")
 PUNCTUATION = ("·", ".", ",", ";", ":", "-")
 
 
+@functools.lru_cache(maxsize=1 << 14)
+def folded(word: str) -> str:
+    """Accent and case insensitive form of a word, cached by the surface form since the same forms keep recurring."""
+    return KoineTransliterator.normalize(word).lower()
+
+
 class LinerIterator:
 
-    def __init__(self, loader: LoaderIterator, book: str):
+    def __init__(self, loader: LoaderIterator, book: str, logger: Logger = None):
         self._loader = loader
-        self._logger = Application.instance().logger
+        self._logger = logger if logger else Application.instance().logger
         self._counter = None
         self._book = book
 
@@ -131,7 +142,7 @@ class LinerIterator:
 
     def _tokenizer_iter(self, item: DataEntry):
         word_count = 0
-        for match in re.findall(TOKEN_REGEX, item.text.replace("[", "").replace("]", "")):
+        for match in TOKEN_PATTERN.findall(item.text.translate(BRACKETS)):
             token = match.strip()
             if token:
                 if token in PUNCTUATION:
@@ -139,11 +150,11 @@ class LinerIterator:
                 elif KoineTransliterator.koine_only(token):
                     word = item.words[word_count]
 
-                    if KoineTransliterator.normalize(word.word).lower() != KoineTransliterator.normalize(token).lower():
+                    if folded(word.word) != folded(token):
                         raise ProcessException("Not the right word. {} {}".format(token, word.word))
 
                     word_count += 1
-                    yield WordToken(word=token, lexeme=word.lexeme, grammar=word.grammar)
+                    yield WordToken(word=token, lexeme=sys.intern(word.lexeme), grammar=sys.intern(word.grammar))
                 else:
                     self._logger.warning("Token excluded: '{}'".format(token))
             elif match != " ":
@@ -173,7 +184,8 @@ class Liner(Processor):
         self._linear = list()
         self._letters = set()
         self._stats = dict()
-        self._verify = ""
+        self._digest = VerseDigest()
+        self._digest.verse()  # Tokens before the first verse are digested as one.
 
     @property
     def linear(self) -> list:
@@ -188,8 +200,8 @@ class Liner(Processor):
         return self._stats
 
     @property
-    def verify(self) -> str:
-        return self._verify.strip()
+    def digest(self) -> VerseDigest:
+        return self._digest
 
     def _stat(self, letters: str):
         for char in set(KoineTransliterator.expand(letters)):
@@ -199,7 +211,7 @@ class Liner(Processor):
                 self._stats[char] += 1
 
     def process(self, data: list, book: str):
-        for token in LinerIterator(PickleLoaderIterator(data, "one"), book):
+        for token in LinerIterator(PickleLoaderIterator(data, "one"), book, self.logger):
             if isinstance(token, WordToken):
                 self._letters |= set(token.word)
                 self._stat(token.word)
@@ -209,8 +221,8 @@ class Liner(Processor):
 
     def _verify_token(self, token):
         if isinstance(token, WordToken):
-            self._verify += " " + token.word
+            self._digest.update(" " + token.word)
         elif isinstance(token, PunctuationToken):
-            self._verify += token.diacritic
+            self._digest.update(token.diacritic)
         elif isinstance(token, VerseToken):
-            self._verify += "\n"
+            self._digest.verse()
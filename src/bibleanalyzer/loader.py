@@ -22,12 +22,16 @@
 """Corpus loader. Loads and parses UTF-8 corpus files as generated by the BibleWorks 10 Report Generator,
 saved as RTF and converted to TXT by TextEdit for macOS."""
 import collections
+import logging
+import mmap
 import re
+import sys
 from pathlib import Path
 
 from . import Processor, ProcessException
 from bibleanalyzer.app.logging import Logger
 from bibleanalyzer.util.model import DataEntry, GreekWord
+from bibleanalyzer.util.verify import VerseDigest
 from .app import Application
 from .util.reference import BibleReferenceCounter
 
@@ -38,6 +42,14 @@ WHOLE_REGEX = r"""^(?:(?P<translation>\S+) (?P<book>(?:[1-3] )?[\S ]+) (?P<chapt
 
 TOKEN_REGEX = r"""([·.,;:]|[^[·\.,;: \(\)\[\]]\s]+)"""
 
+VERSE_PATTERN = re.compile(r"""(?P<translation>\S+) (?P<book>(?:[1-3] )?[\S ]+) (?P<chapter>\d+)\:(?P<verse>\d+)(?: (?P<text>\S.*))?""")
+LINE_PATTERN = re.compile(r"""(?P<line>_+)""")
+WORD_PATTERN = re.compile(r"""(?P<index>\d+)\. (?P<word>\S+) (?P<lexeme>\S+) - (?P<grammar>\S+) (?P<inflexion>[\S ]+)$""")
+
+VERSE_BYTES = re.compile(VERSE_PATTERN.pattern.encode())
+LINE_BYTES = re.compile(LINE_PATTERN.pattern.encode())
+WORD_BYTES = re.compile(WORD_PATTERN.pattern.encode())
+
 
 class StateError(RuntimeWarning):
     """State machine throws this exception at wrongful attempt to change the state."""
@@ -53,11 +65,105 @@ class LoaderIterator(collections.abc.Iterator):
         return self._translation
 
 
-class FreshLoaderIterator(LoaderIterator):
+class CorpusReader:
+    """Reads a corpus file and classifies each line by its first character, a digit is a greek word,
+    an underscore is a separating line and anything else a verse. Only the verses of the selected
+    translation are matched, the others are dropped before any regular expression runs.
+
+    Yields the line number, the state the line belongs to and the match."""
 
     def __init__(self, filename: Path, translation: str):
+        self._filename = filename
+        self._prefix = "{} ".format(translation)
+
+    def classify(self, line: str) -> tuple:
+        first = line[:1]
+        if first.isdigit():
+            return StateMachine.WORD, WORD_PATTERN.match(line)
+        elif first == "_":
+            return StateMachine.LINE, LINE_PATTERN.match(line)
+        elif line.startswith(self._prefix):
+            return StateMachine.TEXT, VERSE_PATTERN.match(line)
+        else:
+            return None, None
+
+    def __iter__(self):
+        with self._filename.open("r") as doc:
+            for number, line in enumerate(doc, 1):
+                kind, match = self.classify(line)
+                if match:
+                    yield number, kind, match
+
+
+class MappedMatch:
+    """Match over the bytes of a memory mapped corpus that only decodes the groups asked for."""
+
+    __slots__ = ("_match",)
+
+    def __init__(self, match: re.Match):
+        self._match = match
+
+    def __getitem__(self, group: str) -> str:
+        value = self._match[group]
+        return value.decode("utf-8") if value is not None else None
+
+    def groups(self) -> tuple:
+        return tuple(value.decode("utf-8") if value is not None else None for value in self._match.groups())
+
+
+class MappedCorpusReader(CorpusReader):
+    """Reads a corpus file by memory mapping it and scanning for the newlines at the bytes level.
+    Lines are classified like by the CorpusReader, but nothing is decoded until the loader asks
+    for a group, so the texts of other translations and the inflexion descriptions never are."""
+
+    DIGITS = range(ord("0"), ord("9") + 1)
+    UNDERSCORE = ord("_")
+    RETURN = ord("\r")
+
+    def __init__(self, filename: Path, translation: str):
+        CorpusReader.__init__(self, filename, translation)
+        self._prefix = self._prefix.encode("utf-8")
+
+    def classify_at(self, doc: mmap.mmap, start: int, end: int) -> tuple:
+        first = doc[start]
+        if first in self.DIGITS:
+            return StateMachine.WORD, WORD_BYTES.match(doc, start, end)
+        elif first == self.UNDERSCORE:
+            return StateMachine.LINE, LINE_BYTES.match(doc, start, end)
+        elif doc.find(self._prefix, start, start + len(self._prefix)) == start:
+            return StateMachine.TEXT, VERSE_BYTES.match(doc, start, end)
+        else:
+            return None, None
+
+    def __iter__(self):
+        with self._filename.open("rb") as file:
+            size = file.seek(0, 2)
+            if not size:
+                return
+
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as doc:
+                number = 0
+                start = 0
+                while start < size:
+                    number += 1
+                    stop = doc.find(b"\n", start)
+                    if stop == -1:
+                        stop = size
+                    end = stop - 1 if stop > start and doc[stop - 1] == self.RETURN else stop
+
+                    if end > start:
+                        kind, match = self.classify_at(doc, start, end)
+                        if match:
+                            yield number, kind, MappedMatch(match)
+                    start = stop + 1
+
+
+class FreshLoaderIterator(LoaderIterator):
+
+    def __init__(self, filename: Path, translation: str, mapped: bool = False, logger: Logger = None):
         LoaderIterator.__init__(self, translation)
         self._filename = filename
+        self._reader = MappedCorpusReader if mapped else CorpusReader
 
         self._tasks = (
             None,
@@ -68,7 +174,7 @@ class FreshLoaderIterator(LoaderIterator):
             self._end
         )
 
-        self._logger = Application.instance().logger
+        self._logger = logger if logger else Application.instance().logger
         self._data = list()
 
         self._machine = None
@@ -85,22 +191,19 @@ class FreshLoaderIterator(LoaderIterator):
         self._counter = BibleReferenceCounter()
 
     def _file_iter(self):
-        with self._filename.open("r") as doc:
-            for line in doc:
-                self._line_cnt += 1
-                match = re.match(WHOLE_REGEX, line)
-                if match:
-                    yield match.groupdict()
+        for self._line_cnt, kind, match in self._reader(self._filename, self._translation):
+            yield kind, match
 
     def _proc_iter(self):
         self._logger.info("Load corpus: {}".format(self._filename.name))
+        debug = self._logger.isEnabledFor(logging.DEBUG)
 
         try:
-            for line in self._file_iter():
-                if not line:
-                    continue
+            for kind, line in self._file_iter():
+                if debug:
+                    self._logger.debug([group for group in line.groups() if group])
 
-                self._switch(line)
+                self._switch(kind)
                 try:
                     self._tasks[self._machine.state](line)
                 except ProcessException as e:
@@ -120,31 +223,29 @@ class FreshLoaderIterator(LoaderIterator):
                 self._filename, self._line_cnt
             ))
 
-    def _switch(self, line: dict):
-        self._logger.debug(list(filter(None, line.values())))
-
+    def _switch(self, kind: int):
         # In case a verse has been left out we reset the state machine and start over.
-        if line["translation"] and self._machine.state is StateMachine.LINE:
+        if kind == StateMachine.TEXT and self._machine.state is StateMachine.LINE:
             self._data.append(self._entry)
             self._entry = None
             self._machine.reset()
             self._machine.goto(StateMachine.TEXT)
 
-        elif line["translation"] and self._machine.state is not StateMachine.TEXT:
+        elif kind == StateMachine.TEXT and self._machine.state is not StateMachine.TEXT:
             if self._machine.state == StateMachine.WORD:
                 self._data.append(self._entry)
                 self._entry = None
             self._machine.goto(StateMachine.TEXT)
-        elif line["line"] and self._machine.state is not StateMachine.LINE:
+        elif kind == StateMachine.LINE and self._machine.state is not StateMachine.LINE:
             self._machine.goto(StateMachine.LINE)
-        elif line["index"] and self._machine.state is not StateMachine.WORD:
+        elif kind == StateMachine.WORD and self._machine.state is not StateMachine.WORD:
             self._machine.goto(StateMachine.WORD)
             self._word_cnt = 1
 
-    def _start(self, line: dict):
+    def _start(self, line: re.Match):
         pass
 
-    def _text(self, line: dict):
+    def _text(self, line: re.Match):
         if not line["translation"]:
             self._logger.error(Logger.file_format("Expected a translation", self._filename, self._line_cnt))
         elif line["translation"] != self._translation:
@@ -188,11 +289,11 @@ class FreshLoaderIterator(LoaderIterator):
         )
         self._counter.increase_verse()
 
-    def _line(self, line: dict):
+    def _line(self, line: re.Match):
         if not line["line"]:
             self._logger.error(Logger.file_format("Expected a line", self._filename, self._line_cnt))
 
-    def _word(self, line: dict):
+    def _word(self, line: re.Match):
         if not line["index"]:
             self._logger.error(Logger.file_format("Expected a greek word", self._filename, self._line_cnt))
 
@@ -205,8 +306,8 @@ class FreshLoaderIterator(LoaderIterator):
 
         self._entry.words.append(GreekWord(
             word=line["word"],
-            lexeme=line["lexeme"],
-            grammar=line["grammar"],
+            lexeme=sys.intern(line["lexeme"]),
+            grammar=sys.intern(line["grammar"]),
         ))
         self._word_cnt += 1
         self._total_cnt += 1
@@ -289,11 +390,12 @@ class StateMachine:
 
 class TextLoader(Processor):
 
-    def __init__(self, logger: Logger, translation: str = None):
+    def __init__(self, logger: Logger, translation: str = None, mapped: bool = False):
         self.logger = logger
         self._translation = translation
+        self._mapped = mapped
         self._data = list()
-        self._verify = ""
+        self._digest = VerseDigest()
         self._missing = list()
 
     @property
@@ -301,8 +403,8 @@ class TextLoader(Processor):
         return self._data
 
     @property
-    def verify(self) -> str:
-        return self._verify.strip()
+    def digest(self) -> VerseDigest:
+        return self._digest
 
     @property
     def stats(self) -> dict:
@@ -320,10 +422,11 @@ class TextLoader(Processor):
         }
 
     def process(self, filename: Path):
-        for entry in FreshLoaderIterator(filename, self._translation):
+        for entry in FreshLoaderIterator(filename, self._translation, self._mapped, self.logger):
             self._add_data(entry)
 
     def _add_data(self, entry):
         if entry.text:
-            self._verify += entry.text.strip() + "\n"
+            self._digest.verse()
+            self._digest.update(entry.text.strip())
         self._data.append(entry)
@@ -0,0 +1,122 @@
+#
+# Copyright (c) 2021 by Kristoffer Paulsson <kristoffer.paulsson@talenten.se>.
+#
+# Permission to use, copy, modify, and/or distribute this software for any purpose with
+# or without fee is hereby granted, provided that the above copyright notice and this
+# permission notice appear in all copies.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES WITH REGARD TO
+# THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS. IN NO
+# EVENT SHALL THE AUTHOR BE LIABLE FOR ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL
+# DAMAGES OR ANY DAMAGES WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER
+# IN AN ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF OR IN
+# CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+#
+#     https://opensource.org/licenses/ISC
+#
+# SPDX-License-Identifier: ISC
+#
+# Contributors:
+#     Kristoffer Paulsson - initial implementation
+#
+"""Streaming of a book from its corpus file to structured sections in one pass, without intermediate caches."""
+import queue
+import threading
+from pathlib import Path
+
+from . import Processor
+from bibleanalyzer.app.logging import Logger
+from .liner import LinerIterator
+from .loader import FreshLoaderIterator, PickleLoaderIterator
+from .structor import Structor
+
+
+class Stream:
+    """Runs an iterable in a thread of its own and hands over its items in batches through a bounded queue,
+    so that the producer can work ahead of the consumer by at most the size of the queue."""
+
+    END = object()
+
+    def __init__(self, iterable, size: int = 16, batch: int = 64):
+        self._iterable = iterable
+        self._queue = queue.Queue(maxsize=size)
+        self._batch = batch
+        self._closed = threading.Event()
+        self._thread = threading.Thread(target=self._produce, daemon=True)
+
+    def _put(self, item) -> bool:
+        while not self._closed.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _produce(self):
+        batch = list()
+        try:
+            for item in self._iterable:
+                batch.append(item)
+                if len(batch) >= self._batch:
+                    if not self._put(batch):
+                        return
+                    batch = list()
+            if batch:
+                self._put(batch)
+            self._put(self.END)
+        except BaseException as e:
+            self._put(e)
+
+    def close(self):
+        """Stops the producer if the consumer gives up early."""
+        self._closed.set()
+
+    def __iter__(self):
+        self._thread.start()
+        try:
+            while True:
+                batch = self._queue.get()
+                if batch is self.END:
+                    break
+                elif isinstance(batch, BaseException):
+                    raise batch
+                yield from batch
+        finally:
+            self.close()
+
+
+class Pipeline(Processor):
+    """Loads, lines up and structures a book in one pass. Reading and parsing the corpus file runs in one
+    thread and tokenizing in another, connected by bounded queues, while the caller builds the structure.
+    The parsing and the linear are only kept if asked for, to be written as caches."""
+
+    def __init__(self, logger: Logger, translation: str, mapped: bool = False, keep: bool = False):
+        super().__init__(logger)
+        self._translation = translation
+        self._mapped = mapped
+        self._keep = keep
+        self._entries = list()
+        self._linear = list()
+
+    @property
+    def entries(self) -> list:
+        return self._entries
+
+    @property
+    def linear(self) -> list:
+        return self._linear
+
+    def _kept(self, entries):
+        for entry in entries:
+            self._entries.append(entry)
+            yield entry
+
+    def process(self, filename: Path, book: str) -> Structor:
+        entries = Stream(FreshLoaderIterator(filename, self._translation, self._mapped, self.logger))
+        if self._keep:
+            entries = self._kept(entries)
+
+        tokens = Stream(LinerIterator(PickleLoaderIterator(entries, self._translation), book, self.logger))
+        self._linear = list(tokens)
+        return Structor(self._linear)
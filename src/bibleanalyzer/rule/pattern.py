@@ -0,0 +1,225 @@
+#
+# Copyright (c) 2022 by Kristoffer Paulsson <kristoffer.paulsson@talenten.se>.
+#
+# Permission to use, copy, modify, and/or distribute this software for any purpose with
+# or without fee is hereby granted, provided that the above copyright notice and this
+# permission notice appear in all copies.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES WITH REGARD TO
+# THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS. IN NO
+# EVENT SHALL THE AUTHOR BE LIABLE FOR ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL
+# DAMAGES OR ANY DAMAGES WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER
+# IN AN ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF OR IN
+# CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+#
+#     https://opensource.org/licenses/ISC
+#
+# SPDX-License-Identifier: ISC
+#
+# Contributors:
+#     Kristoffer Paulsson - initial implementation
+#
+"""Patterns over sequences of words, compiled to a regular expression over the encoded morphology of a book.
+
+A pattern is a row of words in brackets, each with constraints and optionally a quantifier:
+
+    [d case=g] [n case=g] []{0,2} [v mood=p]
+
+A bracket may start with the part of speech and holds constraints on the inflexions, the lexeme or the form, as in
+`case=g|d` or `lexeme!=καί`. The values of the inflexions are the letters of the morphology codes, and a case
+matches the case a preposition governs as well. A bracket is followed by `?`, `*`, `+` or `{m,n}` to be optional
+or repeated, so `[]{0,3}` is a gap of up to three words.
+Punctuation is left out of the encoding, so patterns run over the words of a book as if it had none."""
+import re
+from typing import Iterator
+
+from bibleanalyzer.index.postings import TokenSpan
+from bibleanalyzer.rule import Rule
+from bibleanalyzer.util.columnar import LinearColumns
+from bibleanalyzer.util.morphology import CaseGeneric, CasePreposition, Speech
+from bibleanalyzer.util.packed import PackedMorphology
+from bibleanalyzer.util.vocabulary import Vocabulary
+
+ELEMENT_REGEX = r"""\[(?P<constraints>[^\]]*)\](?P<quantifier>\?|\*|\+|\{\d+(?:,\d*)?\})?"""
+CONSTRAINT_REGEX = r"""^(?P<name>[a-z]+)(?P<operator>!?=)(?P<values>\S+)$"""
+
+
+class PatternError(ValueError):
+    """Error due to a pattern that can't be compiled."""
+
+
+class Encoded:
+    """The words of a book encoded for patterns, one record of fixed width per word, with the offset of every word
+    in the linear. A record starts with a space, then a character for every packed inflexion and last the lexeme
+    and form ids as characters from the supplementary planes up."""
+
+    MARKER = " "
+    INFLEXION = 0x30
+    ID = 0x10000
+    WIDTH = 1 + len(PackedMorphology.LAYOUT) + 2
+
+    _fields = dict()
+
+    def __init__(self, book: str, text: str, offsets: list):
+        self._book = book
+        self._text = text
+        self._offsets = offsets
+
+    @classmethod
+    def fields(cls, code: int) -> str:
+        """The marker and inflexion characters of a packed code, encoded once per code."""
+        fields = cls._fields.get(code)
+        if fields is None:
+            fields = cls._fields[code] = cls.MARKER + "".join(
+                chr(cls.INFLEXION + ((code >> shift) & mask)) for shift, mask in PackedMorphology.LAYOUT.values())
+        return fields
+
+    @classmethod
+    def encode(cls, book: str, columns: LinearColumns) -> "Encoded":
+        records = list()
+        offsets = list()
+        packed = columns.packed
+        lexemes = columns.lexemes
+        words = columns.words
+        for offset, kind in enumerate(columns.kinds):
+            if kind == LinearColumns.WORD:
+                records.append(cls.fields(packed[offset]) + chr(cls.ID + lexemes[offset]) + chr(cls.ID + words[offset]))
+                offsets.append(offset)
+        return cls(book, "".join(records), offsets)
+
+    @property
+    def book(self) -> str:
+        return self._book
+
+    @property
+    def text(self) -> str:
+        return self._text
+
+    @property
+    def offsets(self) -> list:
+        return self._offsets
+
+
+class Pattern(Rule):
+    """A pattern compiled to one regular expression, matched over a whole book in one pass as re.finditer does,
+    leftmost first and without overlaps."""
+
+    SLOTS = tuple(PackedMorphology.LAYOUT.keys()) + ("lexeme", "form")
+
+    def __init__(self, source: str, vocabulary: Vocabulary = None):
+        self._source = source
+        self._vocabulary = vocabulary
+        self._regex = re.compile(self.compile(source))
+
+    @property
+    def source(self) -> str:
+        return self._source
+
+    @property
+    def regex(self):
+        return self._regex
+
+    def compile(self, source: str) -> str:
+        expression = ""
+        position = 0
+        for match in re.finditer(ELEMENT_REGEX, source):
+            if source[position:match.start()].strip():
+                raise PatternError("Unexpected {} in pattern".format(source[position:match.start()].strip()))
+            position = match.end()
+            quantifier = match.group("quantifier") or ""
+            expression += "(?:{}){}".format(self.element(match.group("constraints")), quantifier)
+        if source[position:].strip():
+            raise PatternError("Unexpected {} in pattern".format(source[position:].strip()))
+        if not expression:
+            raise PatternError("Empty pattern")
+        return expression
+
+    def element(self, source: str) -> str:
+        """The regular expression of one word, a character class per slot of the record."""
+        constraints = list()
+        for term in source.split():
+            match = re.match(CONSTRAINT_REGEX, term)
+            if match:
+                constraints.append((match.group("name"), match.group("operator") == "=", match.group("values")))
+            elif not constraints:
+                constraints.append(("speech", True, term))
+            else:
+                raise PatternError("Unexpected {} in constraints".format(term))
+
+        speeches = [values for name, allowed, values in constraints if name == "speech" and allowed]
+        speech = self.member(Speech, speeches[0]) if len(speeches) == 1 and "|" not in speeches[0] else None
+
+        slots = dict()
+        for name, allowed, values in constraints:
+            if name not in self.SLOTS:
+                raise PatternError("No inflexion named {}".format(name))
+            characters = set(self.character(name, value, speech) for value in values.split("|"))
+            characters.discard(None)
+            slots.setdefault(name, list()).append((allowed, characters))
+
+        expression = re.escape(Encoded.MARKER)
+        for name in self.SLOTS:
+            constraints = slots.get(name, ())
+            if len(constraints) == 1 and constraints[0][0] and constraints[0][1]:
+                expression += self.characters(constraints[0][1])
+            else:
+                expression += "".join(self.lookahead(allowed, characters) for allowed, characters in constraints)
+                expression += "."
+        return expression
+
+    @classmethod
+    def characters(cls, characters: set) -> str:
+        return "[{}]".format("".join(re.escape(character) for character in sorted(characters)))
+
+    @classmethod
+    def lookahead(cls, allowed: bool, characters: set) -> str:
+        """A constraint on the next character, several constraints of a slot all have to hold."""
+        if not characters:
+            return "(?!)" if allowed else ""
+        return "(?{}{})".format("=" if allowed else "!", cls.characters(characters))
+
+    @classmethod
+    def member(cls, enum, value: str):
+        try:
+            return enum(value)
+        except ValueError:
+            raise PatternError("No {} with the code {}".format(enum.__name__, value))
+
+    def character(self, name: str, value: str, speech: Speech) -> str:
+        """The character of a value of a slot, or None if the corpus hasn't got the lexeme or form."""
+        if name in ("lexeme", "form"):
+            if self._vocabulary is None:
+                raise PatternError("Patterns on the {} need the vocabulary".format(name))
+            try:
+                return chr(Encoded.ID + self._vocabulary.index(
+                    Vocabulary.LEXEME if name == "lexeme" else Vocabulary.FORM, value))
+            except KeyError:
+                return None
+
+        if name == "type":
+            if speech not in PackedMorphology.TYPES:
+                raise PatternError("The type needs one part of speech that has types")
+            enum = PackedMorphology.TYPES[speech]
+        elif name == "case" and value not in set(member.value for member in CaseGeneric):
+            enum = CasePreposition
+        else:
+            enum = PackedMorphology.ENUMS[name]
+        return chr(Encoded.INFLEXION + PackedMorphology.ordinal(self.member(enum, value)))
+
+    def finditer(self, encoded: Encoded) -> Iterator[tuple]:
+        """The first and past the last offset in the linear of every match in a book, empty matches left out."""
+        offsets = encoded.offsets
+        for match in self._regex.finditer(encoded.text):
+            if match.end() > match.start():
+                yield offsets[match.start() // Encoded.WIDTH], offsets[match.end() // Encoded.WIDTH - 1] + 1
+
+    def find(self, books) -> Iterator[TokenSpan]:
+        """The spans of the matches in books, given as encoded books or as book name and linear columns."""
+        for book in books:
+            if not isinstance(book, Encoded):
+                book = Encoded.encode(*book)
+            for start, stop in self.finditer(book):
+                yield TokenSpan(book.book, start, stop)
+
+    def __repr__(self) -> str:
+        return "<Pattern {}>".format(self._source)
@@ -0,0 +1,203 @@
+#
+# Copyright (c) 2021 by Kristoffer Paulsson <kristoffer.paulsson@talenten.se>.
+#
+# Permission to use, copy, modify, and/or distribute this software for any purpose with
+# or without fee is hereby granted, provided that the above copyright notice and this
+# permission notice appear in all copies.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES WITH REGARD TO
+# THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS. IN NO
+# EVENT SHALL THE AUTHOR BE LIABLE FOR ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL
+# DAMAGES OR ANY DAMAGES WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER
+# IN AN ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF OR IN
+# CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+#
+#     https://opensource.org/licenses/ISC
+#
+# SPDX-License-Identifier: ISC
+#
+# Contributors:
+#     Kristoffer Paulsson - initial implementation
+#
+"""SQLite store of the loaded and lined corpus, for lookups without parsing."""
+import sqlite3
+from pathlib import Path
+
+from bibleanalyzer.util.columnar import LinearColumns
+from bibleanalyzer.util.model import DataEntry, Token, WordToken, PunctuationToken, ChapterToken, VerseToken, \
+    SectionToken
+from bibleanalyzer.util.reference import BibleReference
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS verses (
+    id INTEGER PRIMARY KEY,
+    corpus TEXT NOT NULL,
+    book TEXT NOT NULL,
+    chapter INTEGER NOT NULL,
+    verse INTEGER NOT NULL,
+    translation TEXT,
+    text TEXT
+);
+CREATE TABLE IF NOT EXISTS lexemes (
+    id INTEGER PRIMARY KEY,
+    lexeme TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS morphologies (
+    id INTEGER PRIMARY KEY,
+    grammar TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS tokens (
+    id INTEGER PRIMARY KEY,
+    book TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    chapter INTEGER NOT NULL,
+    verse INTEGER NOT NULL,
+    kind INTEGER NOT NULL,
+    word TEXT,
+    lexeme INTEGER REFERENCES lexemes (id),
+    morphology INTEGER REFERENCES morphologies (id),
+    value INTEGER
+);
+"""
+
+INDEXES = (
+    "CREATE INDEX IF NOT EXISTS verses_reference ON verses (book, chapter, verse)",
+    "CREATE INDEX IF NOT EXISTS tokens_reference ON tokens (book, chapter, verse)",
+    "CREATE INDEX IF NOT EXISTS tokens_lexeme ON tokens (lexeme)",
+    "CREATE INDEX IF NOT EXISTS tokens_morphology ON tokens (morphology)",
+)
+
+OCCURRENCES = """
+SELECT tokens.book, tokens.chapter, tokens.verse, tokens.word FROM tokens
+JOIN {table} ON tokens.{column} = {table}.id WHERE {table}.{field} = ? ORDER BY tokens.id
+"""
+
+
+class CorpusStore:
+    """Corpus in a single SQLite database with tables for verses, tokens, lexemes and morphology codes."""
+
+    FILENAME = "corpus.sqlite"
+
+    def __init__(self, path: Path):
+        self._path = path
+        self._connection = sqlite3.connect(str(path))
+        self._connection.executescript(SCHEMA)
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    def _identities(self, table: str, field: str) -> dict:
+        return dict((value, index) for index, value in self._connection.execute(
+            "SELECT id, {} FROM {}".format(field, table)))
+
+    def _identify(self, identities: dict, table: str, field: str, value: str) -> int:
+        index = identities.get(value)
+        if index is None:
+            index = self._connection.execute(
+                "INSERT INTO {} ({}) VALUES (?)".format(table, field), (value,)).lastrowid
+            identities[value] = index
+        return index
+
+    def ingest(self, books):
+        """Bulk inserts books in one transaction, replacing what was stored of them before.
+        The books are given as (corpus, book, entries, linear), where the linear is a list of tokens or columns.
+        The indexes are created after the first ingest, so that they are built once instead of row by row."""
+        with self._connection:
+            lexemes = self._identities("lexemes", "lexeme")
+            morphologies = self._identities("morphologies", "grammar")
+
+            for corpus, book, entries, linear in books:
+                self._connection.execute("DELETE FROM verses WHERE book = ?", (book,))
+                self._connection.execute("DELETE FROM tokens WHERE book = ?", (book,))
+                self._connection.executemany(
+                    "INSERT INTO verses (corpus, book, chapter, verse, translation, text) VALUES (?, ?, ?, ?, ?, ?)",
+                    ((corpus, book, entry.chapter, entry.verse, entry.translation, entry.text) for entry in entries))
+
+                rows = list()
+                chapter = 0
+                verse = 0
+                for position, token in enumerate(linear):
+                    kind = LinearColumns.KINDS[token.__class__]
+                    word = lexeme = morphology = value = None
+                    if kind == LinearColumns.WORD:
+                        word = token.word
+                        lexeme = self._identify(lexemes, "lexemes", "lexeme", token.lexeme)
+                        morphology = self._identify(morphologies, "morphologies", "grammar", token.grammar)
+                    elif kind == LinearColumns.PUNCTUATION:
+                        word = token.diacritic
+                    elif kind == LinearColumns.CHAPTER:
+                        chapter = value = token.number
+                        verse = 0
+                    elif kind == LinearColumns.VERSE:
+                        verse = value = token.number
+                    elif kind == LinearColumns.SECTION:
+                        value = token.level
+                    rows.append((book, position, chapter, verse, kind, word, lexeme, morphology, value))
+
+                self._connection.executemany(
+                    "INSERT INTO tokens (book, position, chapter, verse, kind, word, lexeme, morphology, value) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+
+            for index in INDEXES:
+                self._connection.execute(index)
+
+    @classmethod
+    def _entry(cls, book: str, chapter: int, verse: int, text: str, translation: str) -> DataEntry:
+        return DataEntry(book=book, chapter=chapter, verse=verse, text=text, translation=translation)
+
+    def verse(self, book: str, chapter: int, verse: int) -> DataEntry:
+        """A verse as loaded, but with the index and the words left empty as they aren't stored."""
+        row = self._connection.execute(
+            "SELECT book, chapter, verse, text, translation FROM verses "
+            "WHERE book = ? AND chapter = ? AND verse = ?", (book, chapter, verse)).fetchone()
+        return self._entry(*row) if row else None
+
+    def reference(self, reference: BibleReference) -> list:
+        """All verses within a reference, in order, with the index and the words left empty as for a verse."""
+        book, chapter, verse = reference.start
+        _, to_chapter, to_verse = reference.end
+        return [self._entry(*row) for row in self._connection.execute(
+            "SELECT book, chapter, verse, text, translation FROM verses WHERE book = ? "
+            "AND (chapter > ? OR chapter = ? AND verse >= ?) AND (chapter < ? OR chapter = ? AND verse <= ?) "
+            "ORDER BY chapter, verse", (book, chapter, chapter, verse, to_chapter, to_chapter, to_verse))]
+
+    def tokens(self, book: str, chapter: int, verse: int) -> list:
+        """The tokens of a verse, from its verse token up to the next verse or chapter."""
+        return [self._token(*row) for row in self._connection.execute(
+            "SELECT tokens.kind, tokens.word, lexemes.lexeme, morphologies.grammar, tokens.value FROM tokens "
+            "LEFT JOIN lexemes ON tokens.lexeme = lexemes.id LEFT JOIN morphologies ON tokens.morphology = morphologies.id "
+            "WHERE tokens.book = ? AND tokens.chapter = ? AND tokens.verse = ? ORDER BY tokens.id",
+            (book, chapter, verse))]
+
+    def lexeme(self, lexeme: str) -> list:
+        """Occurrences of a lexeme as (book, chapter, verse, word)."""
+        return self._connection.execute(OCCURRENCES.format(
+            table="lexemes", column="lexeme", field="lexeme"), (lexeme,)).fetchall()
+
+    def grammar(self, grammar: str) -> list:
+        """Occurrences of a morphology code as (book, chapter, verse, word)."""
+        return self._connection.execute(OCCURRENCES.format(
+            table="morphologies", column="morphology", field="grammar"), (grammar,)).fetchall()
+
+    @classmethod
+    def _token(cls, kind: int, word: str, lexeme: str, grammar: str, value: int) -> Token:
+        if kind == LinearColumns.WORD:
+            return WordToken(word=word, lexeme=lexeme, grammar=grammar)
+        elif kind == LinearColumns.PUNCTUATION:
+            return PunctuationToken(diacritic=word)
+        elif kind == LinearColumns.CHAPTER:
+            return ChapterToken(number=value)
+        elif kind == LinearColumns.VERSE:
+            return VerseToken(number=value)
+        else:
+            return SectionToken(level=value)
+
+    def close(self):
+        self._connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -20,89 +20,113 @@
 #     Kristoffer Paulsson - initial implementation
 #
 """The purpose of the structor is to analyze and index a structure from the linear tokens."""
-from bibleanalyzer.util.model import ChapterToken, VerseToken, SectionToken, WordToken, Linear, Token, PunctuationToken
+from bibleanalyzer.index.sections import SectionIndex
+from bibleanalyzer.index.verses import VerseIndex
+from bibleanalyzer.util.columnar import LinearColumns
+from bibleanalyzer.util.model import SectionToken, WordToken, Linear, PunctuationToken
 
 
-class Section(Linear):
+class Span:
+    """A view over the tokens from start to stop of the linear of a structor, nothing is copied until read."""
 
-    def __init__(self, offset: int, marker: SectionToken):
-        Linear.__init__(self, offset)
+    def __init__(self, structor: "Structor", start: int, stop: int):
+        self._structor = structor
+        self._start = start
+        self._stop = stop
 
-        self._sentences = list()
-        self._sentences.append(Sentence(offset))
-        self._marker = marker
+    @property
+    def offset(self) -> int:
+        return self._start
 
-    def dispatch(self, token: Token):
-        self.add(token)
-        if isinstance(token, PunctuationToken):
-            if token.diacritic in (".", ";"):
-                self._sentences[-1].marker(token)
-                self._sentences.append(Sentence(self._offset + len(self._linear)))
-                return
+    @property
+    def stop(self) -> int:
+        return self._stop
 
-        self._sentences[-1].dispatch(token)
+    @property
+    def line(self) -> list:
+        """The tokens of the span, sliced from the linear on every call."""
+        return self._structor.linear[self._start:self._stop]
 
-    def __str__(self) -> str:
-        return " ".join([str(s) for s in self._sentences])
+    def __len__(self) -> int:
+        return self._stop - self._start
 
-    def __iter__(self):
-        for sentence in self._sentences:
-            for clause in sentence._clauses:
-                yield clause
 
+class Section(Span):
+    """The tokens after a section token up to the next section of the same level, divided into sentences."""
+
+    def __init__(self, structor: "Structor", first: int, last: int):
+        self._first = first
+        self._last = last
+        positions = structor.section_index.positions
+        stop = positions[last] if last < len(positions) else len(structor.linear)
+        Span.__init__(self, structor, positions[first] + 1, stop)
+
+    @property
+    def offset(self) -> int:
+        return self._start - 1
+
+    @property
+    def marker(self) -> SectionToken:
+        return self._structor.linear[self._start - 1]
 
-class Sentence(Linear):
+    @property
+    def sentences(self):
+        for base in range(self._first, self._last):
+            first, last = self._structor.section_index.section_sentences(base)
+            for index in range(first, last):
+                yield Sentence(self._structor, index, index + 1 < last)
 
-    def __init__(self, offset: int):
-        Linear.__init__(self, offset)
+    def __str__(self) -> str:
+        return " ".join([str(s) for s in self.sentences])
 
-        self._clauses = list()
-        self._clauses.append(Clause(offset))
-        self._marker = None
+    def __iter__(self):
+        for sentence in self.sentences:
+            yield from sentence.clauses
 
-    def dispatch(self, token: Token):
-        self.add(token)
-        if isinstance(token, PunctuationToken):
-            if token.diacritic in ("·", ",", ":", "-"):
-                self._clauses[-1].marker(token)
-                self._clauses.append(Clause(self._offset + len(self._linear)))
-                return
 
-        self._clauses[-1].dispatch(token)
+class Sentence(Span):
+    """The clauses up to a full stop or question mark, which is the marker of the sentence."""
 
-    def marker(self, token: PunctuationToken):
-        self._marker = token
+    def __init__(self, structor: "Structor", index: int, marked: bool):
+        self._first, self._last = structor.section_index.sentence_clauses(index)
+        start, _ = structor.section_index.clause(self._first)
+        _, stop = structor.section_index.clause(self._last - 1)
+        Span.__init__(self, structor, start, stop)
+        self._marked = marked
+
+    @property
+    def marker(self) -> PunctuationToken:
+        return self._structor.linear[self._stop] if self._marked else None
+
+    @property
+    def clauses(self):
+        for index in range(self._first, self._last):
+            yield Clause(self._structor, index, index + 1 < self._last)
 
     def __str__(self) -> str:
-        return " ".join([str(c) for c in self._clauses]) + (self._marker.diacritic if self._marker else "")
+        marker = self.marker
+        return " ".join([str(c) for c in self.clauses]) + (marker.diacritic if marker else "")
 
 
-class Clause(Linear):
+class Clause(Span):
+    """The words up to a comma, colon, raised dot or dash, which is the marker of the clause."""
 
-    def __init__(self, offset: int):
-        Linear.__init__(self, offset)
-        self._marker = None
-        self._tokens = list()
+    def __init__(self, structor: "Structor", index: int, marked: bool):
+        start, stop = structor.section_index.clause(index)
+        Span.__init__(self, structor, start, stop)
+        self._marked = marked
 
     @property
     def words(self) -> list:
-        return self._tokens
-
-    def dispatch(self, token: Token):
-        self.add(token)
-        if isinstance(token, WordToken):
-            self._tokens.append(token)
-        elif isinstance(token, (ChapterToken, VerseToken)):
-            return
-        else:
-            raise ValueError("Not a word token: {}".format(token))
+        return [token for token in self.line if isinstance(token, WordToken)]
 
-    def marker(self, token: PunctuationToken):
-        self._marker = token
+    @property
+    def marker(self) -> PunctuationToken:
+        return self._structor.linear[self._stop] if self._marked else None
 
     def __str__(self) -> str:
-        return " ".join([t.word for t in self._tokens if isinstance(
-            t, WordToken)]) + (self._marker.diacritic if self._marker else "")
+        marker = self.marker
+        return " ".join([t.word for t in self.words]) + (marker.diacritic if marker else "")
 
 
 class Structor(Linear):
@@ -110,132 +134,116 @@ class Structor(Linear):
     SEC = -2
 
     def __init__(self, linear: list):
+        """The linear is either a list of tokens or the columns of a book, in which case the indexes are read
+        from the columns and the tokens are only created when the sections are iterated."""
         Linear.__init__(self, 0)
         self._linear = linear
-        self._index = dict()
-        self._ref = dict()
-        self._sec = {
-            1: list(),
-            2: list(),
-            3: list()
-        }
-        self._sections = list()
+        self._index = None
 
-        self._structure()
+        if isinstance(linear, LinearColumns):
+            self._verse_index = linear.verse_index
+            self._section_index = linear.section_index
+        else:
+            self._verse_index = VerseIndex.build(LinearColumns.boundaries(linear), len(linear))
+            self._section_index = SectionIndex.build(LinearColumns.marks(linear), len(linear))
 
         self._ctx = None
         self._slice = 0
 
+    @property
+    def linear(self):
+        return self._linear
+
+    @property
+    def verse_index(self) -> VerseIndex:
+        return self._verse_index
+
+    @property
+    def section_index(self) -> SectionIndex:
+        return self._section_index
+
+    def _scan(self):
+        """Kind, chapter number, verse number and section level of every token."""
+        if isinstance(self._linear, LinearColumns):
+            yield from zip(self._linear.kinds, self._linear.chapters, self._linear.verses, self._linear.levels)
+        else:
+            for token in self._linear:
+                kind = LinearColumns.KINDS[token.__class__]
+                yield (
+                    kind,
+                    token.number if kind == LinearColumns.CHAPTER else 0,
+                    token.number if kind == LinearColumns.VERSE else 0,
+                    token.level if kind == LinearColumns.SECTION else 0
+                )
+
     def _structure(self):
+        """Indexes the section levels by chapter, verse and the number of words into the verse."""
         chapter = 1
         verse = 1
         word = 0
 
+        self._index = dict()
         self._index[1] = dict()
         self._index[1][1] = dict()
 
-        for index, token in enumerate(self._linear):
-            if isinstance(token, WordToken):
+        for kind, chapter_number, verse_number, section_level in self._scan():
+            if kind == LinearColumns.WORD:
                 word += 1
-            if isinstance(token, ChapterToken):
-                chapter = token.number
+            if kind == LinearColumns.CHAPTER:
+                chapter = chapter_number
                 verse = 0
 
                 if chapter not in self._index.keys():
                     self._index[chapter] = dict()
 
-                if chapter not in self._ref.keys():
-                    self._ref[chapter] = dict()
-
-            elif isinstance(token, VerseToken):
-                verse = token.number
+            elif kind == LinearColumns.VERSE:
+                verse = verse_number
                 word = 0
 
                 if verse not in self._index[chapter].keys():
                     self._index[chapter][verse] = dict()
 
-                if verse not in self._ref.keys():
-                    self._ref[chapter] = dict()
-                self._ref[chapter][verse] = index
-
-            elif isinstance(token, SectionToken):
-                self._sections.append((Section(index, token)))
-                self._index[chapter][verse][word] = token.level
-                level = abs(token.level)
-                if level == 1:
-                    self._sec[1].append(index)
-                    self._sec[2].append(index)
-                    self._sec[3].append(index)
-                elif level == 2:
-                    self._sec[2].append(index)
-                    self._sec[3].append(index)
-                elif level == 3:
-                    self._sec[3].append(index)
-                else:
-                    pass
-                    # raise ValueError("Invalid section level: {}".format(token))
-
-            if not isinstance(token, SectionToken):
-                self._sections[-1].dispatch(token)
+            elif kind == LinearColumns.SECTION:
+                self._index[chapter][verse][word] = section_level
 
     def _backtrack(self, index: int, level: int = 1) -> int:
-        indices = filter(self._sec.keys(), lambda x: x <= level, reversed=True)
-        for index in indices:
-            if self._sec[index] == level:
-                return index
-        return 0
+        """Position of the section token starting the section of a level around a token, or zero."""
+        current = self._section_index.enclosing(index, level)
+        if current < 0:
+            return 0
+        first, _ = self._section_index.section(level, current)
+        return self._section_index.positions[first]
 
     def search(self, chapter: int, verse: int) -> int:
-        try:
-            return self._ref[chapter][verse]
-        except KeyError:
-            return -1
+        return self._verse_index.start(chapter, verse)
 
     def verse(self, chapter: int, verse: int) -> list:
-        tokens = list()
-        stop = False
-
-        for token in self._linear[self.search(chapter, verse):]:
-            if isinstance(token, (ChapterToken, VerseToken)):
-                if stop:
-                    break
-                stop = True
-            tokens.append(token)
-
-        return tokens
-
-    # def section(self, chapter: int, verse: int, level: int) -> list:
-    #    tokens = list()
-    #    stop = False
-
-    #    for token in self._linear[self._backtrack(self.search(chapter, verse), level):]:
-    #        if isinstance(token, (SectionToken)):
-    #            if token.level == level:
-    #                if stop:
-    #                    break
-    #                stop = True
-    #        tokens.append(token)
-
-    #    return tokens
-
-    # def __enter__(self, kind: int, start: int):
-    #    if kind == self.SEC and 0 <= start < len(self._sec):
-    #        self._slice = slice(self._sec[start], self._sec[start + 1])
-    #    else:
-    #        raise IndexError("Unknown iteration type: {}".format(kind))
-    #
-    #    self._ctx = kind
-
-    # def __exit__(self, exc_type, exc_val, exc_tb):
-    #    self._ctx = None
+        """The tokens of a verse from its verse token up to the next chapter or verse."""
+        return self._linear[self._verse_index.verse(chapter, verse)]
+
+    def passage(self, chapter: int, verse: int, to_chapter: int, to_verse: int) -> list:
+        """The tokens from the start of one verse to the end of another."""
+        return self._linear[self._verse_index.verses(chapter, verse, to_chapter, to_verse)]
+
+    def chapters(self, chapter: int, to_chapter: int = None) -> list:
+        """The tokens of the verses of a chapter, or of a range of chapters."""
+        return self._linear[self._verse_index.chapters(chapter, to_chapter)]
+
+    def section(self, chapter: int, verse: int, level: int = 1) -> Section:
+        """The section of a level that a verse starts in, or None."""
+        position = self.search(chapter, verse)
+        current = self._section_index.enclosing(position, level) if position >= 0 else -1
+        return Section(self, *self._section_index.section(level, current)) if current >= 0 else None
 
     def section_iter(self, level: int = 1, index: int = 0):
-        for section in self._sections:
-            yield section
-        # for current in range(len(self._sec[level]) - 1):
-        #    yield self._linear[self._sec[level][current]:self._sec[level][current + 1]]
+        """The sections of a level, starting with the section at the index."""
+        for current in range(index, self._section_index.count(level)):
+            yield Section(self, *self._section_index.section(level, current))
 
     def secref_iter(self):
+        if self._index is None:
+            self._structure()
+
         for chapter in self._index.keys():
             for verse in self._index[chapter].keys():
                 for word, level in self._index[chapter][verse].items():
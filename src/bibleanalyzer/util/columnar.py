@@ -0,0 +1,366 @@
+#
+# Copyright (c) 2022 by Kristoffer Paulsson <kristoffer.paulsson@talenten.se>.
+#
+# Permission to use, copy, modify, and/or distribute this software for any purpose with
+# or without fee is hereby granted, provided that the above copyright notice and this
+# permission notice appear in all copies.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES WITH REGARD TO
+# THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS. IN NO
+# EVENT SHALL THE AUTHOR BE LIABLE FOR ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL
+# DAMAGES OR ANY DAMAGES WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER
+# IN AN ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF OR IN
+# CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+#
+#     https://opensource.org/licenses/ISC
+#
+# SPDX-License-Identifier: ISC
+#
+# Contributors:
+#     Kristoffer Paulsson - initial implementation
+#
+"""Columnar cache format for the linear token stream.
+
+A columns file holds named arrays of fixed width after a small JSON header, each array aligned to eight bytes.
+The file is mapped into memory and the arrays are read with memoryview or NumPy without creating objects."""
+import array
+import json
+import mmap
+import struct
+import sys
+from pathlib import Path
+
+from bibleanalyzer.index.sections import SectionIndex
+from bibleanalyzer.index.verses import VerseIndex
+from bibleanalyzer.util.model import Token, WordToken, PunctuationToken, ChapterToken, VerseToken, SectionToken
+from bibleanalyzer.util.packed import PackedMorphology
+from bibleanalyzer.util.vocabulary import Vocabulary
+
+
+class ColumnsFile:
+    """Named arrays in one file, mapped into memory for reading."""
+
+    MAGIC = b"BACOLS01"
+    HEAD = struct.Struct("<8sI")
+    ALIGN = 8
+
+    def __init__(self, path: Path):
+        self._path = path
+        with path.open("rb") as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, length = self.HEAD.unpack_from(self._map)
+        if magic != self.MAGIC:
+            self._map.close()
+            raise ValueError("Not a columns file: {}".format(path))
+
+        header = json.loads(self._map[self.HEAD.size:self.HEAD.size + length].decode("utf-8"))
+        if header["byteorder"] != sys.byteorder:
+            self._map.close()
+            raise ValueError("Columns file written with another byte order: {}".format(path))
+
+        self._start = self._align(self.HEAD.size + length)
+        self._columns = header["columns"]
+        self._meta = header.get("meta", dict())
+        self._view = memoryview(self._map)
+        self._views = dict()
+
+    @classmethod
+    def _align(cls, size: int) -> int:
+        return (size + cls.ALIGN - 1) // cls.ALIGN * cls.ALIGN
+
+    @classmethod
+    def write(cls, path: Path, columns: dict, meta: dict = None):
+        """Writes a dictionary of arrays to a columns file, with a dictionary of strings kept in the header."""
+        layout = dict()
+        offset = 0
+        for name, column in columns.items():
+            layout[name] = [column.typecode, offset, len(column)]
+            offset += cls._align(len(column) * column.itemsize)
+
+        header = json.dumps({"byteorder": sys.byteorder, "columns": layout, "meta": meta or dict()}).encode("utf-8")
+        with path.open("wb") as file:
+            file.write(cls.HEAD.pack(cls.MAGIC, len(header)))
+            file.write(header)
+            file.write(bytes(cls._align(cls.HEAD.size + len(header)) - cls.HEAD.size - len(header)))
+            for column in columns.values():
+                size = len(column) * column.itemsize
+                file.write(column.tobytes())
+                file.write(bytes(cls._align(size) - size))
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    @property
+    def meta(self) -> dict:
+        return self._meta
+
+    def names(self) -> list:
+        return list(self._columns.keys())
+
+    def __getitem__(self, name: str) -> memoryview:
+        """The column as a memoryview straight into the mapped file."""
+        if name not in self._views:
+            typecode, offset, count = self._columns[name]
+            start = self._start + offset
+            size = count * array.array(typecode).itemsize
+            self._views[name] = self._view[start:start + size].cast(typecode)
+        return self._views[name]
+
+    def numpy(self, name: str):
+        """The column as a read-only NumPy array over the mapped file, requires NumPy."""
+        import numpy
+
+        typecode, offset, count = self._columns[name]
+        return numpy.frombuffer(self._map, dtype=numpy.dtype(typecode), count=count, offset=self._start + offset)
+
+    def close(self):
+        for view in self._views.values():
+            view.release()
+        self._views.clear()
+        self._view.release()
+        self._map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class LinearColumns:
+    """The linear of a book stored as columns, with the chapter and verse of every token.
+    Tokens are only created when indexed, everything else is read from the columns.
+    Forms, lexemes and grammar codes are ids of the corpus vocabulary, which by default is the one next to the file.
+    The packed column holds the packed morphology of every word, see PackedMorphology, and the index columns
+    the verse and section index of the book."""
+
+    WORD = 0
+    PUNCTUATION = 1
+    CHAPTER = 2
+    VERSE = 3
+    SECTION = 4
+
+    KINDS = {
+        WordToken: WORD,
+        PunctuationToken: PUNCTUATION,
+        ChapterToken: CHAPTER,
+        VerseToken: VERSE,
+        SectionToken: SECTION,
+    }
+
+    def __init__(self, path: Path, vocabulary: Vocabulary = None):
+        self._file = ColumnsFile(path)
+        self._kinds = self._file["kind"]
+        self._words = self._file["word"]
+        self._lexemes = self._file["lexeme"]
+        self._morphologies = self._file["morphology"]
+        self._chapters = self._file["chapter"]
+        self._verses = self._file["verse"]
+        self._levels = self._file["level"]
+        self._packed = self._file["packed"]
+        self._verse_index = VerseIndex(self._file["verse_keys"], self._file["verse_starts"], self._file["verse_stops"])
+        self._section_index = SectionIndex.read(self._file)
+        self._owned = vocabulary is None
+        self._vocabulary = vocabulary if vocabulary else Vocabulary(path.parent.joinpath(Vocabulary.FILENAME))
+        if self._vocabulary.generation != self._file.meta.get("vocabulary"):
+            self.close()
+            raise ValueError("The columns were written with another vocabulary, rebuild the cache: {}".format(path))
+
+    @classmethod
+    def generation(cls, path: Path) -> str:
+        """The generation of the vocabulary the ids of a columns file are of, or None if unknown."""
+        try:
+            with ColumnsFile(path) as file:
+                return file.meta.get("vocabulary")
+        except (OSError, ValueError):
+            return None
+
+    @classmethod
+    def write(cls, path: Path, linear: list, vocabulary: Vocabulary = None):
+        """Writes a list of tokens as columns, adding new strings to the vocabulary."""
+        forms = dict()
+        lexemes = dict()
+        grammars = dict()
+        for token in linear:
+            if token.__class__ is WordToken:
+                forms[token.word] = None
+                lexemes[token.lexeme] = None
+                grammars[token.grammar] = None
+            elif token.__class__ is PunctuationToken:
+                forms[token.diacritic] = None
+
+        owned = vocabulary is None
+        if owned:
+            vocabulary = Vocabulary(path.parent.joinpath(Vocabulary.FILENAME))
+        tables = {Vocabulary.FORM: forms, Vocabulary.LEXEME: lexemes, Vocabulary.GRAMMAR: grammars}
+        try:
+            vocabulary.extend(tables)
+            generation = vocabulary.generation
+            for table, strings in tables.items():
+                for string in strings.keys():
+                    strings[string] = vocabulary.index(table, string)
+        finally:
+            if owned:
+                vocabulary.close()
+
+        columns = {
+            "kind": array.array("B"),
+            "word": array.array("I"),
+            "lexeme": array.array("I"),
+            "morphology": array.array("I"),
+            "chapter": array.array("H"),
+            "verse": array.array("H"),
+            "level": array.array("b"),
+        }
+        chapter = 0
+        verse = 0
+
+        for token in linear:
+            kind = cls.KINDS[token.__class__]
+            word = lexeme = morphology = level = 0
+            if kind == cls.WORD:
+                word = forms[token.word]
+                lexeme = lexemes[token.lexeme]
+                morphology = grammars[token.grammar]
+            elif kind == cls.PUNCTUATION:
+                word = forms[token.diacritic]
+            elif kind == cls.CHAPTER:
+                chapter = token.number
+                verse = 0
+            elif kind == cls.VERSE:
+                verse = token.number
+            elif kind == cls.SECTION:
+                level = token.level
+
+            columns["kind"].append(kind)
+            columns["word"].append(word)
+            columns["lexeme"].append(lexeme)
+            columns["morphology"].append(morphology)
+            columns["chapter"].append(chapter)
+            columns["verse"].append(verse)
+            columns["level"].append(level)
+
+        columns["packed"] = PackedMorphology.array(linear)
+        verse_index = VerseIndex.build(cls.boundaries(linear), len(linear))
+        columns["verse_keys"] = verse_index.keys
+        columns["verse_starts"] = verse_index.starts
+        columns["verse_stops"] = verse_index.stops
+        columns.update(SectionIndex.build(cls.marks(linear), len(linear)).columns())
+        ColumnsFile.write(path, columns, {"vocabulary": generation})
+
+    @classmethod
+    def boundaries(cls, linear: list):
+        """Position, chapter and verse of every chapter and verse token of a list of tokens, as for VerseIndex."""
+        chapter = 0
+        for index, token in enumerate(linear):
+            if token.__class__ is ChapterToken:
+                chapter = token.number
+                yield index, chapter, 0
+            elif token.__class__ is VerseToken:
+                yield index, chapter, token.number
+
+    @classmethod
+    def marks(cls, linear: list):
+        """Position, level and diacritic of every section and punctuation token of a list of tokens,
+        as for SectionIndex."""
+        for index, token in enumerate(linear):
+            if token.__class__ is SectionToken:
+                yield index, token.level, None
+            elif token.__class__ is PunctuationToken:
+                yield index, None, token.diacritic
+
+    @property
+    def columns(self) -> ColumnsFile:
+        return self._file
+
+    @property
+    def kinds(self) -> memoryview:
+        return self._kinds
+
+    @property
+    def words(self) -> memoryview:
+        return self._words
+
+    @property
+    def lexemes(self) -> memoryview:
+        return self._lexemes
+
+    @property
+    def morphologies(self) -> memoryview:
+        return self._morphologies
+
+    @property
+    def chapters(self) -> memoryview:
+        return self._chapters
+
+    @property
+    def verses(self) -> memoryview:
+        return self._verses
+
+    @property
+    def levels(self) -> memoryview:
+        return self._levels
+
+    @property
+    def packed(self) -> memoryview:
+        return self._packed
+
+    @property
+    def verse_index(self) -> VerseIndex:
+        return self._verse_index
+
+    @property
+    def section_index(self) -> SectionIndex:
+        return self._section_index
+
+    @property
+    def vocabulary(self) -> Vocabulary:
+        return self._vocabulary
+
+    def token(self, index: int) -> Token:
+        kind = self._kinds[index]
+        if kind == self.WORD:
+            return WordToken(
+                word=self._vocabulary.value(Vocabulary.FORM, self._words[index]),
+                lexeme=self._vocabulary.value(Vocabulary.LEXEME, self._lexemes[index]),
+                grammar=self._vocabulary.value(Vocabulary.GRAMMAR, self._morphologies[index])
+            )
+        elif kind == self.PUNCTUATION:
+            return PunctuationToken(diacritic=self._vocabulary.value(Vocabulary.FORM, self._words[index]))
+        elif kind == self.CHAPTER:
+            return ChapterToken(number=self._chapters[index])
+        elif kind == self.VERSE:
+            return VerseToken(number=self._verses[index])
+        else:
+            return SectionToken(level=self._levels[index])
+
+    def __len__(self) -> int:
+        return len(self._kinds)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.token(current) for current in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("Token index out of range: {}".format(index))
+        return self.token(index)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self.token(index)
+
+    def close(self):
+        self._kinds = self._words = self._lexemes = self._morphologies = None
+        self._chapters = self._verses = self._levels = self._packed = self._verse_index = self._section_index = None
+        self._file.close()
+        if self._owned:
+            self._vocabulary.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
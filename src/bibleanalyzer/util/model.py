@@ -19,58 +19,128 @@
 # Contributors:
 #     Kristoffer Paulsson - initial implementation
 #
-"""Model for the BibleAnalyzer corpus."""
-from dataclasses import dataclass, field
+"""Model for the BibleAnalyzer corpus.
+
+The records are slotted instead of dataclasses, since around a million of them are held at once when a whole
+testament is lined up. They compare, print and pickle like the dataclasses did, and caches pickled from the
+dataclasses still load."""
 from typing import List
 
 
-@dataclass
-class GreekWord:
-    word: str = None
-    lexeme: str = None
-    grammar: str = None
+class Record:
+    """Base class for slotted records, its fields are the slots."""
+
+    __slots__ = ()
+
+    def _values(self) -> tuple:
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __eq__(self, other) -> bool:
+        if other.__class__ is self.__class__:
+            return self._values() == other._values()
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return "{}({})".format(self.__class__.__name__, ", ".join(
+            "{}={!r}".format(name, getattr(self, name)) for name in self.__slots__))
+
+    def __reduce__(self) -> tuple:
+        return self.__class__, self._values()
+
+    def __setstate__(self, state: dict):
+        """Restores records pickled as dataclasses."""
+        for name, value in state.items():
+            object.__setattr__(self, name, value)
+
+
+class GreekWord(Record):
+    __slots__ = ("word", "lexeme", "grammar")
+
+    def __init__(self, word: str = None, lexeme: str = None, grammar: str = None):
+        self.word = word
+        self.lexeme = lexeme
+        self.grammar = grammar
+
 
+class DataEntry(Record):
+    __slots__ = ("index", "book", "chapter", "verse", "text", "translation", "words")
 
-@dataclass
-class DataEntry:
-    index: int = 0
-    book: str = 0
-    chapter: int = 0
-    verse: int = 0
-    text: str = None
-    translation: str = None
-    words: List[GreekWord] = field(default_factory=list)
+    def __init__(
+            self, index: int = 0, book: str = 0, chapter: int = 0, verse: int = 0,
+            text: str = None, translation: str = None, words: List[GreekWord] = None
+    ):
+        self.index = index
+        self.book = book
+        self.chapter = chapter
+        self.verse = verse
+        self.text = text
+        self.translation = translation
+        self.words = list() if words is None else words
 
 
-class Token:
-    pass
+class Token(Record):
+    __slots__ = ()
 
 
-@dataclass
 class WordToken(Token):
-    word: str = None
-    lexeme: str = None
-    grammar: str = None
+    __slots__ = ("word", "lexeme", "grammar")
+
+    def __init__(self, word: str = None, lexeme: str = None, grammar: str = None):
+        self.word = word
+        self.lexeme = lexeme
+        self.grammar = grammar
 
 
-@dataclass
 class PunctuationToken(Token):
-    diacritic: str = None
+    """Punctuation tokens are immutable and one instance is shared for each diacritic."""
+
+    __slots__ = ("diacritic",)
+
+    _shared = dict()
+
+    def __new__(cls, diacritic: str = None):
+        if diacritic is None:
+            return object.__new__(cls)
+
+        token = cls._shared.get(diacritic)
+        if token is None:
+            token = object.__new__(cls)
+            object.__setattr__(token, "diacritic", diacritic)
+            cls._shared[diacritic] = token
+        return token
+
+    def __init__(self, diacritic: str = None):
+        if diacritic is None:
+            object.__setattr__(self, "diacritic", None)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("{} is immutable".format(self.__class__.__name__))
+
+    def __hash__(self) -> int:
+        return hash(self.diacritic)
 
 
-@dataclass
 class ChapterToken(Token):
-    number: int = 0
+    __slots__ = ("number",)
+
+    def __init__(self, number: int = 0):
+        self.number = number
 
 
-@dataclass
 class VerseToken(Token):
-    number: int = 0
+    __slots__ = ("number",)
+
+    def __init__(self, number: int = 0):
+        self.number = number
 
 
-@dataclass
 class SectionToken(Token):
-    level: int = 1
+    __slots__ = ("level",)
+
+    def __init__(self, level: int = 1):
+        self.level = level
 
 
 class Linear:
@@ -26,7 +26,7 @@ Morphologies can be found at:
     http://www.clavmon.cz/ultranet/bw/bwCodingBW.pdf
 """
 from enum import Enum
-from typing import List
+from typing import List, Tuple
 
 from bibleanalyzer.util.model import WordToken
 from bibleanalyzer.util.transliterator import KoineTransliterator
@@ -37,17 +37,19 @@ class MorphologyWarning(RuntimeWarning):
 
 
 class Word:
-    """Base class for a word being analyzable."""
+    """Base class for the morphology of an analyzable word, shared by every token with the same grammar."""
 
-    def __init__(self, word: WordToken):
-        self._word = word
+    __slots__ = ("_grammar",)
+
+    def __init__(self, grammar: str):
+        self._grammar = grammar
 
     @property
-    def word(self) -> WordToken:
-        return self._word
+    def grammar(self) -> str:
+        return self._grammar
 
     def __repr__(self) -> str:
-        return "<{} {}@{}>".format(self.__class__.__name__, self._word.lexeme.title(), self._word.grammar)
+        return "<{}@{}>".format(self.__class__.__name__, self._grammar)
 
 
 class Morphology:
@@ -60,9 +62,10 @@ class Inflexion(str, Enum):
 
     @classmethod
     def is_enumerated(cls, value: str):
-        if value not in cls.__members__.values():
-            raise MorphologyWarning("'{}' is not an inflexion of {}.".format(value, cls.__name__))
-        return cls(value)
+        try:
+            return cls(value)
+        except ValueError:
+            raise MorphologyWarning("'{}' is not an inflexion of {}.".format(value, cls.__name__)) from None
 
 
 class InflexionBWG(Inflexion):
@@ -238,8 +241,11 @@ class TypeConjunction(Type):    # cnj
 class WordBWG(Word):
     """Represents a BibleWorks greek word."""
 
+    __slots__ = (
+        "_speech", "_case", "_gender", "_number", "_mood", "_tense", "_voice", "_person", "_degree", "_type")
+
     def __init__(
-            self, word: WordToken,
+            self, grammar: str,
             speech: Speech,
             case: Case = None,
             gender: Gender = None,
@@ -251,7 +257,7 @@ class WordBWG(Word):
             person: Person = None,
             degree: Degree = None,
     ):
-        Word.__init__(self, word)
+        Word.__init__(self, grammar)
         self._speech = speech
         self._case = case
         self._gender = gender
@@ -310,111 +316,141 @@ class WordBWG(Word):
 
 class Combined(WordBWG):
 
-    def __init__(self, word: WordToken, every: List[Word]):
-        WordBWG.__init__(self, word, Speech.UNIDENTIFIED)
-        self._every = every
+    __slots__ = ("_every",)
+
+    def __init__(self, grammar: str, every: List[Word]):
+        WordBWG.__init__(self, grammar, Speech.UNIDENTIFIED)
+        self._every = tuple(every)
 
 
 class Compound(Combined):
     """Represents compound words with separate grammars."""
 
+    __slots__ = ()
+
     @property
-    def all(self) -> List[Word]:
+    def all(self) -> Tuple[Word, ...]:
         return self._every
 
 
 class Split(Combined):
     """Represents words with alternative grammars."""
 
+    __slots__ = ()
+
     @property
-    def alternatives(self) -> List[Word]:
+    def alternatives(self) -> Tuple[Word, ...]:
         return self._every
 
 
 class Several(Combined):
     """Represents words with several grammars."""
 
+    __slots__ = ()
+
     @property
-    def multiple(self) -> List[Word]:
+    def multiple(self) -> Tuple[Word, ...]:
         return self._every
 
 
 class Noun(WordBWG):
 
-    def __init__(self, word: WordToken, case: CaseGeneric, gender: Gender, number: Number, i_type: TypeNoun):
-        WordBWG.__init__(self, word, Speech.NOUN, case=case, gender=gender, number=number, i_type=i_type)
+    __slots__ = ()
+
+    def __init__(self, grammar: str, case: CaseGeneric, gender: Gender, number: Number, i_type: TypeNoun):
+        WordBWG.__init__(self, grammar, Speech.NOUN, case=case, gender=gender, number=number, i_type=i_type)
 
 
 class Verb(WordBWG):
 
+    __slots__ = ()
+
     def __init__(
-            self, word: WordToken, case: CaseGeneric, gender: Gender, number: Number,
+            self, grammar: str, case: CaseGeneric, gender: Gender, number: Number,
             mood: Mood, tense: Tense, voice: Voice, person: Person
     ):
         WordBWG.__init__(
-            self, word, Speech.VERB, case=case, gender=gender,
+            self, grammar, Speech.VERB, case=case, gender=gender,
             number=number, mood=mood, tense=tense, voice=voice, person=person
         )
 
 
 class Adjective(WordBWG):
 
+    __slots__ = ()
+
     def __init__(
-            self, word: WordToken, case: CaseGeneric, gender: Gender,
+            self, grammar: str, case: CaseGeneric, gender: Gender,
             number: Number, i_type: TypeAdjective, degree: Degree
     ):
         WordBWG.__init__(
-            self, word, Speech.ADJECTIVE, case=case, gender=gender,
+            self, grammar, Speech.ADJECTIVE, case=case, gender=gender,
             number=number, i_type=i_type, degree=degree
         )
 
 
 class DefiniteArticle(WordBWG):
 
-    def __init__(self, word: WordToken, case: CaseGeneric, gender: Gender, number: Number):
-        WordBWG.__init__(self, word, Speech.DEFINITE_ARTICLE, case=case, gender=gender, number=number)
+    __slots__ = ()
+
+    def __init__(self, grammar: str, case: CaseGeneric, gender: Gender, number: Number):
+        WordBWG.__init__(self, grammar, Speech.DEFINITE_ARTICLE, case=case, gender=gender, number=number)
 
 
 class Preposition(WordBWG):
 
-    def __init__(self, word: WordToken, case: CasePreposition):
-        WordBWG.__init__(self, word, Speech.PREPOSITION, case=case)
+    __slots__ = ()
+
+    def __init__(self, grammar: str, case: CasePreposition):
+        WordBWG.__init__(self, grammar, Speech.PREPOSITION, case=case)
 
 
 class Conjunction(WordBWG):
 
-    def __init__(self, word: WordToken, i_type: TypeConjunction):
-        WordBWG.__init__(self, word, Speech.CONJUNCTION, i_type=i_type)
+    __slots__ = ()
+
+    def __init__(self, grammar: str, i_type: TypeConjunction):
+        WordBWG.__init__(self, grammar, Speech.CONJUNCTION, i_type=i_type)
 
 
 class Particle(WordBWG):
 
-    def __init__(self, word: WordToken):
-        WordBWG.__init__(self, word, Speech.PARTICLE)
+    __slots__ = ()
+
+    def __init__(self, grammar: str):
+        WordBWG.__init__(self, grammar, Speech.PARTICLE)
 
 
 class Interjection(WordBWG):
 
-    def __init__(self, word: WordToken):
-        WordBWG.__init__(self, word, Speech.INTERJECTION)
+    __slots__ = ()
+
+    def __init__(self, grammar: str):
+        WordBWG.__init__(self, grammar, Speech.INTERJECTION)
 
 
 class Adverb(WordBWG):
 
-    def __init__(self, word: WordToken):
-        WordBWG.__init__(self, word, Speech.ADVERB)
+    __slots__ = ()
+
+    def __init__(self, grammar: str):
+        WordBWG.__init__(self, grammar, Speech.ADVERB)
 
 
 class Pronoun(WordBWG):
 
-    def __init__(self, word: WordToken, case: CaseGeneric, gender: Gender, number: Number, i_type: TypePronoun):
-        WordBWG.__init__(self, word, Speech.PRONOUN, case=case, gender=gender, number=number, i_type=i_type)
+    __slots__ = ()
+
+    def __init__(self, grammar: str, case: CaseGeneric, gender: Gender, number: Number, i_type: TypePronoun):
+        WordBWG.__init__(self, grammar, Speech.PRONOUN, case=case, gender=gender, number=number, i_type=i_type)
 
 
 class Indeclinable(WordBWG):
 
-    def __init__(self, word: WordToken):
-        WordBWG.__init__(self, word, Speech.INDECLINABLE_NOUN)
+    __slots__ = ()
+
+    def __init__(self, grammar: str):
+        WordBWG.__init__(self, grammar, Speech.INDECLINABLE_NOUN)
 
 
 class MorphologyBWG(Morphology):
@@ -439,60 +475,58 @@ class MorphologyBWG(Morphology):
     TYPE_ADJECTIVE = dict((k.lower(), v.lower().replace("_", " ")) for v, k in TypeAdjective.__members__.items())
     TYPE_CONJUNCTION = dict((k.lower(), v.lower().replace("_", " ")) for v, k in TypeConjunction.__members__.items())
 
+    _descriptors = dict()
+
     @classmethod
     def parse(cls, token: WordToken) -> Word:
-        morphology = list(token.grammar)
+        """The morphology of a word token, parsed once per grammar code and shared by all tokens using it."""
+        grammar = token.grammar
+        lexemes = token.lexeme.count("+") + 1 if "&" in grammar else 1
+        key = (grammar, lexemes) if lexemes > 1 else grammar
+        word = cls._descriptors.get(key)
+        if word is None:
+            word = cls._descriptors[key] = cls.describe(grammar, lexemes)
+        return word
+
+    @classmethod
+    def describe(cls, grammar: str, lexemes: int = 1) -> Word:
+        """Parses a grammar code, where a compound code counts the lexemes it joins."""
+        morphology = list(grammar)
         speech = morphology.pop(0)
 
         if "/" in morphology:
             morphology = list()
-            grammars = token.grammar.split("/")
-            alts = list()
-
-            for alt in grammars:
-                alts.append(cls.parse(WordToken(word=token.word, lexeme=token.lexeme, grammar=alt)))
-
-            word = Split(token, alts)
+            word = Split(grammar, [cls.describe(alt, lexemes) for alt in grammar.split("/")])
         elif "&" in morphology:
             morphology = list()
-            grammars = token.grammar.split("&")
-
-            if "+" in token.lexeme:
-                every = list()
-                lexemes = token.lexeme.split("+")
+            grammars = grammar.split("&")
 
-                for index in range(max(len(lexemes), len(grammars))):
-                    every.append(cls.parse(
-                        WordToken(word=lexemes[index], lexeme=lexemes[index], grammar=grammars[index])))
-
-                word = Compound(token, every=every)
+            if lexemes > 1:
+                if lexemes != len(grammars):
+                    raise MorphologyWarning("Compound grammar {} doesn't match {} lexemes.".format(grammar, lexemes))
+                word = Compound(grammar, every=[cls.describe(multi) for multi in grammars])
             else:
-                several = list()
-
-                for multi in grammars:
-                    several.append(cls.parse(WordToken(word=token.word, lexeme=token.lexeme, grammar=multi)))
-
-                word = Several(token, several)
+                word = Several(grammar, [cls.describe(multi) for multi in grammars])
         elif speech == Speech.NOUN:
             case = CaseGeneric.is_enumerated(morphology.pop(0))
             gender = Gender.is_enumerated(morphology.pop(0))
             number = Number.is_enumerated(morphology.pop(0))
             i_type = TypeNoun.is_enumerated(morphology.pop(0))
 
-            word = Noun(word=token, case=case, gender=gender, number=number, i_type=i_type)
+            word = Noun(grammar=grammar, case=case, gender=gender, number=number, i_type=i_type)
         elif speech == Speech.PRONOUN:
             i_type = TypePronoun.is_enumerated(morphology.pop(0))
             case = CaseGeneric.is_enumerated(morphology.pop(0))
             gender = Gender.is_enumerated(morphology.pop(0))
             number = Number.is_enumerated(morphology.pop(0))
 
-            word = Pronoun(word=token, case=case, gender=gender, number=number, i_type=i_type)
+            word = Pronoun(grammar=grammar, case=case, gender=gender, number=number, i_type=i_type)
         elif speech == Speech.DEFINITE_ARTICLE:
             case = CaseGeneric.is_enumerated(morphology.pop(0))
             gender = Gender.is_enumerated(morphology.pop(0))
             number = Number.is_enumerated(morphology.pop(0))
 
-            word = DefiniteArticle(word=token, case=case, gender=gender, number=number)
+            word = DefiniteArticle(grammar=grammar, case=case, gender=gender, number=number)
         elif speech == Speech.VERB:
             mood = Mood.is_enumerated(morphology.pop(0))
             if mood == Mood.PARTICIPLE:
@@ -518,7 +552,7 @@ class MorphologyBWG(Morphology):
                 gender = None
 
             word = Verb(
-                word=token, case=case, gender=gender, number=number,
+                grammar=grammar, case=case, gender=gender, number=number,
                 mood=mood, tense=tense, voice=voice, person=person
             )
         elif speech == Speech.ADJECTIVE:
@@ -528,32 +562,32 @@ class MorphologyBWG(Morphology):
             number = Number.is_enumerated(morphology.pop(0))
             degree = Degree.is_enumerated(morphology.pop(0))
 
-            word = Adjective(word=token, case=case, gender=gender, number=number, i_type=i_type, degree=degree)
+            word = Adjective(grammar=grammar, case=case, gender=gender, number=number, i_type=i_type, degree=degree)
         elif speech == Speech.ADVERB:
 
-            word = Adverb(word=token)
+            word = Adverb(grammar=grammar)
         elif speech == Speech.CONJUNCTION:
             i_type = TypeConjunction.is_enumerated(morphology.pop(0))
 
-            word = Conjunction(word=token, i_type=i_type)
+            word = Conjunction(grammar=grammar, i_type=i_type)
         elif speech == Speech.PREPOSITION:
             case = CasePreposition.is_enumerated(morphology.pop(0))
 
-            word = Preposition(word=token, case=case)
+            word = Preposition(grammar=grammar, case=case)
         elif speech == Speech.PARTICLE:
 
-            word = Particle(word=token)
+            word = Particle(grammar=grammar)
         elif speech == Speech.INDECLINABLE_NOUN:
 
-            word = Indeclinable(word=token)
+            word = Indeclinable(grammar=grammar)
         elif speech == Speech.INTERJECTION:
 
-            word = Interjection(word=token)
+            word = Interjection(grammar=grammar)
         else:
-            raise MorphologyWarning("The current word token {} is of unknown class. {}".format(token.grammar, token))
+            raise MorphologyWarning("The current grammar {} is of unknown class.".format(grammar))
 
         if len(morphology):
-            raise MorphologyWarning("Morphological grammatical incoherency in word: {}".format(token))
+            raise MorphologyWarning("Morphological grammatical incoherency in grammar: {}".format(grammar))
 
         return word
 
@@ -654,9 +688,9 @@ class MorphologyBWG(Morphology):
             raise MorphologyWarning("The current word {} is of unknown class. {}".format(type(word), word))
 
     @classmethod
-    def format_word(cls, word: WordBWG) -> str:
+    def format_word(cls, word: WordBWG, token: WordToken) -> str:
         return "{lexeme} ({normal}) {morphology}".format(
-            lexeme=word.word.lexeme,
-            normal=KoineTransliterator.latinize(word.word.lexeme),
+            lexeme=token.lexeme,
+            normal=KoineTransliterator.latinize(token.lexeme),
             morphology=cls.format_morphology(word)
         )
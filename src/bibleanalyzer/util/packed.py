@@ -0,0 +1,184 @@
+#
+# Copyright (c) 2022 by Kristoffer Paulsson <kristoffer.paulsson@talenten.se>.
+#
+# Permission to use, copy, modify, and/or distribute this software for any purpose with
+# or without fee is hereby granted, provided that the above copyright notice and this
+# permission notice appear in all copies.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES WITH REGARD TO
+# THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS. IN NO
+# EVENT SHALL THE AUTHOR BE LIABLE FOR ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL
+# DAMAGES OR ANY DAMAGES WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER
+# IN AN ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF OR IN
+# CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+#
+#     https://opensource.org/licenses/ISC
+#
+# SPDX-License-Identifier: ISC
+#
+# Contributors:
+#     Kristoffer Paulsson - initial implementation
+#
+"""Morphology packed into unsigned 32 bit integers.
+
+Every inflexion has a fixed bit field, holding the position of the member within its enumeration counted from one,
+or zero when the word lacks the inflexion. Filtering a book then becomes masking an array of integers."""
+import array
+
+from bibleanalyzer.grammar import Grammar
+from bibleanalyzer.util.model import WordToken
+from bibleanalyzer.util.morphology import MorphologyWarning, Word, Inflexion, Speech, CaseGeneric, \
+    CasePreposition, Gender, Number, Mood, Tense, Voice, Person, Degree, TypeNoun, TypePronoun, TypeAdjective, \
+    TypeConjunction
+
+
+FIELDS = (
+    ("speech", 4),
+    ("case", 3),
+    ("gender", 3),
+    ("number", 2),
+    ("mood", 3),
+    ("tense", 4),
+    ("voice", 3),
+    ("person", 3),
+    ("degree", 3),
+    ("type", 4),
+)
+
+
+def layout(fields: tuple) -> dict:
+    """The shift and mask of every field, packed from the lowest bit up."""
+    shifts = dict()
+    shift = 0
+    for name, width in fields:
+        shifts[name] = (shift, (1 << width) - 1)
+        shift += width
+    return shifts
+
+
+def prepositions() -> dict:
+    """Ordinals of the cases a preposition governs, the same as those of the generic case with the same letter,
+    so the case field means the same for every word. Cases only prepositions have follow the generic ones."""
+    ordinals = dict()
+    extra = len(CaseGeneric)
+    for member in CasePreposition:
+        try:
+            ordinals[member] = list(CaseGeneric).index(CaseGeneric(member.value)) + 1
+        except ValueError:
+            extra += 1
+            ordinals[member] = extra
+    return ordinals
+
+
+class PackedMorphology:
+    """Encodes and decodes packed morphology codes, one code per grammar."""
+
+    LAYOUT = layout(FIELDS)
+
+    ENUMS = {
+        "speech": Speech,
+        "case": CaseGeneric,
+        "gender": Gender,
+        "number": Number,
+        "mood": Mood,
+        "tense": Tense,
+        "voice": Voice,
+        "person": Person,
+        "degree": Degree,
+    }
+
+    TYPES = {
+        Speech.NOUN: TypeNoun,
+        Speech.PRONOUN: TypePronoun,
+        Speech.ADJECTIVE: TypeAdjective,
+        Speech.CONJUNCTION: TypeConjunction,
+    }
+
+    PREPOSITIONS = prepositions()
+    CASES = dict((ordinal, member) for member, ordinal in PREPOSITIONS.items())
+
+    _codes = dict()
+
+    @classmethod
+    def ordinal(cls, member: Inflexion) -> int:
+        """Position of a member within its enumeration, counted from one. None is zero.
+        A case governed by a preposition has the ordinal of the generic case with the same letter."""
+        if member is None:
+            return 0
+        elif member.__class__ is CasePreposition:
+            return cls.PREPOSITIONS[member]
+        return list(member.__class__).index(member) + 1
+
+    @classmethod
+    def encode(cls, word: Word) -> int:
+        """Packs a morphology, combined words have no inflexions of their own and are only unidentified."""
+        code = 0
+        for name, (shift, mask) in cls.LAYOUT.items():
+            code |= cls.ordinal(getattr(word, name)) << shift
+        return code
+
+    @classmethod
+    def decode(cls, code: int) -> dict:
+        """Unpacks a code into the inflexions, where the case and type are resolved by the part of speech."""
+        fields = dict()
+        for name, (shift, mask) in cls.LAYOUT.items():
+            value = (code >> shift) & mask
+            if name == "type":
+                kind = cls.TYPES.get(fields["speech"])
+            elif name == "case" and fields["speech"] == Speech.PREPOSITION:
+                fields[name] = cls.CASES.get(value)
+                continue
+            else:
+                kind = cls.ENUMS[name]
+            fields[name] = list(kind)[value - 1] if value and kind else None
+        return fields
+
+    @classmethod
+    def code(cls, token: WordToken) -> int:
+        """The packed code of a word token, encoded once per grammar."""
+        word = Grammar.classify(token)
+        code = cls._codes.get(word.grammar)
+        if code is None:
+            code = cls._codes[word.grammar] = cls.encode(word)
+        return code
+
+    @classmethod
+    def query(cls, **inflexions) -> tuple:
+        """The mask and value a code must match, `code & mask == value`, to have all given inflexions."""
+        mask = value = 0
+        for name, member in inflexions.items():
+            shift, bits = cls.LAYOUT[name]
+            mask |= bits << shift
+            value |= cls.ordinal(member) << shift
+        return mask, value
+
+    @classmethod
+    def select(cls, codes, **inflexions):
+        """Positions of the codes having all given inflexions. A NumPy array is filtered with one mask operation,
+        other sequences of integers one by one."""
+        mask, value = cls.query(**inflexions)
+        if hasattr(codes, "dtype"):
+            import numpy
+
+            return numpy.flatnonzero((codes & mask) == value)
+        return [index for index, code in enumerate(codes) if code & mask == value]
+
+    @classmethod
+    def array(cls, linear: list) -> array.array:
+        """Codes for a whole linear, zero for tokens that aren't words or whose grammar can't be parsed."""
+        codes = array.array("I", bytes(4 * len(linear)))
+        for index, token in enumerate(linear):
+            if token.__class__ is WordToken:
+                try:
+                    codes[index] = cls.code(token)
+                except MorphologyWarning:
+                    pass
+        return codes
+
+    @classmethod
+    def numpy(cls, linear: list):
+        """Codes for a whole linear as a NumPy uint32 array, requires NumPy."""
+        import numpy
+
+        return numpy.frombuffer(cls.array(linear), dtype=numpy.uint32)
+
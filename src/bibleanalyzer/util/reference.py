@@ -76,7 +76,6 @@ class BibleReference:
         self._from_verse = verse
         self._to_chapter = to_chapter
         self._to_verse = to_verse
-        print(self._book, self._from_chapter, self._from_verse, self._to_chapter, self._to_verse)
 
     @property
     def book(self) -> str:
@@ -116,7 +115,6 @@ class BibleReference:
         match = re.match(REFERENCE_REGEX, reference)
         if match:
             group = match.groupdict()
-            print(group["book"], cls._BOOKS)
             if group["book"] not in cls._BOOKS:
                 raise BibleReferenceError(*BibleReferenceError.UNKNOWN_BOOK)
             if group["chapter_lr1"] is not None:
@@ -20,6 +20,7 @@
 #     Kristoffer Paulsson - initial implementation
 #
 """Ancient Greek transliterator."""
+import re
 
 """Bellow you find an example of all koine and coptic greek characters found at Wikipedia:
 https://en.wikipedia.org/wiki/Greek_alphabet"""
@@ -134,7 +135,7 @@ CLEAN = {
     'ῴ': "ώ", 'ῷ': "ῶ", 'ῼ': "Ω"
 }
 
-LETTERS = set(NORMALIZE.keys()) | set(EXPAND.keys())
+LETTERS = frozenset(NORMALIZE.keys()) | frozenset(EXPAND.keys())
 
 SBL_DIPHTONGS = {
     "ay": "au",
@@ -206,95 +207,95 @@ SBL_GREEK_LATIN = {
 }
 
 
+# Translation tables, normalization is done in the same pass as expanding or cleaning the iota subscripts.
+EXPAND_TABLE = str.maketrans(EXPAND)
+CLEAN_TABLE = str.maketrans(CLEAN)
+NORMALIZE_TABLE = str.maketrans(dict(
+    (char, "".join(NORMALIZE.get(bit, bit) for bit in EXPAND.get(char, char)))
+    for char in NORMALIZE.keys() | EXPAND.keys()))
+NORMALIZE2_TABLE = str.maketrans(dict(
+    (char, "".join(NORMALIZE.get(bit, bit) for bit in CLEAN.get(char, char)))
+    for char in NORMALIZE.keys() | CLEAN.keys()))
+LATIN_TABLE = str.maketrans(GREEK_LATIN)
+SBL_LATIN_TABLE = str.maketrans(SBL_GREEK_LATIN)
+
+# Gamma is nasal before another velar.
+GAMMA_NASAL_PATTERN = re.compile(r"γ(?=[γκχξ])")
+DIPHTONG_PATTERN = re.compile("|".join(SBL_DIPHTONGS.keys()))
+
+
 class KoineTransliterator:
     """Transliterates ancient greek into exact transliteration."""
 
     @classmethod
     def latinize(cls, word: str) -> str:
-        bits = list(cls.gamma_nasal(cls.normalize(word)))
-        upper = bits[0].isupper()
-        transliterated = "h" if cls.has_rough(word) else ""
-
-        for char in bits:
-            char = char.lower()
-            transliterated += GREEK_LATIN[char] if char in GREEK_LATIN else char
-
-        return transliterated.title() if upper else transliterated
+        normal = word.translate(NORMALIZE_TABLE)
+        if "γ" in normal:
+            normal = GAMMA_NASAL_PATTERN.sub("ν", normal)
+        transliterated = normal.lower().translate(LATIN_TABLE)
+        if not ROUGH.isdisjoint(word):
+            transliterated = "h" + transliterated
+        return transliterated.title() if normal[0].isupper() else transliterated
 
     @classmethod
     def transliterate(cls, word: str) -> str:
-        bits = list(cls.gamma_nasal(cls.normalize2(word)))
-        upper = bits[0].isupper()
-        transliterated = "h" if cls.has_rough(word) else ""
-
-        for char in bits:
-            char = char.lower()
-            transliterated += SBL_GREEK_LATIN[char] if char in SBL_GREEK_LATIN else char
+        normal = word.translate(NORMALIZE2_TABLE)
+        if "γ" in normal:
+            normal = GAMMA_NASAL_PATTERN.sub("ν", normal)
+        transliterated = normal.lower().translate(SBL_LATIN_TABLE)
+        if not ROUGH.isdisjoint(word):
+            transliterated = "h" + transliterated
+        if "y" in transliterated:
+            transliterated = DIPHTONG_PATTERN.sub(cls._diphthong, transliterated)
+        return transliterated.title() if normal[0].isupper() else transliterated
 
-        transliterated = cls.diphthongs(transliterated)
+    @classmethod
+    def transliterate_many(cls, words) -> list:
+        """Transliterates many words, each distinct word only once."""
+        done = dict()
+        transliterated = list()
+        for word in words:
+            if word not in done:
+                done[word] = cls.transliterate(word)
+            transliterated.append(done[word])
+        return transliterated
 
-        return transliterated.title() if upper else transliterated
+    @classmethod
+    def _diphthong(cls, match: re.Match) -> str:
+        return SBL_DIPHTONGS[match.group()]
 
     @classmethod
     def diphthongs(cls, word: str) -> str:
-        for i, j in SBL_DIPHTONGS.items():
-            word = word.replace(i, j)
-        return word
+        return DIPHTONG_PATTERN.sub(cls._diphthong, word)
 
     @classmethod
     def normalize(cls, word: str) -> str:
-        bits = list(cls.expand(word))
-        normal = ""
-
-        for char in bits:
-            normal += NORMALIZE[char] if char in NORMALIZE else char
-
-        return normal
+        return word.translate(NORMALIZE_TABLE)
 
     @classmethod
     def normalize2(cls, word: str) -> str:
-        bits = list(cls.clean(word))
-        normal = ""
-
-        for char in bits:
-            normal += NORMALIZE[char] if char in NORMALIZE else char
-
-        return normal
+        return word.translate(NORMALIZE2_TABLE)
 
     @classmethod
     def expand(cls, word: str) -> str:
-        bits = list(word)
-        expand = ""
-
-        for char in bits:
-            expand += EXPAND[char] if char in EXPAND.keys() else char
-
-        return expand
+        return word.translate(EXPAND_TABLE)
 
     @classmethod
     def clean(cls, word: str) -> str:
-        bits = list(word)
-        expand = ""
-
-        for char in bits:
-            expand += CLEAN[char] if char in CLEAN.keys() else char
-
-        return expand
+        return word.translate(CLEAN_TABLE)
 
     @classmethod
     def gamma_nasal(cls, word: str) -> str:
-        for i, j in GAMMA_NASAL.items():
-            word = word.replace(i, j)
-        return word
+        return GAMMA_NASAL_PATTERN.sub("ν", word)
 
     @classmethod
     def contains_upper(cls, word: str) -> bool:
-        return bool(UPPER.intersection(set(word)))
+        return not UPPER.isdisjoint(word)
 
     @classmethod
     def has_rough(cls, word: str) -> bool:
-        return bool(ROUGH.intersection(set(word)))
+        return not ROUGH.isdisjoint(word)
 
     @classmethod
     def koine_only(cls, word: str) -> bool:
-        return bool(LETTERS.intersection(set(word)) == set(word))
+        return LETTERS.issuperset(word)
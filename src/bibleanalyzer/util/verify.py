@@ -0,0 +1,62 @@
+#
+# Copyright (c) 2022 by Kristoffer Paulsson <kristoffer.paulsson@talenten.se>.
+#
+# Permission to use, copy, modify, and/or distribute this software for any purpose with
+# or without fee is hereby granted, provided that the above copyright notice and this
+# permission notice appear in all copies.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES WITH REGARD TO
+# THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS. IN NO
+# EVENT SHALL THE AUTHOR BE LIABLE FOR ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL
+# DAMAGES OR ANY DAMAGES WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER
+# IN AN ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF OR IN
+# CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+#
+#     https://opensource.org/licenses/ISC
+#
+# SPDX-License-Identifier: ISC
+#
+# Contributors:
+#     Kristoffer Paulsson - initial implementation
+#
+"""Verification of processed text by digests per verse."""
+import hashlib
+
+
+class VerseDigest:
+    """Digests the text of each verse incrementally while it is streamed, so that two passes over a book
+    can be compared verse by verse without keeping the text."""
+
+    def __init__(self):
+        self._digests = list()
+        self._hash = None
+
+    @property
+    def digests(self) -> list:
+        self._close()
+        return self._digests
+
+    def verse(self):
+        """Closes the digest of the current verse and starts with the next."""
+        self._close()
+        self._hash = hashlib.blake2b(digest_size=16)
+
+    def update(self, text: str):
+        if self._hash is None:
+            self._hash = hashlib.blake2b(digest_size=16)
+        self._hash.update(text.encode("utf-8"))
+
+    def differ(self, other: "VerseDigest") -> list:
+        """Indices of the verses that differ, including verses only found on one side."""
+        mine = self.digests
+        theirs = other.digests
+        return [index for index in range(max(len(mine), len(theirs))) if
+                index >= len(mine) or index >= len(theirs) or mine[index] != theirs[index]]
+
+    def _close(self):
+        if self._hash is not None:
+            self._digests.append(self._hash.digest())
+            self._hash = None
+
+    def __eq__(self, other: "VerseDigest") -> bool:
+        return self.digests == other.digests
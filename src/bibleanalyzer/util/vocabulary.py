@@ -0,0 +1,156 @@
+#
+# Copyright (c) 2022 by Kristoffer Paulsson <kristoffer.paulsson@talenten.se>.
+#
+# Permission to use, copy, modify, and/or distribute this software for any purpose with
+# or without fee is hereby granted, provided that the above copyright notice and this
+# permission notice appear in all copies.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES WITH REGARD TO
+# THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS. IN NO
+# EVENT SHALL THE AUTHOR BE LIABLE FOR ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL
+# DAMAGES OR ANY DAMAGES WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER
+# IN AN ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF OR IN
+# CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+#
+#     https://opensource.org/licenses/ISC
+#
+# SPDX-License-Identifier: ISC
+#
+# Contributors:
+#     Kristoffer Paulsson - initial implementation
+#
+"""Vocabulary of the whole corpus, giving every form, lexeme and grammar code a stable integer id."""
+import sqlite3
+import sys
+import uuid
+from pathlib import Path
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS forms (
+    id INTEGER PRIMARY KEY,
+    value TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS lexemes (
+    id INTEGER PRIMARY KEY,
+    value TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS grammars (
+    id INTEGER PRIMARY KEY,
+    value TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+class Vocabulary:
+    """Ids of the forms, lexemes and grammar codes in an SQLite database of the cache, each table counted from one
+    with zero left for no string. Ids are only ever added, never changed, so they are stable between runs and
+    several processes may extend the vocabulary at the same time. A vocabulary built anew gets another generation,
+    so files written with the ids of an earlier one can tell they are stale."""
+
+    FILENAME = "vocabulary.sqlite"
+
+    FORM = "forms"
+    LEXEME = "lexemes"
+    GRAMMAR = "grammars"
+    TABLES = (FORM, LEXEME, GRAMMAR)
+
+    def __init__(self, path: Path):
+        self._path = path
+        self._connection = sqlite3.connect(str(path), timeout=60, isolation_level=None)
+        self._connection.executescript(SCHEMA)
+        self._connection.execute(
+            "INSERT OR IGNORE INTO meta (key, value) VALUES ('generation', ?)", (uuid.uuid4().hex,))
+        self._generation = self._connection.execute("SELECT value FROM meta WHERE key = 'generation'").fetchone()[0]
+        self._ids = None
+        self._values = None
+        self._reset()
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    @property
+    def generation(self) -> str:
+        return self._generation
+
+    @classmethod
+    def read_generation(cls, path: Path) -> str:
+        """The generation of a vocabulary without loading it, or None if there is none."""
+        if not path.is_file():
+            return None
+        connection = sqlite3.connect(str(path), timeout=60)
+        try:
+            row = connection.execute("SELECT value FROM meta WHERE key = 'generation'").fetchone()
+        except sqlite3.OperationalError:
+            row = None
+        finally:
+            connection.close()
+        return row[0] if row else None
+
+    def _reset(self):
+        self._ids = dict((table, {"": 0}) for table in self.TABLES)
+        self._values = dict((table, [""]) for table in self.TABLES)
+        self._load()
+
+    def _load(self):
+        """Reads the ids added since last time, by this or another process."""
+        for table in self.TABLES:
+            ids = self._ids[table]
+            values = self._values[table]
+            for index, value in self._connection.execute(
+                    "SELECT id, value FROM {} WHERE id >= ? ORDER BY id".format(table), (len(values),)):
+                value = sys.intern(value)
+                ids[value] = index
+                values.append(value)
+
+    def extend(self, strings: dict):
+        """Adds the strings of each table that are missing, in the order given, in one transaction."""
+        self._connection.execute("BEGIN IMMEDIATE")
+        try:
+            self._load()
+            for table, values in strings.items():
+                rows = list()
+                for value in values:
+                    if value not in self._ids[table]:
+                        self._ids[table][value] = len(self._values[table])
+                        self._values[table].append(value)
+                        rows.append((len(self._values[table]) - 1, value))
+                self._connection.executemany("INSERT INTO {} (id, value) VALUES (?, ?)".format(table), rows)
+            self._connection.execute("COMMIT")
+        except BaseException:
+            self._connection.execute("ROLLBACK")
+            self._reset()
+            raise
+
+    def index(self, table: str, value: str) -> int:
+        return self._ids[table][value]
+
+    def value(self, table: str, index: int) -> str:
+        values = self._values[table]
+        if index >= len(values):
+            self._load()
+            if index >= len(values):
+                raise IndexError("No id {} among the {} of {}, rebuild the cache.".format(index, table, self._path))
+        return values[index]
+
+    def values(self, table: str) -> list:
+        """All values of a table by id, read up to date, for looking up many ids without a call each."""
+        self._load()
+        return self._values[table]
+
+    def size(self, table: str) -> int:
+        """The number of ids of a table including zero, as for the length of NumPy bincount."""
+        return len(self._values[table])
+
+    def close(self):
+        self._connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
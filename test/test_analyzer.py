@@ -0,0 +1,31 @@
+import tempfile
+from pathlib import Path
+from unittest import TestCase
+
+from bibleanalyzer.analyzer import Analyzer
+from bibleanalyzer.structor import Structor
+from bibleanalyzer.util.columnar import LinearColumns
+from bibleanalyzer.util.vocabulary import Vocabulary
+from test.test_columnar import LINEAR
+
+
+class TestAnalyzer(TestCase):
+
+    def test_agreements(self):
+        expected = set()
+        for section in Structor(LINEAR).section_iter():
+            for clause in section:
+                expected |= Analyzer.analyze(clause)
+
+        with tempfile.TemporaryDirectory() as folder:
+            path = Path(folder).joinpath("linear-john.columns")
+            LinearColumns.write(path, LINEAR)
+            with LinearColumns(path) as columns:
+                index = columns.section_index
+                groups = Analyzer.agreements(index.starts, index.stops, columns.packed, columns.lexemes)
+                terms = set(" ".join(columns.vocabulary.value(Vocabulary.LEXEME, lexeme) for lexeme in group)
+                            for group in groups)
+
+        self.assertIn("ὁ λόγος", expected)
+        self.assertEqual(terms, expected)
+        self.assertEqual(Analyzer.agreements([], [], [], []), set())
@@ -0,0 +1,46 @@
+import tempfile
+from pathlib import Path
+from unittest import TestCase
+
+from bibleanalyzer.index.bitmap import Bitmap, MorphologyBitmaps
+from bibleanalyzer.index.postings import PostingsIndex
+from bibleanalyzer.util.columnar import LinearColumns
+from bibleanalyzer.util.morphology import CaseGeneric, Gender, Mood, Number, Speech
+from bibleanalyzer.util.packed import PackedMorphology
+from test.test_columnar import LINEAR
+
+
+class TestBitmap(TestCase):
+
+    def test_operations(self):
+        first = Bitmap.positions([1, 5, 70000, 1 << 24])
+        second = Bitmap.range(5, 70001)
+        self.assertEqual(list(first & second), [5, 70000])
+        self.assertEqual(list(first - second), [1, 1 << 24])
+        self.assertEqual(len(first | second), 70000 - 5 + 1 + 2)
+        self.assertIn(70000, first)
+        self.assertNotIn(70001, first)
+        self.assertEqual(list(Bitmap.range(3, 3)), [])
+
+    def test_morphology(self):
+        with tempfile.TemporaryDirectory() as folder:
+            path = Path(folder).joinpath("linear-john.columns")
+            LinearColumns.write(path, LINEAR)
+            with LinearColumns(path) as columns:
+                MorphologyBitmaps.write(Path(folder).joinpath(MorphologyBitmaps.FILENAME), [("john", columns)])
+                packed = list(columns.packed)
+
+            base = PostingsIndex.BOOKS.index("john") << PostingsIndex.SHIFT
+            with MorphologyBitmaps(Path(folder).joinpath(MorphologyBitmaps.FILENAME)) as bitmaps:
+                for inflexions in ({"speech": Speech.VERB, "mood": Mood.INDICATIVE},
+                                   {"case": CaseGeneric.NOMINATIVE, "gender": Gender.MASCULINE},
+                                   {"number": Number.SINGULAR}):
+                    self.assertEqual(list(bitmaps.select(**inflexions)),
+                                     [base | index for index in PackedMorphology.select(packed, **inflexions)])
+
+                self.assertEqual(list(bitmaps.select(speech=(Speech.NOUN, Speech.PRONOUN))), [base | 4, base | 7, base | 11])
+                self.assertEqual(list(bitmaps.select(case=CaseGeneric.DATIVE)), [base | 3, base | 4])
+                self.assertEqual(list(bitmaps.select(case=CaseGeneric.GENITIVE)), [])
+                self.assertEqual(len(bitmaps.select(mood=Mood.OPTATIVE)), 0)
+                self.assertEqual(len(bitmaps.books("john")), len(LINEAR))
+                self.assertEqual(len(bitmaps.books("mark")), 0)
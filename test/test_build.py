@@ -0,0 +1,56 @@
+import shutil
+import tempfile
+from pathlib import Path, PurePath
+from unittest import TestCase
+
+from bibleanalyzer.app import Application
+from bibleanalyzer.app.build import BuildGraph
+from bibleanalyzer.app.manifest import Manifest
+from bibleanalyzer.cmd.line import LineStage
+from bibleanalyzer.cmd.load import LoadStage
+
+CORPUS = Path(PurePath(__file__).parents[0].joinpath("data", "john.txt"))
+
+
+class TestBuildGraph(TestCase):
+
+    def setUp(self) -> None:
+        self.folder = tempfile.TemporaryDirectory()
+        root = Path(self.folder.name)
+        self.config = {"corpus": root.joinpath("corpus"), "cache": root.joinpath("cache")}
+        self.config["corpus"].joinpath("nt").mkdir(parents=True)
+        self.config["cache"].mkdir()
+        shutil.copy(CORPUS, self.config["corpus"].joinpath("nt", "john.txt"))
+        self.manifest = Manifest(self.config["cache"])
+
+    def tearDown(self) -> None:
+        self.folder.cleanup()
+
+    def plan(self, books: list) -> BuildGraph:
+        graph = BuildGraph([LoadStage(self.config), LineStage(self.config)], self.manifest, "test")
+        self.nodes = graph.plan("line", books)
+        return graph
+
+    def build(self, books: list) -> list:
+        graph = self.plan(books)
+        return [node.key for node, _ in graph.run(self.nodes, Application.instance().logger, self.config, "test")]
+
+    def test_minimum(self):
+        self.assertEqual(self.build([("nt", "john")]), ["load-john", "line-john"])
+        self.assertEqual(self.build([("nt", "john")]), [])
+
+        self.config["cache"].joinpath("linear-john.columns").unlink()
+        self.assertEqual(self.build([("nt", "john")]), ["line-john"])
+
+        self.config["corpus"].joinpath("nt", "john.txt").write_text(CORPUS.read_text() + "\n")
+        self.assertEqual(self.build([("nt", "john")]), ["load-john", "line-john"])
+
+    def test_missing(self):
+        graph = self.plan([("nt", "john"), ("nt", "jude")])
+        self.assertEqual([node.key for node in self.nodes], ["load-john", "line-john"])
+        self.assertEqual([(stage, book) for stage, book, _ in graph.missing], [("load", "jude")])
+
+    def test_errors(self):
+        self.config["corpus"].joinpath("nt", "john.txt").write_text(CORPUS.read_text() + "\n99. ἦν εἰμί - viia3s (morphology)\n")
+        self.assertEqual(self.build([("nt", "john")]), ["load-john", "line-john"])
+        self.assertEqual(self.build([("nt", "john")]), ["load-john", "line-john"])
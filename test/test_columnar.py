@@ -0,0 +1,60 @@
+import tempfile
+from pathlib import Path
+from unittest import TestCase
+
+from bibleanalyzer.structor import Structor
+from bibleanalyzer.util.columnar import LinearColumns
+from bibleanalyzer.util.model import SectionToken, ChapterToken, VerseToken, WordToken, PunctuationToken
+from bibleanalyzer.util.vocabulary import Vocabulary
+
+LINEAR = [
+    SectionToken(), ChapterToken(number=1), VerseToken(number=1),
+    WordToken(word="Ἐν", lexeme="ἐν", grammar="pd"),
+    WordToken(word="ἀρχῇ", lexeme="ἀρχή", grammar="ndfsc"),
+    WordToken(word="ἦν", lexeme="εἰμί", grammar="viia3s"),
+    WordToken(word="ὁ", lexeme="ὁ", grammar="dnms"),
+    WordToken(word="λόγος", lexeme="λόγος", grammar="nnmsc"),
+    PunctuationToken(diacritic=","),
+    VerseToken(number=2), SectionToken(level=-2),
+    WordToken(word="οὗτος", lexeme="οὗτος", grammar="rdnms"),
+    WordToken(word="ἦν", lexeme="εἰμί", grammar="viia3s"),
+    PunctuationToken(diacritic="."),
+]
+
+
+class TestLinearColumns(TestCase):
+
+    def setUp(self) -> None:
+        self.folder = tempfile.TemporaryDirectory()
+        self.path = Path(self.folder.name).joinpath("linear-john.columns")
+        LinearColumns.write(self.path, LINEAR)
+
+    def tearDown(self) -> None:
+        self.folder.cleanup()
+
+    def test_tokens(self):
+        with LinearColumns(self.path) as columns:
+            self.assertEqual(len(columns), len(LINEAR))
+            self.assertEqual(list(columns), LINEAR)
+            self.assertEqual(columns[-1], LINEAR[-1])
+            self.assertEqual(list(columns.chapters), [0] + [1] * (len(LINEAR) - 1))
+            self.assertEqual(list(columns.verses), [0, 0] + [1] * 7 + [2] * 5)
+            self.assertIs(columns[3].lexeme, columns[3].lexeme)
+
+    def test_structor(self):
+        expected = Structor(LINEAR)
+        with LinearColumns(self.path) as columns:
+            structor = Structor(columns)
+            self.assertEqual(list(structor.secref_iter()), list(expected.secref_iter()))
+            self.assertEqual(structor.verse(1, 2), expected.verse(1, 2))
+            self.assertEqual([str(section) for section in structor.section_iter()],
+                             [str(section) for section in expected.section_iter()])
+
+    def test_generation(self):
+        vocabulary = self.path.parent.joinpath(Vocabulary.FILENAME)
+        self.assertEqual(LinearColumns.generation(self.path), Vocabulary.read_generation(vocabulary))
+        vocabulary.unlink()
+        LinearColumns.write(self.path.parent.joinpath("linear-mark.columns"), LINEAR)
+        self.assertNotEqual(LinearColumns.generation(self.path), Vocabulary.read_generation(vocabulary))
+        with self.assertRaises(ValueError):
+            LinearColumns(self.path)
@@ -0,0 +1,28 @@
+import tempfile
+from pathlib import Path
+from unittest import TestCase
+
+from bibleanalyzer.concordance import Concordance
+from bibleanalyzer.index.postings import PostingsIndex
+from bibleanalyzer.util.columnar import LinearColumns
+from test.test_columnar import LINEAR
+
+
+class TestConcordance(TestCase):
+
+    def test_lines(self):
+        with tempfile.TemporaryDirectory() as folder:
+            folder = Path(folder)
+            for book in ("mark", "john"):
+                LinearColumns.write(folder.joinpath("linear-{}.columns".format(book)), LINEAR)
+            with LinearColumns(folder.joinpath("linear-mark.columns")) as mark, \
+                    LinearColumns(folder.joinpath("linear-john.columns")) as john:
+                PostingsIndex.write(folder.joinpath(PostingsIndex.FILENAME), [("john", john), ("mark", mark)])
+
+            with Concordance(folder, 2) as concordance:
+                lines = list(concordance.lines("εἰμί"))
+                self.assertEqual([line.reference for line in lines], ["mark 1:1", "mark 1:2", "john 1:1", "john 1:2"])
+                self.assertEqual((lines[0].left, lines[0].keyword, lines[0].right), ("Ἐν ἀρχῇ", "ἦν", " ὁ λόγος,"))
+                self.assertEqual((lines[1].left, lines[1].keyword, lines[1].right), ("λόγος, οὗτος", "ἦν", "."))
+                self.assertEqual(lines[1].row()["right"], ".")
+                self.assertEqual(list(concordance.lines("θεός")), [])
@@ -0,0 +1,44 @@
+import tempfile
+from pathlib import Path, PurePath
+from unittest import TestCase
+
+from bibleanalyzer.loader import CorpusReader, FreshLoaderIterator, StateMachine
+
+CORPUS = Path(PurePath(__file__).parents[0].joinpath("data", "john.txt"))
+
+
+class TestLoader(TestCase):
+
+    def test_classify(self):
+        reader = CorpusReader(CORPUS, "NA28")
+        self.assertEqual(reader.classify("1. θεός θεός - nnmsc (noun)\n")[0], StateMachine.WORD)
+        self.assertEqual(reader.classify("______________________________\n")[0], StateMachine.LINE)
+        self.assertEqual(reader.classify("NA28 John 3:16 οὕτως γὰρ\n")[0], StateMachine.TEXT)
+        self.assertEqual(reader.classify("KJV John 3:16 For God so loved\n"), (None, None))
+        self.assertEqual(reader.classify("\n"), (None, None))
+
+    def test_verse_without_text(self):
+        kind, match = CorpusReader(CORPUS, "NA28").classify("NA28 1 John 1:2\n")
+        self.assertEqual(kind, StateMachine.TEXT)
+        self.assertEqual((match["book"], match["chapter"], match["verse"], match["text"]), ("1 John", "1", "2", None))
+
+    def test_entries(self):
+        entries = list(FreshLoaderIterator(CORPUS, "NA28"))
+        self.assertEqual([(entry.chapter, entry.verse) for entry in entries], [
+            (1, 1), (1, 2), (1, 3), (1, 4), (1, 5), (2, 1), (2, 2), (2, 3)])
+        self.assertTrue(all(entry.translation == "NA28" for entry in entries))
+        self.assertEqual(entries[0].text, "Ἐν ἀρχῇ ἦν ὁ λόγος, καὶ ὁ λόγος ἦν πρὸς τὸν θεόν, καὶ θεὸς ἦν ὁ λόγος.")
+        self.assertEqual(len(entries[0].words), 17)
+        self.assertEqual(entries[0].words[2].lexeme, "εἰμί")
+        self.assertEqual(entries[0].words[2].grammar, "viia3s")
+
+    def test_mapped(self):
+        self.assertEqual(
+            list(FreshLoaderIterator(CORPUS, "NA28", mapped=True)), list(FreshLoaderIterator(CORPUS, "NA28")))
+
+    def test_mapped_crlf(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            filename = Path(tmp).joinpath("john.txt")
+            filename.write_bytes(CORPUS.read_bytes().replace(b"\n", b"\r\n"))
+            self.assertEqual(
+                list(FreshLoaderIterator(filename, "NA28", mapped=True)), list(FreshLoaderIterator(CORPUS, "NA28")))
@@ -0,0 +1,36 @@
+from unittest import TestCase
+
+from bibleanalyzer.grammar import Grammar
+from bibleanalyzer.util.model import WordToken
+from bibleanalyzer.util.morphology import Compound, MorphologyWarning, Several, Speech, Verb
+
+
+class TestMorphology(TestCase):
+
+    def test_shared(self):
+        first = Grammar.classify(WordToken(word="ἦν", lexeme="εἰμί", grammar="viia3s"))
+        second = Grammar.classify(WordToken(word="ἐγένετο", lexeme="γίνομαι", grammar="viia3s"))
+        self.assertIs(first, second)
+        self.assertIsInstance(first, Verb)
+        self.assertEqual(first.speech, Speech.VERB)
+        with self.assertRaises(AttributeError):
+            first.tag = None
+
+    def test_format(self):
+        token = WordToken(word="ἦν", lexeme="εἰμί", grammar="viia3s")
+        self.assertEqual(
+            Grammar.format(Grammar.classify(token), token),
+            "εἰμί (eimi) Verb mood=indicative tense=imperfect voice=active person=3rd person number=singular")
+
+    def test_compound(self):
+        compound = Grammar.classify(WordToken(word="κἀγώ", lexeme="καί+ἐγώ", grammar="cc&rpnms"))
+        several = Grammar.classify(WordToken(word="κἀγώ", lexeme="κἀγώ", grammar="cc&rpnms"))
+        self.assertIsInstance(compound, Compound)
+        self.assertIsInstance(several, Several)
+        self.assertEqual(len(compound.all), 2)
+        with self.assertRaises(MorphologyWarning):
+            Grammar.classify(WordToken(word="κἀγώ", lexeme="καί+ἐγώ+ἐγώ", grammar="cc&rpnms"))
+
+    def test_invalid(self):
+        with self.assertRaises(MorphologyWarning):
+            Grammar.classify(WordToken(word="ἦν", lexeme="εἰμί", grammar="viiz3s"))
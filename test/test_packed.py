@@ -0,0 +1,32 @@
+from unittest import TestCase
+
+from bibleanalyzer.grammar import Grammar
+from bibleanalyzer.util.model import WordToken
+from bibleanalyzer.util.morphology import Speech, CaseGeneric, CasePreposition, Gender, Number, Mood, Tense, Voice, \
+    TypeNoun
+from bibleanalyzer.util.packed import PackedMorphology
+from test.test_columnar import LINEAR
+
+
+class TestPackedMorphology(TestCase):
+
+    def test_decode(self):
+        for grammar in ("pd", "pg", "pp", "ndfsc", "viia3s", "dnms", "rdnms", "vpaagms", "ainnpn", "cc", "x", "viaa3s/viam3s"):
+            word = Grammar.classify(WordToken(word="", lexeme="", grammar=grammar))
+            fields = PackedMorphology.decode(PackedMorphology.encode(word))
+            for name in fields.keys():
+                self.assertEqual(fields[name], getattr(word, name), grammar)
+                self.assertIs(type(fields[name]), type(getattr(word, name)), grammar)
+
+    def test_select(self):
+        codes = PackedMorphology.array(LINEAR)
+        self.assertEqual(len(codes), len(LINEAR))
+        self.assertEqual(PackedMorphology.select(codes, speech=Speech.NOUN, case=CaseGeneric.NOMINATIVE), [7])
+        self.assertEqual(PackedMorphology.select(codes, case=CaseGeneric.NOMINATIVE, gender=Gender.MASCULINE), [6, 7, 11])
+        self.assertEqual(PackedMorphology.select(codes, speech=Speech.PREPOSITION, case=CasePreposition.DATIVE), [3])
+        self.assertEqual(PackedMorphology.select(codes, case=CaseGeneric.DATIVE), [3, 4])
+        self.assertEqual(PackedMorphology.select(codes, case=CasePreposition.DATIVE), [3, 4])
+        self.assertEqual(PackedMorphology.select(codes, case=CaseGeneric.GENITIVE), [])
+        self.assertEqual(PackedMorphology.select(codes, mood=Mood.INDICATIVE, tense=Tense.IMPERFECT), [5, 12])
+        self.assertEqual(PackedMorphology.select(codes, speech=Speech.NOUN, type=TypeNoun.PROPER), [])
+        self.assertEqual(PackedMorphology.select(codes, voice=Voice.PASSIVE, number=Number.SINGULAR), [])
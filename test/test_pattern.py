@@ -0,0 +1,51 @@
+import tempfile
+from pathlib import Path
+from unittest import TestCase
+
+from bibleanalyzer.index.postings import TokenSpan
+from bibleanalyzer.rule.pattern import Encoded, Pattern, PatternError
+from bibleanalyzer.util.columnar import LinearColumns
+from test.test_columnar import LINEAR
+
+
+class TestPattern(TestCase):
+
+    def setUp(self) -> None:
+        self.folder = tempfile.TemporaryDirectory()
+        path = Path(self.folder.name).joinpath("linear-john.columns")
+        LinearColumns.write(path, LINEAR)
+        self.columns = LinearColumns(path)
+        self.encoded = Encoded.encode("john", self.columns)
+
+    def tearDown(self) -> None:
+        self.columns.close()
+        self.folder.cleanup()
+
+    def find(self, source: str) -> list:
+        return list(Pattern(source, self.columns.vocabulary).find([self.encoded]))
+
+    def test_encoded(self):
+        self.assertEqual(len(self.encoded.text), 7 * Encoded.WIDTH)
+        self.assertEqual(self.encoded.offsets, [3, 4, 5, 6, 7, 11, 12])
+
+    def test_find(self):
+        self.assertEqual(self.find("[d case=n] [n case=n]"), [TokenSpan("john", 6, 8)])
+        self.assertEqual(self.find("[v] [d]? [n]"), [TokenSpan("john", 5, 8)])
+        self.assertEqual(self.find("[n case=d] []{0,3} [v mood=i]"), [TokenSpan("john", 4, 6)])
+        self.assertEqual(self.find("[lexeme=λόγος] [lexeme!=λόγος]+"), [TokenSpan("john", 7, 13)])
+        self.assertEqual(self.find("[r type=d] [form=ἦν]"), [TokenSpan("john", 11, 13)])
+        self.assertEqual(self.find("[v mood=i] [v mood=i]"), [])
+        self.assertEqual(self.find("[case=d]"), [TokenSpan("john", 3, 4), TokenSpan("john", 4, 5)])
+        self.assertEqual(self.find("[n|p case=d]"), [TokenSpan("john", 3, 4), TokenSpan("john", 4, 5)])
+        self.assertEqual(self.find("[p case=d]"), [TokenSpan("john", 3, 4)])
+        self.assertEqual(self.find("[case=g]"), [])
+        self.assertEqual(self.find("[lexeme=θεός]"), [])
+        self.assertEqual(list(Pattern("[v]").find([("john", self.columns)])),
+                         [TokenSpan("john", 5, 6), TokenSpan("john", 12, 13)])
+
+    def test_errors(self):
+        for source in ("", "[n] n", "[n size=g]", "[n case=q]", "[v type=p]"):
+            with self.assertRaises(PatternError):
+                Pattern(source)
+        with self.assertRaises(PatternError):
+            Pattern("[lexeme=λόγος]")
@@ -0,0 +1,35 @@
+from pathlib import Path, PurePath
+from unittest import TestCase
+
+from bibleanalyzer.app import Application
+from bibleanalyzer.liner import Liner
+from bibleanalyzer.loader import FreshLoaderIterator
+from bibleanalyzer.pipeline import Pipeline, Stream
+from bibleanalyzer.structor import Structor
+
+CORPUS = Path(PurePath(__file__).parents[0].joinpath("data", "john.txt"))
+
+
+class TestPipeline(TestCase):
+
+    def test_stream(self):
+        self.assertEqual(list(Stream(range(1000), size=2, batch=7)), list(range(1000)))
+
+        def failing():
+            yield 1
+            raise ValueError("failed")
+
+        with self.assertRaises(ValueError):
+            list(Stream(failing()))
+
+    def test_process(self):
+        entries = list(FreshLoaderIterator(CORPUS, "NA28"))
+        liner = Liner(Application.instance().logger)
+        liner.process(entries, "john")
+
+        pipeline = Pipeline(Application.instance().logger, "NA28", keep=True)
+        structor = pipeline.process(CORPUS, "john")
+        self.assertEqual(pipeline.linear, liner.linear)
+        self.assertEqual(pipeline.entries, entries)
+        self.assertEqual([str(section) for section in structor.section_iter()],
+                         [str(section) for section in Structor(liner.linear).section_iter()])
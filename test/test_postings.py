@@ -0,0 +1,47 @@
+import tempfile
+from pathlib import Path
+from unittest import TestCase
+
+from bibleanalyzer.index.postings import PostingsIndex, TokenSpan, decode, encode
+from bibleanalyzer.util.columnar import LinearColumns
+from test.test_columnar import LINEAR
+
+
+class TestPostingsIndex(TestCase):
+
+    def setUp(self) -> None:
+        self.folder = tempfile.TemporaryDirectory()
+        folder = Path(self.folder.name)
+        LinearColumns.write(folder.joinpath("linear-john.columns"), LINEAR)
+        LinearColumns.write(folder.joinpath("linear-mark.columns"), LINEAR)
+        with LinearColumns(folder.joinpath("linear-john.columns")) as john, \
+                LinearColumns(folder.joinpath("linear-mark.columns")) as mark:
+            PostingsIndex.write(folder.joinpath(PostingsIndex.FILENAME), [("john", john), ("mark", mark)])
+        self.index = PostingsIndex(folder.joinpath(PostingsIndex.FILENAME))
+
+    def tearDown(self) -> None:
+        self.index.close()
+        self.folder.cleanup()
+
+    def test_varint(self):
+        data = bytearray()
+        encode([0, 1, 127, 128, 300, 1 << 30], data)
+        self.assertEqual(list(decode(data, 0, len(data))), [0, 1, 127, 128, 300, 1 << 30])
+
+    def test_positions(self):
+        mark = PostingsIndex.BOOKS.index("mark") << PostingsIndex.SHIFT
+        john = PostingsIndex.BOOKS.index("john") << PostingsIndex.SHIFT
+        self.assertEqual(list(self.index.positions(self.index.lexeme("εἰμί"))), [mark | 5, mark | 12, john | 5, john | 12])
+        self.assertEqual(self.index.lexeme("θεός"), 0)
+        self.assertEqual(len(self.index.positions(0)), 0)
+
+        spans = self.index.spans(self.index.union(self.index.lexeme("λόγος"), self.index.lexeme("οὗτος")))
+        self.assertEqual(spans[0], TokenSpan("mark", 7, 8))
+        self.assertEqual([str(self.index.reference(span)) for span in spans],
+                         ["mark 1:1", "mark 1:2", "john 1:1", "john 1:2"])
+
+    def test_intersect(self):
+        spans = self.index.intersect(self.index.lexeme("εἰμί"), self.index.lexeme("λόγος"))
+        self.assertEqual(spans, [TokenSpan("mark", 2, 9), TokenSpan("john", 2, 9)])
+        self.assertEqual(self.index.intersect(self.index.lexeme("λόγος"), self.index.lexeme("οὗτος")), [])
+        self.assertEqual(str(self.index.reference(TokenSpan("john", 3, 12))), "john 1:1-2")
@@ -0,0 +1,50 @@
+import tempfile
+from pathlib import Path, PurePath
+from unittest import TestCase
+
+from bibleanalyzer.app import Application
+from bibleanalyzer.liner import Liner
+from bibleanalyzer.loader import FreshLoaderIterator
+from bibleanalyzer.store import CorpusStore
+from bibleanalyzer.util.model import VerseToken
+from bibleanalyzer.util.reference import BibleReference
+
+CORPUS = Path(PurePath(__file__).parents[0].joinpath("data", "john.txt"))
+
+
+class TestCorpusStore(TestCase):
+
+    def setUp(self) -> None:
+        self.folder = tempfile.TemporaryDirectory()
+        self.store = CorpusStore(Path(self.folder.name).joinpath(CorpusStore.FILENAME))
+
+        entries = list(FreshLoaderIterator(CORPUS, "NA28"))
+        liner = Liner(Application.instance().logger)
+        liner.process(entries, "john")
+        self.linear = liner.linear
+        self.store.ingest([("nt", "john", entries, self.linear)])
+
+    def tearDown(self) -> None:
+        self.store.close()
+        self.folder.cleanup()
+
+    def test_verse(self):
+        entry = self.store.verse("john", 1, 2)
+        self.assertEqual(entry.text, "οὗτος ἦν ἐν ἀρχῇ πρὸς τὸν θεόν.")
+        self.assertEqual((entry.book, entry.chapter, entry.verse, entry.index, entry.words), ("john", 1, 2, 0, []))
+        self.assertIsNone(self.store.verse("john", 3, 16))
+        self.assertEqual([(entry.chapter, entry.verse) for entry in self.store.reference(
+            BibleReference("john", 1, 4, 2, 2))], [(1, 4), (1, 5), (2, 1), (2, 2)])
+
+    def test_tokens(self):
+        start = self.linear.index(VerseToken(number=2))
+        stop = self.linear.index(VerseToken(number=3))
+        self.assertEqual(self.store.tokens("john", 1, 2), self.linear[start:stop])
+
+    def test_lookup(self):
+        self.assertEqual(self.store.lexeme("λόγος"), [("john", 1, 1, "λόγος")] * 3)
+        self.assertEqual(len(self.store.grammar("viia3s")), 7)
+
+    def test_ingest_again(self):
+        self.store.ingest([("nt", "john", list(FreshLoaderIterator(CORPUS, "NA28")), self.linear)])
+        self.assertEqual(len(self.store.lexeme("λόγος")), 3)
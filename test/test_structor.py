@@ -0,0 +1,39 @@
+from unittest import TestCase
+
+from bibleanalyzer.structor import Structor
+from test.test_columnar import LINEAR
+
+
+class TestStructor(TestCase):
+
+    def test_spans(self):
+        sections = list(Structor(LINEAR).section_iter(2))
+        self.assertEqual([str(section) for section in sections], ["Ἐν ἀρχῇ ἦν ὁ λόγος, ", "οὗτος ἦν. "])
+        self.assertEqual(sections[0].offset, 0)
+        self.assertEqual(sections[0].marker, LINEAR[0])
+        self.assertEqual(sections[1].line, LINEAR[11:])
+
+        clauses = list(sections[0])
+        self.assertEqual(len(clauses), 2)
+        self.assertEqual(clauses[0].line, LINEAR[1:8])
+        self.assertEqual(clauses[0].words, LINEAR[3:8])
+        self.assertEqual(clauses[0].marker, LINEAR[8])
+        self.assertEqual(clauses[1].line, LINEAR[9:10])
+        self.assertIsNone(clauses[1].marker)
+
+        sentences = list(sections[1].sentences)
+        self.assertEqual(len(sentences), 2)
+        self.assertEqual(sentences[0].marker, LINEAR[-1])
+        self.assertEqual(len(sentences[1]), 0)
+
+    def test_levels(self):
+        structor = Structor(LINEAR)
+        self.assertEqual([str(section) for section in structor.section_iter()], ["Ἐν ἀρχῇ ἦν ὁ λόγος,  οὗτος ἦν. "])
+        self.assertEqual([section.offset for section in structor.section_iter(2, 1)], [10])
+        self.assertEqual(list(structor.section_iter(3, 2)), [])
+        self.assertEqual(structor.section_index.enclosing(12, 1), 0)
+        self.assertEqual(structor.section_index.enclosing(12, 2), 1)
+        self.assertEqual(structor._backtrack(12, 1), 0)
+        self.assertEqual(structor._backtrack(12, 3), 10)
+        self.assertEqual(structor.section(1, 2, 2).offset, 0)
+        self.assertIsNone(structor.section(3, 1))
@@ -0,0 +1,44 @@
+import tempfile
+from pathlib import Path
+from unittest import TestCase
+
+from bibleanalyzer.index.postings import TokenSpan
+from bibleanalyzer.index.suffix import SuffixIndex, prefixes, suffixes
+from bibleanalyzer.util.columnar import LinearColumns
+from bibleanalyzer.util.vocabulary import Vocabulary
+from test.test_columnar import LINEAR
+
+
+class TestSuffixIndex(TestCase):
+
+    def test_arrays(self):
+        stream = [3, 1, 2, 1, 2, 1, 9, 1, 2]
+        order = suffixes(stream)
+        self.assertEqual(order, sorted(range(len(stream)), key=lambda index: stream[index:]))
+        self.assertEqual(prefixes(stream, order), [0, 2, 3, 1, 0, 1, 2, 0, 0])
+        self.assertEqual(suffixes([]), [])
+
+    def test_find(self):
+        with tempfile.TemporaryDirectory() as folder:
+            folder = Path(folder)
+            for book in ("mark", "john"):
+                LinearColumns.write(folder.joinpath("linear-{}.columns".format(book)), LINEAR)
+            with LinearColumns(folder.joinpath("linear-mark.columns")) as mark, \
+                    LinearColumns(folder.joinpath("linear-john.columns")) as john:
+                for table in (Vocabulary.LEXEME, Vocabulary.FORM):
+                    SuffixIndex.write(folder.joinpath(SuffixIndex.filename(table)), [("mark", mark), ("john", john)], table)
+
+            with SuffixIndex(folder.joinpath(SuffixIndex.filename(Vocabulary.LEXEME))) as index:
+                self.assertEqual(index.find(["εἰμί", "ὁ", "λόγος"]), [TokenSpan("mark", 5, 8), TokenSpan("john", 5, 8)])
+                self.assertEqual(index.find(["λόγος", "οὗτος"]), [TokenSpan("mark", 7, 12), TokenSpan("john", 7, 12)])
+                self.assertEqual(index.find(["οὗτος", "λόγος"]), [])
+                self.assertEqual(index.find(["θεός"]), [])
+                repeats = index.repeats(1)
+                self.assertEqual(repeats[0][0], ["ἐν", "ἀρχή", "εἰμί", "ὁ", "λόγος", "οὗτος", "εἰμί"])
+                self.assertEqual(repeats[0][1], [TokenSpan("mark", 3, 13), TokenSpan("john", 3, 13)])
+
+            with SuffixIndex(folder.joinpath(SuffixIndex.filename(Vocabulary.FORM))) as index:
+                self.assertEqual(index.table, Vocabulary.FORM)
+                self.assertEqual(len(index.find(["ἦν"])), 4)
+                self.assertEqual(index.find(["εἰμί"]), [])
+                self.assertEqual(index.find(["."]), [])
@@ -52,3 +52,12 @@ class TestKoine(TestCase):
     def test_contains_upper(self):
         self.assertTrue(KoineTransliterator.contains_upper('Ἡ'))
         self.assertFalse(KoineTransliterator.contains_upper("ι"))
+
+    def test_transliterate_many(self):
+        words = "ἐν ἀρχῇ ἦν ὁ λόγος καὶ ὁ λόγος ἦν πρὸς τὸν θεόν".split(" ")
+        self.assertEqual(KoineTransliterator.transliterate_many(words),
+                         [KoineTransliterator.transliterate(word) for word in words])
+
+    def test_gamma_nasal(self):
+        self.assertEqual(KoineTransliterator.transliterate("ἄγγελος"), "angelos")
+        self.assertEqual(KoineTransliterator.latinize("ἀνάγκη"), "anankē")
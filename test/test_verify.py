@@ -0,0 +1,22 @@
+from unittest import TestCase
+
+from bibleanalyzer.util.verify import VerseDigest
+
+
+class TestVerseDigest(TestCase):
+
+    def digest(self, verses: list) -> VerseDigest:
+        digest = VerseDigest()
+        for verse in verses:
+            digest.verse()
+            for word in verse.split(" "):
+                digest.update(" " + word)
+        return digest
+
+    def test_equal(self):
+        self.assertEqual(self.digest(["Ἐν ἀρχῇ ἦν", "ὁ λόγος"]), self.digest(["Ἐν ἀρχῇ ἦν", "ὁ λόγος"]))
+
+    def test_differ(self):
+        original = self.digest(["Ἐν ἀρχῇ ἦν", "ὁ λόγος", "καὶ ὁ λόγος"])
+        self.assertEqual(original.differ(self.digest(["Ἐν ἀρχῇ ἦν", "ὁ λόγοι", "καὶ ὁ λόγος"])), [1])
+        self.assertEqual(original.differ(self.digest(["Ἐν ἀρχῇ ἦν"])), [1, 2])
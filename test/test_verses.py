@@ -0,0 +1,41 @@
+from unittest import TestCase
+
+from bibleanalyzer.index.verses import VerseIndex
+from bibleanalyzer.structor import Structor
+from bibleanalyzer.util.columnar import LinearColumns
+from bibleanalyzer.util.model import ChapterToken, VerseToken, WordToken
+from test.test_columnar import LINEAR
+
+BOOK = LINEAR + [
+    ChapterToken(number=2), VerseToken(number=1),
+    WordToken(word="Καὶ", lexeme="καί", grammar="cc"),
+    VerseToken(number=2),
+    WordToken(word="ἐκλήθη", lexeme="καλέω", grammar="viap3s"),
+    ChapterToken(number=3), VerseToken(number=1),
+    WordToken(word="ἦν", lexeme="εἰμί", grammar="viia3s"),
+]
+
+
+class TestVerseIndex(TestCase):
+
+    def test_build(self):
+        index = VerseIndex.build(LinearColumns.boundaries(BOOK), len(BOOK))
+        self.assertEqual(len(index), 5)
+        self.assertEqual(index.start(1, 2), 9)
+        self.assertEqual(index.start(2, 3), -1)
+        self.assertEqual(index.verse(2, 1), slice(15, 17))
+        self.assertEqual(index.verse(3, 1), slice(20, 22))
+
+    def test_duplicate(self):
+        index = VerseIndex.build([(0, 1, 0), (1, 1, 1), (3, 1, 1), (5, 1, 2)], 7)
+        self.assertEqual(len(index), 2)
+        self.assertEqual(index.verse(1, 1), slice(1, 3))
+
+    def test_passages(self):
+        structor = Structor(BOOK)
+        self.assertEqual(structor.verse(2, 2), BOOK[17:19])
+        self.assertEqual(structor.verse(4, 1), [])
+        self.assertEqual(structor.passage(1, 2, 2, 1), BOOK[9:17])
+        self.assertEqual(structor.passage(1, 3, 1, 9), [])
+        self.assertEqual(structor.chapters(2), BOOK[15:19])
+        self.assertEqual(structor.chapters(1, 2), BOOK[2:19])
@@ -0,0 +1,41 @@
+import tempfile
+from pathlib import Path
+from unittest import TestCase
+
+from bibleanalyzer.util.columnar import LinearColumns
+from bibleanalyzer.util.vocabulary import Vocabulary
+from test.test_columnar import LINEAR
+
+
+class TestVocabulary(TestCase):
+
+    def setUp(self) -> None:
+        self.folder = tempfile.TemporaryDirectory()
+        self.path = Path(self.folder.name).joinpath(Vocabulary.FILENAME)
+
+    def tearDown(self) -> None:
+        self.folder.cleanup()
+
+    def test_stable(self):
+        with Vocabulary(self.path) as vocabulary:
+            vocabulary.extend({Vocabulary.LEXEME: ["λόγος", "θεός"]})
+        with Vocabulary(self.path) as first, Vocabulary(self.path) as second:
+            first.extend({Vocabulary.LEXEME: ["ἀρχή", "λόγος"]})
+            second.extend({Vocabulary.LEXEME: ["ζωή", "θεός"], Vocabulary.GRAMMAR: ["nnmsc"]})
+            self.assertEqual(second.index(Vocabulary.LEXEME, "λόγος"), 1)
+            self.assertEqual(second.index(Vocabulary.LEXEME, "ἀρχή"), 3)
+            self.assertEqual(second.index(Vocabulary.LEXEME, "ζωή"), 4)
+            self.assertEqual(first.value(Vocabulary.LEXEME, 4), "ζωή")
+            self.assertEqual(first.size(Vocabulary.GRAMMAR), 2)
+
+    def test_columns(self):
+        first = self.path.with_name("linear-john.columns")
+        second = self.path.with_name("linear-mark.columns")
+        LinearColumns.write(first, LINEAR)
+        LinearColumns.write(second, LINEAR[::-1])
+        with LinearColumns(first) as john, LinearColumns(second) as mark:
+            self.assertEqual(list(john), LINEAR)
+            self.assertEqual(list(mark), LINEAR[::-1])
+            self.assertEqual(sorted(john.lexemes), sorted(mark.lexemes))
+            self.assertEqual(john.lexemes[5], john.lexemes[12])
+            self.assertEqual(john.vocabulary.value(Vocabulary.LEXEME, john.lexemes[5]), "εἰμί")